@@ -1,11 +1,12 @@
 import customtkinter as ctk
 from tkinter import filedialog
-from faster_whisper import WhisperModel
+from faster_whisper import WhisperModel, decode_audio
 import torch
 import os
 import json
 import re
 import threading
+import queue
 import platform
 import subprocess
 import shutil
@@ -14,6 +15,8 @@ import time
 import sys
 import urllib.request
 import urllib.error
+import bisect
+import numpy as np
 from PIL import Image
 
 # Simple version comparison function
@@ -47,12 +50,16 @@ def compare_versions(current, latest):
         # If comparison fails, assume versions are equal
         return 0
 # Transformers pipeline will be lazy-loaded to avoid startup issues
-from docx import Document
-from docx.shared import RGBColor, Pt
-from docx.enum.text import WD_COLOR_INDEX
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+# Export backend lives in a GUI-free module so bulk exports can run in worker processes
+from mmtranscript_export import (
+    ExportCancelled, build_styled_document, build_plain_document, write_export_atomically, append_jsonl_export,
+    export_filetypes, format_page_rate, span_store_segments
+)
+from mmtranscript_text import iter_sentence_ends, set_custom_sentence_abbreviations
+from mmtranscript_formatting import (
+    PLAIN_STYLE, SpanStore, TextEditTracker, offset_to_text_index, span_store_from_sidecar,
+    span_store_from_tag_dump, span_store_to_sidecar, style_to_dict, text_line_starts
+)
 
 # Try to import pygame for audio playback
 PYGAME_AVAILABLE = False
@@ -100,6 +107,16 @@ except Exception as e:
     PYDUB_AVAILABLE = False
     print(f"Warning: pydub initialization failed: {e}")
 
+# Try to import sounddevice for live microphone dictation
+try:
+    import sounddevice
+    SOUNDDEVICE_AVAILABLE = True
+except ImportError:
+    SOUNDDEVICE_AVAILABLE = False
+except Exception as e:
+    SOUNDDEVICE_AVAILABLE = False
+    print(f"Warning: sounddevice initialization failed: {e}")
+
 # Try to import mutagen for audio metadata
 try:
     from mutagen import File as MutagenFile
@@ -223,7 +240,11 @@ if not os.path.exists(SAVED_TRANSCRIPTS_DIR):
 DEFAULT_SETTINGS = {
     "theme": "Dark",
     "whisper_model": "small",
-    "window_geometry": "1560x980+100+100"  # Default: width x height + x + y
+    "window_geometry": "1560x980+100+100",  # Default: width x height + x + y
+    "two_pass_transcription": False,  # Stream a fast draft, then refine with the selected model
+    "draft_model": "tiny",
+    "adaptive_model": False,  # Probe each file with a small model and use the cheapest adequate model
+    "live_model": "base"  # Model used for low-latency live dictation
 }
 
 def load_settings():
@@ -260,7 +281,7 @@ def save_transcript_to_app(text, filename=None, formatting_tags=None):
     Args:
         text: The text content to save
         filename: Optional filename (will generate if None)
-        formatting_tags: Optional dict of formatting tags to save
+        formatting_tags: Optional formatting sidecar dict to save
     """
     if not text.strip():
         return None
@@ -280,11 +301,11 @@ def save_transcript_to_app(text, filename=None, formatting_tags=None):
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(text)
         
-        # Save formatting tags if provided
+        # Save formatting tags if provided (compact: sidecars for long transcripts get large)
         if formatting_tags:
             format_filepath = filepath.replace('.txt', '.formatting.json')
             with open(format_filepath, 'w', encoding='utf-8') as f:
-                json.dump(formatting_tags, f, indent=2)
+                json.dump(formatting_tags, f, separators=(",", ":"))
         
         return filename
     except Exception as e:
@@ -398,6 +419,99 @@ DEFAULT_MODEL = user_settings.get("whisper_model", "small")
 model = WhisperModel(DEFAULT_MODEL, device=DEVICE, compute_type=COMPUTE_TYPE)
 current_model_name = DEFAULT_MODEL
 
+# Decoding options shared by every transcription pass
+# Disable condition_on_previous_text to prevent cascading errors in long transcriptions
+WHISPER_TRANSCRIBE_OPTIONS = {"beam_size": 5, "condition_on_previous_text": False}
+
+# Extra models (e.g. the draft model for two-pass transcription) are loaded on demand and reused
+_model_cache = {}
+_model_cache_lock = threading.Lock()
+
+def get_whisper_model(model_name):
+    """Return a loaded WhisperModel for model_name, reusing the main model or a cached one."""
+    if model_name == current_model_name:
+        return model
+    with _model_cache_lock:
+        if model_name not in _model_cache:
+            _model_cache[model_name] = WhisperModel(model_name, device=DEVICE, compute_type=COMPUTE_TYPE)
+        return _model_cache[model_name]
+
+# --- Adaptive Model Selection ---
+# A short probe with the tiny model measures how hard the audio is; the cheapest model whose
+# tier covers the probe's mean avg_logprob is used, never exceeding the user's selected model.
+WHISPER_SAMPLE_RATE = 16000
+ADAPTIVE_PROBE_MODEL = "tiny"
+ADAPTIVE_PROBE_WINDOWS = 3  # Windows spread across the file
+ADAPTIVE_PROBE_WINDOW_SECONDS = 20
+ADAPTIVE_MODEL_TIERS = [
+    (-0.30, "base"),  # Clean dictation
+    (-0.50, "small"),
+    (-0.75, "medium"),
+    (float("-inf"), "large-v2"),  # Noisy phone calls, heavy accents
+]
+ADAPTIVE_NO_SPEECH_THRESHOLD = 0.6  # Segments above this are treated as silence/noise
+ADAPTIVE_COMPRESSION_THRESHOLD = 2.4  # Repetitive probe output means the small model is struggling
+
+def new_quality_stats():
+    """Create an empty accumulator for track_segment_quality."""
+    return {"duration": 0.0, "speech_duration": 0.0, "logprob": 0.0, "compression": 0.0, "no_speech": 0.0}
+
+def track_segment_quality(segments, stats):
+    """Yield segments unchanged while accumulating duration-weighted quality signals into stats."""
+    for segment in segments:
+        duration = max(segment.end - segment.start, 0.01)
+        stats["duration"] += duration
+        stats["no_speech"] += segment.no_speech_prob * duration
+        if segment.no_speech_prob < ADAPTIVE_NO_SPEECH_THRESHOLD:
+            stats["speech_duration"] += duration
+            stats["logprob"] += segment.avg_logprob * duration
+            stats["compression"] += segment.compression_ratio * duration
+        yield segment
+
+def choose_model_for_quality(stats, max_model):
+    """Pick the cheapest model expected to meet the quality target, capped at max_model."""
+    if stats["speech_duration"] <= 0:
+        # Nothing recognisable as speech in the probe - the cheapest tier will do
+        tier = 0
+    else:
+        avg_logprob = stats["logprob"] / stats["speech_duration"]
+        compression_ratio = stats["compression"] / stats["speech_duration"]
+        tier = next(i for i, (threshold, _) in enumerate(ADAPTIVE_MODEL_TIERS) if avg_logprob >= threshold)
+        if compression_ratio > ADAPTIVE_COMPRESSION_THRESHOLD:
+            tier = min(tier + 1, len(ADAPTIVE_MODEL_TIERS) - 1)
+    choice = ADAPTIVE_MODEL_TIERS[tier][1]
+    return AVAILABLE_MODELS[min(AVAILABLE_MODELS.index(choice), AVAILABLE_MODELS.index(max_model))]
+
+def choose_model_by_probe(audio, max_model):
+    """Probe decoded 16 kHz audio with the tiny model and choose a model for the full transcription.
+    
+    Returns:
+        tuple: (model_name, stats)
+    """
+    stats = new_quality_stats()
+    if AVAILABLE_MODELS.index(max_model) <= AVAILABLE_MODELS.index(ADAPTIVE_PROBE_MODEL):
+        # Nothing cheaper to fall back to
+        return max_model, stats
+    
+    window = int(ADAPTIVE_PROBE_WINDOW_SECONDS * WHISPER_SAMPLE_RATE)
+    if len(audio) <= window * ADAPTIVE_PROBE_WINDOWS:
+        windows = [audio]
+    else:
+        windows = []
+        for i in range(ADAPTIVE_PROBE_WINDOWS):
+            center = int((i + 0.5) / ADAPTIVE_PROBE_WINDOWS * len(audio))
+            start = max(0, center - window // 2)
+            windows.append(audio[start:start + window])
+    
+    probe_model = get_whisper_model(ADAPTIVE_PROBE_MODEL)
+    probe_options = {**WHISPER_TRANSCRIBE_OPTIONS, "beam_size": 1}  # Greedy decoding is enough for a probe
+    for window_audio in windows:
+        segments, _ = probe_model.transcribe(window_audio, **probe_options)
+        for _ in track_segment_quality(segments, stats):
+            pass
+    
+    return choose_model_for_quality(stats, max_model), stats
+
 # Lazy-load summarizer to avoid startup import issues with PyInstaller
 _summarizer = None
 
@@ -518,774 +632,6 @@ def apply_main_bg_color():
 apply_main_bg_color()
 
 # --- Export Functions ---
-def export_to_txt(text, file_path):
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(text)
-
-def extract_formatted_text_segments(textbox_widget):
-    """Extract text with formatting information from a tkinter textbox.
-    Preserves newline structure to detect paragraph breaks."""
-    segments = []
-    content = textbox_widget.get("1.0", "end-1c")  # Get all text
-    
-    if not content:
-        return segments
-    
-    # Iterate character by character through the entire content to preserve newlines
-    current_tags = None
-    current_text = ""
-    line_num = 1
-    char_idx = 0
-    
-    for i, char in enumerate(content):
-        # Calculate tkinter position (line.char format)
-        # Count newlines before this character
-        newlines_before = content[:i].count('\n')
-        line_num = newlines_before + 1
-        # Character index within current line
-        if newlines_before > 0:
-            last_newline_pos = content[:i].rfind('\n')
-            char_idx = i - last_newline_pos - 1
-        else:
-            char_idx = i
-        
-        pos = f"{line_num}.{char_idx}"
-        
-        try:
-            # Get all tags at this position
-            tags = list(textbox_widget.tag_names(pos))
-            # Filter out internal tags
-            tags = [t for t in tags if t not in ("sel", "insert", "current")]
-        except:
-            tags = []
-        
-        # Normalize tags (sort for comparison)
-        tags_key = tuple(sorted(tags))
-        
-        # Check if formatting changed (new tags or tag removed)
-        if tags_key != current_tags:
-            # Save previous segment
-            if current_text:
-                segments.append({
-                    'text': current_text,
-                    'tags': list(current_tags) if current_tags else []
-                })
-            
-            # Start new segment with current character
-            current_tags = tags_key
-            current_text = char
-        else:
-            # Same formatting - append to current segment
-            current_text += char
-    
-    # Add last segment
-    if current_text:
-        segments.append({
-            'text': current_text,
-            'tags': list(current_tags) if current_tags else []
-        })
-    
-    return segments
-
-def apply_docx_formatting(run, tags, textbox, formatting_tags_dict=None):
-    """Apply formatting to a DOCX run based on tkinter textbox tags."""
-    try:
-        if not tags:
-            return
-        
-        # Check each tag for formatting properties
-        for tag in tags:
-            try:
-                # First check formatting_tags_dict if provided (more reliable)
-                if formatting_tags_dict and tag in formatting_tags_dict:
-                    tag_info = formatting_tags_dict[tag]
-                    tag_type = tag_info.get("type")
-                    
-                    # Handle italic tag
-                    if tag_type == "italic" or tag_info.get("italic", False):
-                        run.italic = True
-                    
-                    # Handle bold tag
-                    if tag_type == "bold" or tag_info.get("bold", False):
-                        run.bold = True
-                    
-                    # Handle font_merged tag
-                    if tag_type == "font_merged":
-                        if tag_info.get("italic", False):
-                            run.italic = True
-                        if tag_info.get("bold", False):
-                            run.bold = True
-                        if tag_info.get("size"):
-                            try:
-                                run.font.size = Pt(int(tag_info.get("size")))
-                            except:
-                                pass
-                        if tag_info.get("family"):
-                            try:
-                                run.font.name = str(tag_info.get("family"))
-                            except:
-                                pass
-                    
-                    # Handle highlight tag
-                    if tag_type == "highlight":
-                        highlight_color = tag_info.get("color")
-                        if highlight_color:
-                            try:
-                                # DOCX has limited highlight colors, use yellow as default
-                                run.font.highlight_color = WD_COLOR_INDEX.YELLOW
-                            except:
-                                pass
-                
-                # Fall back to tkinter tag config
-                tag_config = textbox.tag_config(tag)
-                
-                # Check for standalone italic tag name
-                if tag == "italic" or "italic" in tag.lower():
-                    run.italic = True
-                
-                # Check for standalone bold tag name
-                if tag == "bold" or "bold" in tag.lower():
-                    run.bold = True
-                
-                # Bold, italic, font
-                if 'font' in tag_config:
-                    font_value = tag_config['font'][4] if len(tag_config['font']) > 4 else None
-                    if font_value:
-                        if isinstance(font_value, tuple) and len(font_value) > 2:
-                            if 'bold' in font_value[2:]:
-                                run.bold = True
-                            if 'italic' in font_value[2:]:
-                                run.italic = True
-                            # Font size
-                            if len(font_value) > 1:
-                                try:
-                                    size = int(font_value[1])
-                                    run.font.size = Pt(size)
-                                except:
-                                    pass
-                            # Font family
-                            if len(font_value) > 0:
-                                try:
-                                    run.font.name = str(font_value[0])
-                                except:
-                                    pass
-                
-                # Underline
-                if 'underline' in tag_config:
-                    underline_value = tag_config['underline'][4] if len(tag_config['underline']) > 4 else False
-                    if underline_value:
-                        run.underline = True
-                
-                # Foreground color
-                if 'foreground' in tag_config:
-                    fg_color = tag_config['foreground'][4] if len(tag_config['foreground']) > 4 else None
-                    if fg_color:
-                        try:
-                            hex_color = fg_color.lstrip('#')
-                            rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-                            run.font.color.rgb = RGBColor(*rgb)
-                        except:
-                            pass
-                
-                # Background/highlight (limited support in DOCX)
-                if 'background' in tag_config:
-                    bg_color = tag_config['background'][4] if len(tag_config['background']) > 4 else None
-                    if bg_color:
-                        try:
-                            # DOCX has limited highlight colors, use yellow as default
-                            run.font.highlight_color = WD_COLOR_INDEX.YELLOW
-                        except:
-                            pass
-            except Exception:
-                # Tag might not exist or be configured
-                pass
-    except Exception as e:
-        print(f"Error applying DOCX formatting: {e}")
-
-def map_font_to_reportlab(font_family, bold=False, italic=False):
-    """Map common font families to ReportLab's built-in fonts.
-    ReportLab supports: Helvetica, Times-Roman, Courier (and their variants)."""
-    # Map common fonts to ReportLab built-in fonts
-    font_map = {
-        'Segoe UI': 'Helvetica',
-        'Arial': 'Helvetica',
-        'Calibri': 'Helvetica',
-        'Verdana': 'Helvetica',
-        'Tahoma': 'Helvetica',
-        'Trebuchet MS': 'Helvetica',
-        'Times New Roman': 'Times-Roman',
-        'Times': 'Times-Roman',
-        'Georgia': 'Times-Roman',
-        'Courier New': 'Courier',
-        'Courier': 'Courier',
-        'Consolas': 'Courier',
-        'Lucida Console': 'Courier',
-        'Monaco': 'Courier',
-    }
-    
-    # Get base font name (default to Helvetica if not mapped)
-    base_font = font_map.get(font_family, 'Helvetica')
-    
-    # Build variant name based on bold/italic
-    if bold and italic:
-        if base_font == 'Helvetica':
-            return 'Helvetica-BoldOblique'
-        elif base_font == 'Times-Roman':
-            return 'Times-BoldItalic'
-        elif base_font == 'Courier':
-            return 'Courier-BoldOblique'
-    elif bold:
-        if base_font == 'Helvetica':
-            return 'Helvetica-Bold'
-        elif base_font == 'Times-Roman':
-            return 'Times-Bold'
-        elif base_font == 'Courier':
-            return 'Courier-Bold'
-    elif italic:
-        if base_font == 'Helvetica':
-            return 'Helvetica-Oblique'
-        elif base_font == 'Times-Roman':
-            return 'Times-Italic'
-        elif base_font == 'Courier':
-            return 'Courier-Oblique'
-    
-    return base_font
-
-def apply_pdf_formatting_styles(text, tags, textbox, formatting_tags_dict=None):
-    """Build styled XML-like text for PDF from tkinter textbox tags.
-    ReportLab uses XML-like tags with specific syntax."""
-    try:
-        if not tags:
-            # Still escape XML characters
-            return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        
-        # Escape XML special characters in text
-        text_escaped = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        
-        style_parts = []
-        close_tags = []
-        font_attrs = {}
-        is_bold = False
-        is_italic = False
-        back_color = None
-        
-        # Check each tag for formatting properties
-        for tag in tags:
-            try:
-                # First check formatting_tags dict if provided (more reliable)
-                if formatting_tags_dict and tag in formatting_tags_dict:
-                    tag_info = formatting_tags_dict[tag]
-                    tag_type = tag_info.get("type")
-                    
-                    if tag_type == "font_merged":
-                        # Apply from formatting_tags dict
-                        is_bold = tag_info.get("bold", False)
-                        is_italic = tag_info.get("italic", False)
-                        size_val = tag_info.get("size")
-                        if size_val:
-                            try:
-                                font_attrs['fontSize'] = str(int(size_val))
-                            except:
-                                pass
-                        family = tag_info.get("family", "Helvetica")
-                        # Map font to ReportLab built-in and handle bold/italic in font name
-                        mapped_font = map_font_to_reportlab(family, is_bold, is_italic)
-                        font_attrs['fontName'] = mapped_font
-                        continue
-                    elif tag_type == "italic":
-                        is_italic = True
-                    elif tag_type == "bold":
-                        is_bold = True
-                    elif tag_type == "highlight":
-                        # Get highlight color
-                        highlight_color = tag_info.get("color")
-                        if highlight_color:
-                            back_color = highlight_color
-                        continue
-                
-                # Fall back to tkinter tag config
-                tag_config = textbox.tag_config(tag)
-                
-                # Check for standalone italic/bold tag names
-                if tag == "italic" or "italic" in tag.lower():
-                    is_italic = True
-                if tag == "bold" or "bold" in tag.lower():
-                    is_bold = True
-                
-                # Font formatting
-                if 'font' in tag_config:
-                    font_value = tag_config['font'][4] if len(tag_config['font']) > 4 else None
-                    if font_value and isinstance(font_value, tuple):
-                        if len(font_value) > 2:
-                            if 'bold' in font_value[2:]:
-                                is_bold = True
-                            if 'italic' in font_value[2:]:
-                                is_italic = True
-                        # Font size
-                        if len(font_value) > 1:
-                            try:
-                                font_attrs['fontSize'] = str(int(font_value[1]))
-                            except:
-                                pass
-                        # Font family - map to ReportLab built-in
-                        if len(font_value) > 0:
-                            try:
-                                family = str(font_value[0])
-                                mapped_font = map_font_to_reportlab(family, is_bold, is_italic)
-                                font_attrs['fontName'] = mapped_font
-                            except:
-                                pass
-                
-                # Underline
-                if 'underline' in tag_config:
-                    underline_value = tag_config['underline'][4] if len(tag_config['underline']) > 4 else False
-                    if underline_value:
-                        style_parts.append('<u>')
-                        close_tags.insert(0, '</u>')
-                
-                # Foreground color
-                if 'foreground' in tag_config:
-                    fg_color = tag_config['foreground'][4] if len(tag_config['foreground']) > 4 else None
-                    if fg_color:
-                        font_attrs['textColor'] = fg_color
-                
-                # Background/highlight color
-                if 'background' in tag_config:
-                    bg_color = tag_config['background'][4] if len(tag_config['background']) > 4 else None
-                    if bg_color:
-                        back_color = bg_color
-            except Exception:
-                pass
-        
-        # Apply bold/italic to font if not already set
-        if is_bold or is_italic:
-            if 'fontName' not in font_attrs:
-                # Set default font with bold/italic
-                font_attrs['fontName'] = map_font_to_reportlab("Helvetica", is_bold, is_italic)
-            else:
-                # Update existing font name to include bold/italic
-                current_font = font_attrs.get('fontName', 'Helvetica')
-                font_attrs['fontName'] = map_font_to_reportlab(current_font.split('-')[0] if '-' in current_font else current_font, is_bold, is_italic)
-        
-        # Build font tag if we have font attributes
-        # ReportLab expects fontSize and fontName (camelCase), not size and name
-        if font_attrs:
-            # Build attribute string with proper quoting
-            attr_parts = []
-            for k, v in font_attrs.items():
-                # Remove any existing quotes and add proper ones
-                v_clean = v.strip('"\'')
-                # Escape quotes in the value
-                v_clean = v_clean.replace('"', '&quot;')
-                # Always quote fontName and fontSize
-                attr_parts.append(f'{k}="{v_clean}"')
-            font_attr_str = ' '.join(attr_parts)
-            style_parts.append(f'<font {font_attr_str}>')
-            close_tags.insert(0, '</font>')
-        
-        # Add background color if present (ReportLab uses backColor attribute)
-        if back_color:
-            try:
-                # Ensure color is in hex format
-                if not back_color.startswith('#'):
-                    back_color = '#' + back_color.lstrip('#')
-                # Escape quotes
-                back_color_clean = back_color.replace('"', '&quot;')
-                style_parts.append(f'<font backColor="{back_color_clean}">')
-                close_tags.insert(0, '</font>')
-            except Exception as e:
-                print(f"Error adding background color: {e}")
-        
-        # Combine opening tags, text, and closing tags
-        result = ''.join(style_parts) + text_escaped + ''.join(close_tags)
-        return result
-    except Exception as e:
-        print(f"Error in apply_pdf_formatting_styles: {e}")
-        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-
-def export_to_docx(text, file_path, formatting_tags=None, textbox_widget=None):
-    """Export text to DOCX with formatting support."""
-    doc = Document()
-    
-    # Use textbox widget if available for better formatting extraction
-    if textbox_widget and hasattr(textbox_widget, '_textbox'):
-        try:
-            textbox = textbox_widget._textbox
-            segments = extract_formatted_text_segments(textbox)
-            
-            # Split full text into paragraphs by double newlines first
-            full_text = textbox.get("1.0", "end-1c")
-            paragraphs_raw = full_text.split('\n\n')
-            
-            # Process each paragraph
-            char_offset = 0
-            for para_idx, para_text in enumerate(paragraphs_raw):
-                # Clean paragraph text (replace single newlines with spaces)
-                para_text_clean = para_text.replace('\n', ' ').strip()
-                
-                if not para_text_clean:
-                    # Empty paragraph (extra spacing)
-                    if para_idx < len(paragraphs_raw) - 1:  # Don't add trailing empty para
-                        doc.add_paragraph()
-                    continue
-                
-                # Create paragraph
-                p = doc.add_paragraph()
-                
-                # Find segments that belong to this paragraph
-                # Calculate character range for this paragraph in original text
-                para_start_char = char_offset
-                para_end_char = char_offset + len(para_text)
-                
-                # Extract segments within this paragraph range
-                para_segments = []
-                segment_char_pos = 0
-                
-                for segment in segments:
-                    seg_text = segment['text']
-                    seg_start = segment_char_pos
-                    seg_end = segment_char_pos + len(seg_text)
-                    
-                    # Check if this segment overlaps with current paragraph
-                    if seg_end > para_start_char and seg_start < para_end_char:
-                        # Calculate overlap
-                        overlap_start = max(0, para_start_char - seg_start)
-                        overlap_end = min(len(seg_text), para_end_char - seg_start)
-                        
-                        if overlap_end > overlap_start:
-                            # Extract the overlapping portion
-                            overlap_text = seg_text[overlap_start:overlap_end]
-                            # Clean newlines (replace with spaces for paragraph text)
-                            overlap_text = overlap_text.replace('\n', ' ')
-                            
-                            if overlap_text.strip():
-                                para_segments.append({
-                                    'text': overlap_text,
-                                    'tags': segment['tags']
-                                })
-                    
-                    segment_char_pos += len(seg_text)
-                
-                # Build runs from segments, merging consecutive segments with same tags
-                current_run_text = ""
-                current_run_tags = None
-                
-                for seg in para_segments:
-                    seg_text = seg['text']
-                    seg_tags = seg['tags']
-                    
-                    # Check if tags changed
-                    if current_run_tags != seg_tags and current_run_text:
-                        # Finish current run
-                        if current_run_text.strip():
-                            run = p.add_run(current_run_text.strip())
-                            apply_docx_formatting(run, current_run_tags, textbox, formatting_tags)
-                        current_run_text = ""
-                    
-                    current_run_tags = seg_tags
-                    current_run_text += seg_text
-                
-                # Add last run
-                if current_run_text.strip():
-                    run = p.add_run(current_run_text.strip())
-                    apply_docx_formatting(run, current_run_tags, textbox, formatting_tags)
-                
-                # Update offset for next paragraph
-                char_offset = para_end_char + 2  # +2 for the '\n\n' separator
-                    
-        except Exception as e:
-            print(f"Error exporting with formatting: {e}, falling back to plain text")
-            # Fall through to plain text export
-    
-    if not textbox_widget or not hasattr(textbox_widget, '_textbox'):
-        # Simple export without formatting
-        for paragraph in text.split("\n\n"):
-            if paragraph.strip():
-                doc.add_paragraph(paragraph)
-    elif formatting_tags:
-        # Export with formatting
-        # Split text into paragraphs
-        paragraphs = text.split("\n\n")
-        
-        for para_text in paragraphs:
-            if not para_text.strip():
-                continue
-                
-            p = doc.add_paragraph()
-            
-            # Process text character by character with formatting
-            char_index = 0
-            current_run = None
-            current_font_family = None
-            current_font_size = None
-            current_bold = False
-            current_italic = False
-            current_underline = False
-            current_font_color = None
-            current_highlight = None
-            
-            # Convert character positions to tkinter indices for tag lookup
-            for i, char in enumerate(para_text):
-                # Find all tags that apply to this character position
-                # We need to map character position to textbox index
-                # For simplicity, we'll check tags that might apply to this range
-                char_tags = {}
-                
-                # Check formatting_tags for tags that might apply
-                for tag_name, tag_info in formatting_tags.items():
-                    try:
-                        tag_type = tag_info.get("type")
-                        start_str = tag_info.get("start", "")
-                        end_str = tag_info.get("end", "")
-                        
-                        # Try to parse positions (could be "1.5" format or char offset)
-                        try:
-                            # Parse tkinter index format (e.g., "1.5" means line 1, char 5)
-                            if "." in str(start_str):
-                                parts = str(start_str).split(".")
-                                start_line = int(parts[0]) - 1  # Convert to 0-based
-                                start_char = int(parts[1]) if len(parts) > 1 else 0
-                                # Approximate: we'll use paragraph start + char_index
-                                # This is simplified - in real use, we'd need full text mapping
-                                tag_start_char = start_char
-                            else:
-                                tag_start_char = int(start_str) if str(start_str).isdigit() else 0
-                            
-                            if "." in str(end_str):
-                                parts = str(end_str).split(".")
-                                end_line = int(parts[0]) - 1
-                                end_char = int(parts[1]) if len(parts) > 1 else 0
-                                tag_end_char = end_char
-                            else:
-                                tag_end_char = int(end_str) if str(end_str).isdigit() else len(para_text)
-                            
-                            # Check if current char position is within tag range
-                            # Note: This is simplified - assumes tags are within current paragraph
-                            if tag_start_char <= char_index < tag_end_char:
-                                char_tags[tag_type] = tag_info
-                        except:
-                            pass
-                    except:
-                        pass
-                
-                # Determine formatting for this character
-                font_family = None
-                font_size = None
-                bold = False
-                italic = False
-                underline = False
-                font_color = None
-                highlight = None
-                
-                # Merge all applicable tags
-                for tag_type, tag_info in char_tags.items():
-                    if tag_type == "font_merged":
-                        font_family = tag_info.get("family", font_family)
-                        font_size = tag_info.get("size", font_size)
-                        bold = tag_info.get("bold", bold)
-                        italic = tag_info.get("italic", italic)
-                    elif tag_type == "bold":
-                        bold = True
-                    elif tag_type == "italic":
-                        italic = True
-                    elif tag_type == "underline":
-                        underline = True
-                    elif tag_type == "fontcolor":
-                        font_color = tag_info.get("color", font_color)
-                    elif tag_type == "highlight":
-                        highlight = tag_info.get("color", highlight)
-                    elif tag_type == "font":
-                        font_family = tag_info.get("family", font_family)
-                    elif tag_type == "fontsize":
-                        font_size = tag_info.get("size", font_size)
-                
-                # Check if we need to start a new run (formatting changed)
-                needs_new_run = (
-                    font_family != current_font_family or
-                    font_size != current_font_size or
-                    bold != current_bold or
-                    italic != current_italic or
-                    underline != current_underline or
-                    font_color != current_font_color or
-                    highlight != current_highlight
-                )
-                
-                if needs_new_run or current_run is None:
-                    # Finish previous run
-                    if current_run is not None:
-                        pass  # Already added
-                    
-                    # Start new run
-                    current_run = p.add_run(char)
-                    current_font_family = font_family
-                    current_font_size = font_size
-                    current_bold = bold
-                    current_italic = italic
-                    current_underline = underline
-                    current_font_color = font_color
-                    current_highlight = highlight
-                    
-                    # Apply formatting
-                    if current_bold:
-                        current_run.bold = True
-                    if current_italic:
-                        current_run.italic = True
-                    if current_underline:
-                        current_run.underline = True
-                    if current_font_size:
-                        try:
-                            current_run.font.size = Pt(int(current_font_size))
-                        except:
-                            pass
-                    if current_font_family:
-                        try:
-                            current_run.font.name = current_font_family
-                        except:
-                            pass
-                    if current_font_color:
-                        try:
-                            # Convert hex color to RGB
-                            hex_color = current_font_color.lstrip('#')
-                            rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-                            current_run.font.color.rgb = RGBColor(*rgb)
-                        except:
-                            pass
-                    if current_highlight:
-                        try:
-                            # Convert hex color to RGB for highlight
-                            hex_color = current_highlight.lstrip('#')
-                            rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-                            current_run.font.highlight_color = WD_COLOR_INDEX.YELLOW  # DOCX limited colors
-                        except:
-                            pass
-                else:
-                    # Continue current run - append to text
-                    current_run.text += char
-                
-                char_index += 1
-    
-    doc.save(file_path)
-
-def export_to_pdf(text, file_path, formatting_tags=None, textbox_widget=None):
-    """Export text to PDF with formatting support."""
-    from reportlab.platypus import Paragraph  # Import at function level to avoid scope issues
-    
-    doc = SimpleDocTemplate(file_path, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
-    
-    # Use textbox widget if available for better formatting extraction
-    if textbox_widget and hasattr(textbox_widget, '_textbox'):
-        try:
-            textbox = textbox_widget._textbox
-            segments = extract_formatted_text_segments(textbox)
-            
-            # Split full text into paragraphs by double newlines first
-            full_text = textbox.get("1.0", "end-1c")
-            paragraphs_raw = full_text.split('\n\n')
-            
-            # Process each paragraph
-            char_offset = 0
-            for para_idx, para_text in enumerate(paragraphs_raw):
-                # Clean paragraph text (replace single newlines with spaces)
-                para_text_clean = para_text.replace('\n', ' ').strip()
-                
-                if not para_text_clean:
-                    # Empty paragraph (extra spacing)
-                    if para_idx < len(paragraphs_raw) - 1:  # Don't add trailing empty para
-                        story.append(Spacer(1, 12))
-                    continue
-                
-                # Find segments that belong to this paragraph
-                # Calculate character range for this paragraph in original text
-                para_start_char = char_offset
-                para_end_char = char_offset + len(para_text)
-                
-                # Extract segments within this paragraph range
-                para_segments = []
-                segment_char_pos = 0
-                
-                for segment in segments:
-                    seg_text = segment['text']
-                    seg_start = segment_char_pos
-                    seg_end = segment_char_pos + len(seg_text)
-                    
-                    # Check if this segment overlaps with current paragraph
-                    if seg_end > para_start_char and seg_start < para_end_char:
-                        # Calculate overlap
-                        overlap_start = max(0, para_start_char - seg_start)
-                        overlap_end = min(len(seg_text), para_end_char - seg_start)
-                        
-                        if overlap_end > overlap_start:
-                            # Extract the overlapping portion
-                            overlap_text = seg_text[overlap_start:overlap_end]
-                            # Clean newlines (replace with spaces for paragraph text)
-                            overlap_text = overlap_text.replace('\n', ' ')
-                            
-                            if overlap_text.strip():
-                                para_segments.append({
-                                    'text': overlap_text,
-                                    'tags': segment['tags']
-                                })
-                    
-                    segment_char_pos += len(seg_text)
-                
-                # Build styled HTML from segments, merging consecutive segments with same tags
-                para_html_parts = []
-                current_html_text = ""
-                current_html_tags = None
-                
-                for seg in para_segments:
-                    seg_text = seg['text']
-                    seg_tags = seg['tags']
-                    
-                    # Check if tags changed
-                    if current_html_tags != seg_tags and current_html_text:
-                        # Finish current styled segment
-                        if current_html_text.strip():
-                            styled = apply_pdf_formatting_styles(current_html_text.strip(), current_html_tags, textbox, formatting_tags)
-                            para_html_parts.append(styled)
-                        current_html_text = ""
-                    
-                    current_html_tags = seg_tags
-                    current_html_text += seg_text
-                
-                # Add last segment
-                if current_html_text.strip():
-                    styled = apply_pdf_formatting_styles(current_html_text.strip(), current_html_tags, textbox, formatting_tags)
-                    para_html_parts.append(styled)
-                
-                # Combine into paragraph HTML
-                para_html = "".join(para_html_parts)
-                if para_html.strip():
-                    story.append(Paragraph(para_html, styles["Normal"]))
-                    story.append(Spacer(1, 12))
-                
-                # Update offset for next paragraph
-                char_offset = para_end_char + 2  # +2 for the '\n\n' separator
-                    
-        except Exception as e:
-            print(f"Error exporting PDF with formatting: {e}, falling back to plain text")
-            # Fall through to plain text export
-    
-    if not textbox_widget or not hasattr(textbox_widget, '_textbox'):
-        # Simple export without formatting
-        for paragraph in text.split("\n\n"):
-            if paragraph.strip():
-                story.append(Paragraph(paragraph.replace('\n', ' '), styles["Normal"]))
-                story.append(Spacer(1, 12))
-    
-    doc.build(story)
-
-def export_to_json(text, file_path, content_type="transcript"):
-    data = {
-        "type": content_type,
-        "content": text,
-        "paragraphs": [p.strip() for p in text.split("\n\n") if p.strip()]
-    }
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
 def export_content(textbox, content_type="transcript"):
     """Generic export function for any textbox content."""
     text = textbox.get("1.0", "end").strip()
@@ -1293,31 +639,16 @@ def export_content(textbox, content_type="transcript"):
     if not text:
         return
     
-    file_path = filedialog.asksaveasfilename(
+    file_path, append = ask_export_path(
         title=f"Export {content_type.title()}",
         defaultextension=".txt",
-        filetypes=[
-            ("Text File", "*.txt"),
-            ("Word Document", "*.docx"),
-            ("PDF Document", "*.pdf"),
-            ("JSON File", "*.json")
-        ]
+        filetypes=export_filetypes(include_timed=False)
     )
     
     if not file_path:
         return
     
-    try:
-        if file_path.endswith(".txt"):
-            export_to_txt(text, file_path)
-        elif file_path.endswith(".docx"):
-            export_to_docx(text, file_path)
-        elif file_path.endswith(".pdf"):
-            export_to_pdf(text, file_path)
-        elif file_path.endswith(".json"):
-            export_to_json(text, file_path, content_type)
-    except Exception as e:
-        print(f"Export error: {e}")
+    start_background_export(build_plain_document(text, content_type), file_path, append)
 
 # --- Model Selection ---
 def on_model_change(selected_model):
@@ -1332,7 +663,10 @@ def on_model_change(selected_model):
     app.update()
     
     try:
-        model = WhisperModel(selected_model, device=DEVICE, compute_type=COMPUTE_TYPE)
+        # Reuse the model if it was already loaded for a draft pass
+        with _model_cache_lock:
+            cached_model = _model_cache.pop(selected_model, None)
+        model = cached_model or WhisperModel(selected_model, device=DEVICE, compute_type=COMPUTE_TYPE)
         current_model_name = selected_model
         update_status_label()
         
@@ -1372,13 +706,13 @@ def update_progress(value, label_text="Processing..."):
         progress_label.configure(text=label_text)
     app.after(0, _update)
 
-def finish_progress():
+def finish_progress(message="Done!"):
     """Set progress to 100% and then hide it."""
     def _finish():
         progress_bar.stop()
         progress_bar.configure(mode="determinate")
         progress_bar.set(1.0)
-        progress_label.configure(text="Done!")
+        progress_label.configure(text=message)
         # Hide after a short delay
         app.after(1500, hide_progress)
     app.after(0, _finish)
@@ -1409,6 +743,456 @@ def set_ui_busy(busy):
         panel.import_btn.configure(state=state)
         panel.save_btn.configure(state=state)
         panel.delete_btn.configure(state=state)
+    batch_btn.configure(state=state)
+
+# --- Background Export ---
+# Exports run on a worker thread against a snapshot of the document and write to a temporary
+# file in the target folder that replaces the target only once complete (write_export_atomically).
+active_export_cancel = None  # threading.Event of the running export; set it to cancel
+
+def ask_export_path(**options):
+    """Ask for an export target, then how to treat an existing file.
+    
+    The save dialog's own overwrite prompt is turned off so that an existing .jsonl
+    target gets a single question (append or replace) instead of two.
+    Returns (file_path, append), or (None, None) if the user cancelled.
+    """
+    import tkinter.messagebox as messagebox
+    file_path = filedialog.asksaveasfilename(confirmoverwrite=False, **options)
+    if not file_path:
+        return None, None
+    if not os.path.exists(file_path):
+        return file_path, False
+    name = os.path.basename(file_path)
+    if file_path.lower().endswith(".jsonl"):
+        append = messagebox.askyesnocancel(
+            "Append to JSON Lines",
+            f"{name} already exists.\n\n"
+            "Yes: append this transcript's records to it\nNo: replace the file"
+        )
+        return (None, None) if append is None else (file_path, append)
+    if not messagebox.askyesno("Confirm Save As", f"{name} already exists.\nDo you want to replace it?"):
+        return None, None
+    return file_path, False
+
+def start_background_export(document, file_path, append=False):
+    """Export document to file_path on a worker thread with progress and a Cancel button.
+    
+    append=True adds JSON Lines records to the end of an existing file instead of replacing it.
+    """
+    global active_export_cancel
+    import tkinter.messagebox as messagebox
+    
+    if active_export_cancel is not None:
+        messagebox.showinfo("Export in Progress", "Please wait for the current export to finish or cancel it.")
+        return
+    
+    cancel_event = threading.Event()
+    active_export_cancel = cancel_event
+    file_name = os.path.basename(file_path)
+    last_percent = [-1]
+    
+    def progress_callback(done, total):
+        if cancel_event.is_set():
+            raise ExportCancelled()
+        percent = int(done / total * 100) if total else 100
+        # Only schedule UI updates when the visible percentage changes
+        if percent != last_percent[0]:
+            last_percent[0] = percent
+            update_progress(percent, f"Exporting {file_name}... ({done}/{total} paragraphs)")
+    
+    def worker():
+        try:
+            message = "Done!"
+            if append:
+                append_jsonl_export(document, file_path, progress_callback)
+            else:
+                pages, seconds = write_export_atomically(document, file_path, progress_callback)
+                if pages is not None:
+                    message = f"Done! {format_page_rate(pages, seconds)}"
+            app.after(0, lambda: finish_progress(message))
+        except ExportCancelled:
+            app.after(0, lambda: hide_progress())
+        except Exception as e:
+            print(f"Export error: {e}")
+            app.after(0, lambda: hide_progress())
+            app.after(0, lambda err=str(e): messagebox.showerror("Export Error", f"Failed to export: {err}"))
+        finally:
+            app.after(0, lambda: on_background_export_finished(cancel_event))
+    
+    start_progress_indeterminate(f"Exporting {file_name}...")
+    progress_cancel_btn.pack(side="left", padx=(8, 0))
+    threading.Thread(target=worker, daemon=True).start()
+
+def cancel_background_export():
+    """Ask the running export to stop at the next paragraph."""
+    if active_export_cancel is not None:
+        active_export_cancel.set()
+        progress_label.configure(text="Cancelling export...")
+
+def on_background_export_finished(cancel_event):
+    """Clear export state once the worker is done (runs on the Tk thread)."""
+    global active_export_cancel
+    if active_export_cancel is cancel_event:
+        active_export_cancel = None
+    progress_cancel_btn.pack_forget()
+
+# --- Batch Transcription ---
+# Files flow through three overlapping stages connected by bounded queues:
+#   preprocess (decode/resample + adaptive probe) -> inference (+ paragraphing) -> output (save)
+# so decoding file N+1 and saving file N-1 happen while file N is being transcribed.
+# A decoded hour of audio is ~230 MB of float32 samples. With one file queued, inference
+# still never waits on decoding, and at most the file being transcribed, the queued one and
+# the one the preprocess stage has decoded while waiting to queue it are in memory at once.
+BATCH_QUEUE_SIZE = 1  # Decoded files buffered ahead of inference (bounds memory use)
+_BATCH_DONE = object()  # End-of-stream marker passed between stages
+
+def get_unique_transcript_filename(base_name):
+    """Return a .txt filename in the saved transcripts folder that doesn't exist yet."""
+    filename = f"{base_name}.txt"
+    counter = 1
+    while os.path.exists(os.path.join(SAVED_TRANSCRIPTS_DIR, filename)):
+        filename = f"{base_name}_{counter}.txt"
+        counter += 1
+    return filename
+
+def run_batch_pipeline(file_paths, progress_callback=None):
+    """Transcribe several audio files and save each one to the saved transcripts folder.
+    
+    Returns:
+        list: (file_path, saved_filename or None, error message or None) per file, in input order
+    """
+    decoded_queue = queue.Queue(maxsize=BATCH_QUEUE_SIZE)
+    output_queue = queue.Queue(maxsize=BATCH_QUEUE_SIZE)
+    results = []
+    adaptive = user_settings.get("adaptive_model", False)
+    max_model = current_model_name
+    total = len(file_paths)
+    
+    def preprocess_stage():
+        try:
+            for path in file_paths:
+                try:
+                    audio = decode_audio(path, sampling_rate=WHISPER_SAMPLE_RATE)
+                    model_name = max_model
+                    if adaptive:
+                        model_name, _ = choose_model_by_probe(audio, max_model)
+                    decoded_queue.put((path, audio, model_name, None))
+                except Exception as e:
+                    decoded_queue.put((path, None, None, str(e)))
+        finally:
+            decoded_queue.put(_BATCH_DONE)
+    
+    def output_stage():
+        while True:
+            item = output_queue.get()
+            if item is _BATCH_DONE:
+                break
+            path, text, error = item
+            saved_name = None
+            if error is None:
+                try:
+                    base_name = os.path.splitext(os.path.basename(path))[0]
+                    saved_name = save_transcript_to_app(text, get_unique_transcript_filename(base_name))
+                    if not saved_name:
+                        error = "Nothing to save"
+                except Exception as e:
+                    error = str(e)
+            results.append((path, saved_name, error))
+    
+    preprocess_thread = threading.Thread(target=preprocess_stage, daemon=True)
+    output_thread = threading.Thread(target=output_stage, daemon=True)
+    preprocess_thread.start()
+    output_thread.start()
+    
+    # Inference stage runs on this thread so the model is never shared between threads
+    completed = 0
+    try:
+        while True:
+            item = decoded_queue.get()
+            if item is _BATCH_DONE:
+                break
+            path, audio, model_name, error = item
+            text = None
+            if error is None:
+                try:
+                    if progress_callback:
+                        progress_callback(
+                            int(completed / total * 100),
+                            f"Transcribing {os.path.basename(path)} ({completed + 1}/{total}, {model_name})..."
+                        )
+                    segments, info = get_whisper_model(model_name).transcribe(audio, **WHISPER_TRANSCRIBE_OPTIONS)
+                    # Paragraphs close as segments stream out of the model
+                    text = "\n\n".join(
+                        paragraph["text"] for paragraph in group_segments_into_paragraphs(segments, info.language)
+                    )
+                except Exception as e:
+                    error = str(e)
+            # Release the decoded samples before blocking on the output queue
+            audio = None
+            output_queue.put((path, text, error))
+            completed += 1
+    finally:
+        output_queue.put(_BATCH_DONE)
+        output_thread.join()
+        preprocess_thread.join()
+    
+    if progress_callback:
+        progress_callback(100, f"Batch complete ({total} files)")
+    
+    order = {path: i for i, path in enumerate(file_paths)}
+    return sorted(results, key=lambda result: order.get(result[0], 0))
+
+def start_batch_transcription():
+    """Pick several audio files and transcribe them into saved transcripts in the background."""
+    file_paths = filedialog.askopenfilenames(
+        title="Select Audio Files to Transcribe",
+        filetypes=[("Audio Files", "*.mp3;*.wav"), ("MP3 Files", "*.mp3"), ("WAV Files", "*.wav"), ("All Files", "*.*")]
+    )
+    if not file_paths:
+        return
+    
+    set_ui_busy(True)
+    start_progress_indeterminate(f"Batch: preparing {len(file_paths)} files...")
+    
+    def worker():
+        try:
+            results = run_batch_pipeline(list(file_paths), progress_callback=update_progress)
+        except Exception as e:
+            results = [(path, None, str(e)) for path in file_paths]
+        
+        def _done():
+            import tkinter.messagebox as messagebox
+            set_ui_busy(False)
+            finish_progress()
+            refresh_saved_transcripts_dropdown()
+            failed = [(path, error) for path, saved_name, error in results if error]
+            message = f"Saved {len(results) - len(failed)} of {len(results)} transcripts."
+            if failed:
+                message += "\n\nFailed:\n" + "\n".join(f"{os.path.basename(path)}: {error}" for path, error in failed[:10])
+                messagebox.showwarning("Batch Transcription", message)
+            else:
+                messagebox.showinfo("Batch Transcription", message)
+        app.after(0, _done)
+    
+    threading.Thread(target=worker, daemon=True).start()
+
+# --- Live Dictation ---
+# Audio frames are buffered into a rolling window that is re-decoded about once a second.
+# Segments that ended more than LIVE_COMMIT_DELAY seconds before the end of the window are
+# stable and get committed into the panel; the rest is shown as a provisional hypothesis.
+LIVE_FRAME_SECONDS = 0.1  # Frame size from the microphone / replayed file
+LIVE_DECODE_INTERVAL = 1.0  # Re-decode the window at most this often
+LIVE_COMMIT_DELAY = 2.0  # Audio this close to the end of the window stays provisional
+LIVE_MAX_WINDOW = 12.0  # Force a commit once the uncommitted window gets this long
+LIVE_MIN_DECODE_SECONDS = 0.5  # Don't decode windows shorter than this
+
+class LiveDictationSession:
+    """Rolling-window live transcription into a TranscriptPanel.
+    
+    Frames come from the microphone (requires sounddevice) or from an audio file or pipe
+    replayed in real time for testing. End-to-end latency is measured from the moment a
+    frame was captured to the moment the text covering it was committed.
+    """
+    
+    def __init__(self, panel, job_id, source_path=None):
+        self.panel = panel
+        self.job_id = job_id
+        self.source_path = source_path
+        self.frames = queue.Queue()  # (samples, capture time) tuples, None at end of stream
+        self.stop_event = threading.Event()
+        self.stream = None
+        self.commit_latencies = []
+        self.language = None  # Detected by the first decode
+        # Paragraph state of the committed text (same rule as group_segments_into_paragraphs)
+        self.last_commit_end = None  # Audio time where the last committed segment ended
+        self.paragraph_sentences = 0
+        self.at_sentence_end = False
+    
+    def start(self):
+        """Start capturing (or replaying) audio and decoding it."""
+        if self.source_path:
+            threading.Thread(target=self._replay_file, daemon=True).start()
+        else:
+            self.stream = sounddevice.InputStream(
+                samplerate=WHISPER_SAMPLE_RATE,
+                channels=1,
+                dtype="float32",
+                blocksize=int(LIVE_FRAME_SECONDS * WHISPER_SAMPLE_RATE),
+                callback=self._on_microphone_frame
+            )
+            self.stream.start()
+        threading.Thread(target=self._decode_loop, daemon=True).start()
+    
+    def stop(self):
+        """Stop capturing; the remaining audio is decoded and committed."""
+        self.stop_event.set()
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                print(f"Error closing microphone stream: {e}")
+            self.stream = None
+    
+    def _on_microphone_frame(self, indata, frames, time_info, status):
+        """sounddevice callback - runs on the audio thread, so only queue the samples."""
+        self.frames.put((indata[:, 0].copy(), time.monotonic()))
+    
+    def _replay_file(self):
+        """Feed a decoded file into the frame queue at real-time pace."""
+        try:
+            audio = decode_audio(self.source_path, sampling_rate=WHISPER_SAMPLE_RATE)
+            frame_size = int(LIVE_FRAME_SECONDS * WHISPER_SAMPLE_RATE)
+            started = time.monotonic()
+            for index, offset in enumerate(range(0, len(audio), frame_size)):
+                if self.stop_event.is_set():
+                    break
+                # A frame is only "captured" once its last sample would have been spoken
+                delay = started + (index + 1) * LIVE_FRAME_SECONDS - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                self.frames.put((audio[offset:offset + frame_size], time.monotonic()))
+        except Exception as e:
+            print(f"Error replaying audio for live dictation: {e}")
+        finally:
+            self.frames.put(None)
+    
+    def _decode_loop(self):
+        """Decode the rolling window and push committed/provisional text to the panel."""
+        try:
+            live_model = get_whisper_model(user_settings.get("live_model", "base"))
+        except Exception as e:
+            print(f"Error loading live dictation model: {e}")
+            self.stop()
+            app.after(0, lambda: self.panel.on_live_session_finished(self))
+            return
+        
+        buffer = np.zeros(0, dtype=np.float32)
+        buffer_start = 0.0  # Audio time (seconds) of buffer[0]
+        audio_time = 0.0  # Audio time at the end of the last received frame
+        frame_end_times = []  # Audio end time of each buffered frame
+        frame_capture_times = []  # Wall-clock capture time of each buffered frame
+        language = None
+        last_decode = 0.0
+        ended = False
+        
+        while not ended:
+            ended = self.stop_event.is_set() or self.panel.transcription_job != self.job_id
+            
+            # Collect whatever arrived since the last pass
+            chunks = []
+            try:
+                while True:
+                    item = self.frames.get(timeout=LIVE_FRAME_SECONDS if not chunks else 0)
+                    if item is None:
+                        ended = True
+                        break
+                    samples, captured = item
+                    chunks.append(samples)
+                    audio_time += len(samples) / WHISPER_SAMPLE_RATE
+                    frame_end_times.append(audio_time)
+                    frame_capture_times.append(captured)
+            except queue.Empty:
+                pass
+            if chunks:
+                buffer = np.concatenate([buffer] + chunks)
+            
+            window_seconds = len(buffer) / WHISPER_SAMPLE_RATE
+            if not ended and (time.monotonic() - last_decode < LIVE_DECODE_INTERVAL
+                              or window_seconds < LIVE_MIN_DECODE_SECONDS):
+                continue
+            last_decode = time.monotonic()
+            if window_seconds == 0:
+                continue
+            
+            try:
+                segments, info = live_model.transcribe(
+                    buffer,
+                    language=language,
+                    beam_size=1,
+                    condition_on_previous_text=False,
+                    vad_filter=True  # Keeps silence from being hallucinated into text
+                )
+                segments = [seg for seg in segments if seg.text and seg.text.strip()]
+                language = language or info.language
+                self.language = language
+            except Exception as e:
+                print(f"Live decoding error: {e}")
+                continue
+            
+            # Commit the stable prefix; force a commit when the window grows too long
+            if ended:
+                commit_count = len(segments)
+            else:
+                commit_count = 0
+                for seg in segments:
+                    if seg.end > window_seconds - LIVE_COMMIT_DELAY:
+                        break
+                    commit_count += 1
+                if window_seconds > LIVE_MAX_WINDOW:
+                    commit_count = max(commit_count, len(segments) - 1 if len(segments) > 1 else len(segments))
+            committed = segments[:commit_count]
+            provisional = segments[commit_count:]
+            
+            now = time.monotonic()
+            commit_latency = None
+            committed_text = self._join_committed(committed, buffer_start)
+            if committed:
+                commit_end = buffer_start + min(committed[-1].end, window_seconds)
+                if frame_end_times:
+                    frame_index = min(bisect.bisect_left(frame_end_times, commit_end), len(frame_end_times) - 1)
+                    commit_latency = now - frame_capture_times[frame_index]
+                    self.commit_latencies.append(commit_latency)
+                cut = int((commit_end - buffer_start) * WHISPER_SAMPLE_RATE)
+                buffer = buffer[cut:]
+                buffer_start = commit_end
+            elif window_seconds > LIVE_MAX_WINDOW:
+                # Nothing but silence - keep only the tail so memory stays bounded
+                keep = int(LIVE_COMMIT_DELAY * WHISPER_SAMPLE_RATE)
+                buffer_start += (len(buffer) - keep) / WHISPER_SAMPLE_RATE
+                buffer = buffer[-keep:]
+            first_kept = bisect.bisect_right(frame_end_times, buffer_start)
+            del frame_end_times[:first_kept]
+            del frame_capture_times[:first_kept]
+            
+            partial_latency = now - frame_capture_times[-1] if frame_capture_times else None
+            provisional_text = " ".join(seg.text.strip() for seg in provisional)
+            app.after(0, lambda c=committed_text, p=provisional_text, cl=commit_latency, pl=partial_latency:
+                      self.panel.update_live_text(self, c, p, cl, pl))
+        
+        self.stop()
+        app.after(0, lambda: self.panel.on_live_session_finished(self))
+    
+    def _join_committed(self, committed, buffer_start):
+        """Join committed segments, starting a new paragraph at a pause like streamed transcripts do.
+        
+        buffer_start is the audio time the segments' timestamps are relative to.
+        """
+        parts = []
+        for seg in committed:
+            text = seg.text.strip()
+            start = buffer_start + seg.start
+            pause = start - self.last_commit_end if self.last_commit_end is not None else 0
+            if (pause >= PARAGRAPH_LONG_PAUSE_SECONDS
+                    or (self.at_sentence_end and (pause >= PARAGRAPH_PAUSE_SECONDS
+                                                  or self.paragraph_sentences >= PARAGRAPH_MAX_SENTENCES))):
+                parts.append("\n\n")
+                self.paragraph_sentences = 0
+            elif parts:
+                parts.append(" ")  # update_live_text separates the first part from earlier text
+            parts.append(text)
+            self.last_commit_end = buffer_start + seg.end
+            sentence_ends = list(iter_sentence_ends(text, self.language or "en"))
+            self.paragraph_sentences += len(sentence_ends)
+            self.at_sentence_end = bool(sentence_ends) and sentence_ends[-1] == len(text)
+        return "".join(parts)
+    
+    def average_latency(self):
+        """Mean committed end-to-end latency in seconds, or None before the first commit."""
+        if not self.commit_latencies:
+            return None
+        return sum(self.commit_latencies) / len(self.commit_latencies)
 
 # --- Dynamic Panel System ---
 
@@ -1427,6 +1211,7 @@ AVAILABLE_FONTS = [
     "Courier New", "Consolas", "Lucida Console", "Monaco"
 ]
 AVAILABLE_FONT_SIZES = ["10", "11", "12", "13", "14", "16", "18", "20", "24", "28", "32"]
+RESTORE_SLICE_RUNS = 2000  # Formatted runs tagged per idle slice when restoring saved formatting
 
 # Panel storage
 panels = []  # List of TranscriptPanel objects
@@ -1452,8 +1237,21 @@ class TranscriptPanel:
         self.resize_indicator = None
         self.associated_saved_file = None  # Track which saved transcript file this panel is linked to
         self.auto_save_timer = None  # Timer for debounced auto-save
-        self.formatting_tags = {}  # Store formatting tags (highlight, underline, font changes)
+        self.span_store = SpanStore()  # Source of truth for character formatting, kept in step with edits
+        self.style_tags = {}  # Style tuple -> interned Tk tag drawing it (one tag per distinct style)
+        self.style_tag_counter = 0  # Numbers style tags; never reused, since compaction deletes tags
+        self.compaction_job = None  # Pending idle compaction of the span store and style tags
+        self.restore_job = 0  # Bumped whenever a formatting restore starts or the text is replaced
+        self.restore_timer = None  # Pending after() that starts restoring formatting for new text
         self.search_dialog = None  # Search dialog reference
+        self.transcription_job = 0  # Bumped whenever panel text is replaced; stale jobs stop writing
+        self.streamed_paragraph_count = 0  # Paragraphs streamed in by the current job
+        self.draft_paragraphs = {}  # Draft paragraph index -> text as inserted (for edit detection)
+        self.live_session = None  # Running LiveDictationSession, if any
+        self.revision = 0  # Bumped on every text or formatting change
+        self.document_cache = None  # (revision, title, document) built by get_document_model
+        self.paragraph_times = []  # (start, end) seconds per streamed paragraph, for exports
+        self.paragraph_segments = []  # Timed segment dicts per streamed paragraph, for subtitle exports
         
         # Main container frame (with minimum width)
         self.container = ctk.CTkFrame(parent_frame, fg_color="transparent")
@@ -1719,6 +1517,21 @@ class TranscriptPanel:
         )
         search_btn.pack(side="left", padx=(5, 5))
         
+        # Live dictation button
+        self.live_btn = ctk.CTkButton(
+            self.controls_row,
+            text="🎙",
+            width=28,
+            height=26,
+            font=(FONT_FAMILY, 12),
+            corner_radius=4,
+            fg_color=BUTTON_COLOR,
+            hover_color=BUTTON_HOVER_COLOR,
+            text_color=BUTTON_TEXT_COLOR,
+            command=self.toggle_live_dictation
+        )
+        self.live_btn.pack(side="left", padx=(0, 5))
+        
         # Export button (right side)
         self.export_btn = ctk.CTkButton(
             self.controls_row,
@@ -1785,10 +1598,13 @@ class TranscriptPanel:
             text_color=get_theme_color("textbox_text")
         )
         self.textbox.pack(side="left", fill="both", expand=True)
+        # Every insert/delete (typing, paste, undo, code) shifts the formatting spans
+        self.edit_tracker = TextEditTracker(self.textbox._textbox, self.span_store)
         
         # Bind to text changes for auto-save
         self.textbox._textbox.bind("<KeyRelease>", self.on_text_change)
         self.textbox._textbox.bind("<ButtonRelease>", self.on_text_change)  # For paste operations
+        self.textbox._textbox.bind("<<Modified>>", self.on_text_modified)  # Any insert/delete, incl. programmatic
         
         # Resize handle (right edge)
         self.resize_handle = ctk.CTkFrame(
@@ -1893,7 +1709,8 @@ class TranscriptPanel:
     def on_hover_enter(self, event):
         """Show preview on hover."""
         if self.is_minimized:
-            preview_text = self.content[:500] + "..." if len(self.content) > 500 else self.content
+            content = self.get_document_model()["text"]
+            preview_text = content[:500] + "..." if len(content) > 500 else content
             self.preview_label.configure(text=preview_text if preview_text else "(Empty)")
             self.mini_bar.pack_forget()
             self.preview_frame.pack(fill="y", expand=False, pady=5)
@@ -2155,9 +1972,11 @@ class TranscriptPanel:
         new_font = (self.font_settings["family"], font_size)
         self.textbox.configure(font=new_font)
         
-        # Refresh text if there's content
-        if hasattr(self, 'content') and self.content:
-            self.set_text(self.content)
+        # Formatting that only changes some font properties inherits the rest from the base font.
+        # Reconfiguring the tags redraws the text in place; set_text would cancel a running
+        # transcription or dictation and drop the formatting.
+        for style, tag_name in self.style_tags.items():
+            self.configure_style_tag(tag_name, style)
     
     def transcribe_to_panel(self, file_path):
         """Transcribe audio file to this specific panel."""
@@ -2165,6 +1984,22 @@ class TranscriptPanel:
             self.set_text(f"Error: File not found.\n\n{file_path}")
             return
         
+        self.set_text("Transcribing audio... Please wait.")
+        job_id = self.transcription_job
+        
+        adaptive = user_settings.get("adaptive_model", False)
+        
+        # Two-pass mode: stream a fast draft, then refine with the selected (larger) model
+        draft_name = user_settings.get("draft_model", "tiny")
+        use_two_pass = (
+            user_settings.get("two_pass_transcription", False)
+            and draft_name in AVAILABLE_MODELS
+            and AVAILABLE_MODELS.index(draft_name) < AVAILABLE_MODELS.index(current_model_name)
+        )
+        if use_two_pass:
+            self.transcribe_two_pass(file_path, job_id, draft_name, current_model_name, adaptive)
+            return
+        
         # Capture self reference for use in worker thread
         panel_self = self
         
@@ -2173,49 +2008,277 @@ class TranscriptPanel:
             try:
                 # Show progress bar
                 app.after(0, lambda: start_progress_indeterminate("Transcribing audio..."))
-                panel_self.set_text("Transcribing audio... Please wait.")
+                
+                transcribe_source = file_path
+                transcribe_model = model
+                if adaptive:
+                    # Decode once, probe a few windows, then transcribe the same samples
+                    app.after(0, lambda: start_progress_indeterminate("Probing audio quality..."))
+                    transcribe_source = decode_audio(file_path, sampling_rate=WHISPER_SAMPLE_RATE)
+                    model_name, _ = choose_model_by_probe(transcribe_source, current_model_name)
+                    transcribe_model = get_whisper_model(model_name)
+                    app.after(0, lambda m=model_name: start_progress_indeterminate(f"Transcribing audio ({m}, auto)..."))
                 
                 # faster-whisper transcription
-                # Disable condition_on_previous_text to prevent cascading errors in long transcriptions
-                # This ensures each segment is transcribed independently, preventing jumbling
-                segments, info = model.transcribe(
-                    file_path, 
-                    beam_size=5,
-                    condition_on_previous_text=False  # Prevents cascading errors in long transcriptions
-                )
+                # Each segment is transcribed independently (see WHISPER_TRANSCRIBE_OPTIONS), preventing jumbling
+                segments, info = transcribe_model.transcribe(transcribe_source, **WHISPER_TRANSCRIBE_OPTIONS)
+                
+                # Paragraphs are formed from segment timings as they arrive and shown immediately,
+                # so there is no formatting step once the model finishes
+                paragraph_count = 0
+                for paragraph in group_segments_into_paragraphs(segments, info.language):
+                    if panel_self.transcription_job != job_id:
+                        # Panel text was replaced - stop transcribing into it
+                        break
+                    paragraph_count += 1
+                    app.after(0, lambda p=paragraph: panel_self.append_streamed_paragraph(
+                        job_id, p["text"], start=p["start"], end=p["end"], segments=p["segments"]))
+                    if info.duration:
+                        percent = min(99, int(paragraph["end"] / info.duration * 100))
+                        app.after(0, lambda p=percent: update_progress(p, f"Transcribing audio... {p}%"))
                 
-                # Update progress - processing segments
-                app.after(0, lambda: update_progress(50, "Processing transcription..."))
+                app.after(0, lambda: finish_progress())
+                if paragraph_count == 0:
+                    # No speech found - clear the placeholder
+                    if panel_self.transcription_job == job_id:
+                        app.after(0, lambda: panel_self.set_text(""))
+                else:
+                    app.after(0, lambda: panel_self.finish_streamed_text(job_id))
+                
+            except Exception as e:
+                app.after(0, lambda: hide_progress())
+                app.after(0, lambda err=str(e): panel_self.set_text(f"Error during transcription:\n\n{err}"))
+        
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+    
+    def transcribe_two_pass(self, file_path, job_id, draft_name, refine_name, adaptive=False):
+        """Stream a draft from a small model, then swap in paragraphs refined by a larger model.
+        
+        Paragraphs the user has edited (text or formatting) while refinement runs are left alone.
+        With adaptive selection the draft doubles as the quality probe, and refinement is
+        skipped when the draft model is already good enough for the audio.
+        """
+        panel_self = self
+        
+        def worker():
+            try:
+                app.after(0, lambda: start_progress_indeterminate(f"Drafting with {draft_name} model..."))
+                draft_model = get_whisper_model(draft_name)
+                segments, info = draft_model.transcribe(file_path, **WHISPER_TRANSCRIBE_OPTIONS)
+                draft_quality = new_quality_stats()
+                segments = track_segment_quality(segments, draft_quality)
                 
-                # Collect all segments with proper ordering
-                text_parts = []
-                for segment in segments:
-                    if segment.text and segment.text.strip():
-                        text_parts.append(segment.text.strip())
+                # Pass 1: each paragraph is shown as soon as the draft model finishes it
+                draft_paragraphs = []
+                for paragraph in group_segments_into_paragraphs(segments, info.language):
+                    index = len(draft_paragraphs)
+                    draft_paragraphs.append(paragraph)
+                    app.after(0, lambda i=index, p=paragraph: panel_self.append_streamed_paragraph(
+                        job_id, p["text"], f"draft_paragraph_{i}", draft_index=i,
+                        start=p["start"], end=p["end"], segments=p["segments"]))
+                app.after(0, lambda: panel_self.finish_streamed_text(job_id))
                 
-                # Join segments with spaces
-                text = " ".join(text_parts)
+                if not draft_paragraphs or panel_self.transcription_job != job_id:
+                    app.after(0, lambda: finish_progress())
+                    return
                 
-                # Update progress - formatting
-                app.after(0, lambda: update_progress(75, "Formatting transcript..."))
+                model_name = refine_name
+                if adaptive:
+                    model_name = choose_model_for_quality(draft_quality, refine_name)
+                    if AVAILABLE_MODELS.index(model_name) <= AVAILABLE_MODELS.index(draft_name):
+                        # The draft already meets the quality target
+                        app.after(0, lambda: finish_progress())
+                        return
                 
-                # Format transcript into paragraphs
-                formatted = format_transcript(text)
+                # Pass 2: re-transcribe with the larger model, reusing the detected language
+                app.after(0, lambda: update_progress(0, f"Refining with {model_name} model..."))
+                refine_model = get_whisper_model(model_name)
+                refined_segments, _ = refine_model.transcribe(
+                    file_path, language=info.language, **WHISPER_TRANSCRIBE_OPTIONS
+                )
+                total = len(draft_paragraphs)
+                for index, refined_text, timed_segments in align_segments_to_paragraphs(
+                        draft_paragraphs, refined_segments):
+                    if panel_self.transcription_job != job_id:
+                        # Panel text was replaced - abandon refinement
+                        break
+                    if refined_text:
+                        app.after(0, lambda i=index, t=refined_text, s=timed_segments:
+                                  panel_self.replace_refined_paragraph(job_id, i, t, s))
+                    update_progress(
+                        int((index + 1) / total * 100),
+                        f"Refining with {model_name} model... ({index + 1}/{total} paragraphs)"
+                    )
                 
-                # Update progress - highlighting
-                # Update progress - complete
+                app.after(0, lambda: panel_self.finish_streamed_text(job_id))
                 app.after(0, lambda: finish_progress())
                 
-                # Update panel with formatted text
-                app.after(0, lambda t=formatted: panel_self.set_text(t))
-                
             except Exception as e:
                 app.after(0, lambda: hide_progress())
-                app.after(0, lambda err=str(e): panel_self.set_text(f"Error during transcription:\n\n{err}"))
+                if panel_self.streamed_paragraph_count == 0:
+                    app.after(0, lambda err=str(e): panel_self.set_text(f"Error during transcription:\n\n{err}"))
+                else:
+                    # Keep the draft that is already in the panel
+                    print(f"Error during transcript refinement: {e}")
         
         thread = threading.Thread(target=worker, daemon=True)
         thread.start()
     
+    def append_streamed_paragraph(self, job_id, text, tag_name=None, draft_index=None, start=None, end=None,
+                                  segments=None):
+        """Append a paragraph produced by a running transcription job (call on the Tk thread).
+        
+        start/end are the paragraph's audio times in seconds and segments its timed
+        segment dicts, kept for timestamped and subtitle exports.
+        """
+        if job_id != self.transcription_job:
+            return
+        textbox = self.textbox._textbox
+        if self.streamed_paragraph_count == 0:
+            # First paragraph replaces the "Transcribing..." placeholder
+            textbox.delete("1.0", "end")
+        else:
+            textbox.insert("end-1c", "\n\n")
+        tags = (tag_name,) if tag_name else ()
+        textbox.insert("end-1c", text, tags)
+        self.streamed_paragraph_count += 1
+        if start is not None:
+            self.paragraph_times.append((start, end))
+            self.paragraph_segments.append(segments or [])
+        if draft_index is not None:
+            self.draft_paragraphs[draft_index] = text
+    
+    def replace_refined_paragraph(self, job_id, index, refined_text, segments=None):
+        """Swap a draft paragraph for its refined text unless the user has edited it.
+        
+        segments are the refined timed segments, which replace the draft's for subtitles.
+        Returns True if the paragraph was replaced.
+        """
+        if job_id != self.transcription_job:
+            return False
+        textbox = self.textbox._textbox
+        tag_name = f"draft_paragraph_{index}"
+        ranges = textbox.tag_ranges(tag_name)
+        if len(ranges) != 2:
+            # Paragraph was deleted or split by an edit
+            return False
+        start, end = ranges
+        if textbox.get(start, end) != self.draft_paragraphs.get(index):
+            return False
+        # Formatting applied to the draft also counts as an edit
+        if self.span_store.has_formatting(self.text_offset(start), self.text_offset(end)):
+            return False
+        if segments and index < len(self.paragraph_segments):
+            self.paragraph_segments[index] = segments
+            self.revision += 1
+        if refined_text == self.draft_paragraphs[index]:
+            return True
+        textbox.delete(start, end)
+        textbox.insert(start, refined_text, (tag_name,))
+        self.draft_paragraphs[index] = refined_text
+        return True
+    
+    def finish_streamed_text(self, job_id):
+        """Sync panel state after a streaming job has written its text."""
+        if job_id != self.transcription_job:
+            return
+        self.on_text_change()
+    
+    def toggle_live_dictation(self):
+        """Start live dictation into this panel, or stop the running session."""
+        if self.live_session:
+            self.live_session.stop()
+            return
+        
+        source_path = None
+        if SOUNDDEVICE_AVAILABLE:
+            import tkinter.messagebox as messagebox
+            use_microphone = messagebox.askyesnocancel(
+                "Live Dictation",
+                "Dictate from the microphone?\n\n"
+                "Yes = microphone\nNo = replay an audio file in real time"
+            )
+            if use_microphone is None:
+                return
+            if not use_microphone:
+                source_path = self.ask_live_replay_file()
+                if not source_path:
+                    return
+        else:
+            # No microphone support installed - replay a file or pipe instead
+            source_path = self.ask_live_replay_file()
+            if not source_path:
+                return
+        self.start_live_dictation(source_path)
+    
+    def ask_live_replay_file(self):
+        """Ask for an audio file (or named pipe) to replay as live input."""
+        return filedialog.askopenfilename(
+            title="Select Audio to Replay as Live Input",
+            filetypes=[("Audio Files", "*.mp3;*.wav"), ("All Files", "*.*")]
+        )
+    
+    def start_live_dictation(self, source_path=None):
+        """Start a live dictation session from the microphone or a replayed file."""
+        textbox = self.textbox._textbox
+        textbox.tag_configure("live_provisional", foreground="#9A9A9A")
+        self.live_session = LiveDictationSession(self, self.transcription_job, source_path)
+        try:
+            self.live_session.start()
+        except Exception as e:
+            self.live_session = None
+            import tkinter.messagebox as messagebox
+            messagebox.showerror("Live Dictation", f"Could not start live dictation: {e}")
+            return
+        self.live_btn.configure(text="⏹", fg_color="#CC4444", hover_color="#FF5555")
+        start_progress_indeterminate("🎙 Live dictation - listening...")
+    
+    def update_live_text(self, session, committed_text, provisional_text, commit_latency, partial_latency):
+        """Commit stable live text and redraw the provisional hypothesis (call on the Tk thread)."""
+        if session is not self.live_session or session.job_id != self.transcription_job:
+            return
+        textbox = self.textbox._textbox
+        ranges = textbox.tag_ranges("live_provisional")
+        if ranges:
+            textbox.delete(ranges[0], ranges[-1])
+        if committed_text:
+            previous_char = textbox.get("end-2c", "end-1c")
+            # A paragraph break already separates the text
+            if previous_char and not previous_char.isspace() and not committed_text[0].isspace():
+                committed_text = " " + committed_text
+            textbox.insert("end-1c", committed_text)
+        if provisional_text:
+            previous_char = textbox.get("end-2c", "end-1c")
+            if previous_char and not previous_char.isspace():
+                provisional_text = " " + provisional_text
+            textbox.insert("end-1c", provisional_text, ("live_provisional",))
+        textbox.see("end")
+        
+        # Show measured latency
+        status = "🎙 Live"
+        if commit_latency is not None:
+            status += f" | committed in {commit_latency:.1f}s (avg {session.average_latency():.1f}s)"
+        if partial_latency is not None:
+            status += f" | partial {partial_latency:.1f}s"
+        progress_label.configure(text=status)
+    
+    def on_live_session_finished(self, session):
+        """Clean up after a live dictation session has stopped."""
+        if session is not self.live_session:
+            return
+        self.live_session = None
+        textbox = self.textbox._textbox
+        ranges = textbox.tag_ranges("live_provisional")
+        if ranges:
+            textbox.delete(ranges[0], ranges[-1])
+        self.live_btn.configure(text="🎙", fg_color=BUTTON_COLOR, hover_color=BUTTON_HOVER_COLOR)
+        average = session.average_latency()
+        if average is not None:
+            print(f"Live dictation average committed latency: {average:.2f}s")
+        finish_progress()
+        self.on_text_change()
+    
     def save_transcript(self):
         """Save transcript to in-app folder. Preserves formatting tags."""
         # Get current text from textbox
@@ -2237,7 +2300,8 @@ class TranscriptPanel:
         
         if filename:
             # Save text with formatting tags
-            saved_name = save_transcript_to_app(text, filename, self.formatting_tags)
+            text, formatting_sidecar = self.get_saved_content()
+            saved_name = save_transcript_to_app(text, filename, formatting_sidecar)
             if saved_name:
                 # Associate this panel with the saved file for auto-save
                 self.associated_saved_file = saved_name
@@ -2283,116 +2347,121 @@ class TranscriptPanel:
             sel_end = self.textbox._textbox.index("sel.last")
             
             if sel_start and sel_end:
-                # Remove all highlight tags in selection
-                for tag_name in list(self.formatting_tags.keys()):
-                    if tag_name.startswith("highlight_"):
-                        self.textbox._textbox.tag_remove(tag_name, sel_start, sel_end)
-                        # Update stored tags
-                        if tag_name in self.formatting_tags:
-                            del self.formatting_tags[tag_name]
+                start, end = self.text_offset(sel_start), self.text_offset(sel_end)
+                self.span_store.apply(start, end, highlight=None)
+                self.render_formatting(start, end)
                 self.on_text_change()  # Trigger save
         except Exception as e:
             print(f"Error clearing highlight: {e}")
     
-    def get_current_font_properties(self, sel_start):
-        """Get current font properties from existing tags at a position."""
-        base_font = self.textbox.cget("font")
-        if isinstance(base_font, tuple):
-            font_family = base_font[0]
-            font_size = int(base_font[1]) if len(base_font) > 1 else int(self.font_settings["size"])
-            styles = list(base_font[2:]) if len(base_font) > 2 else []
-        else:
-            font_family = self.font_settings["family"]
-            font_size = int(self.font_settings["size"])
-            styles = []
-        
-        # Check existing tags for font properties
-        existing_tags = self.textbox._textbox.tag_names(sel_start)
-        for tag in existing_tags:
-            try:
-                tag_config = self.textbox._textbox.tag_config(tag)
-                if 'font' in tag_config and tag_config['font'][4]:  # [4] is the actual value
-                    existing_font = tag_config['font'][4]
-                    if isinstance(existing_font, tuple):
-                        if len(existing_font) > 0:
-                            font_family = existing_font[0]
-                        if len(existing_font) > 1:
-                            font_size = int(existing_font[1])
-                        if len(existing_font) > 2:
-                            styles = list(existing_font[2:])
-            except:
-                pass
+    def text_offset(self, index):
+        """Character offset of a text index, as used by the span store."""
+        return self.edit_tracker.offset(index)
+    
+    def style_tag(self, style):
+        """Tk tag that draws a style, created on first use and shared by every range with that style."""
+        tag_name = self.style_tags.get(style)
+        if tag_name is None:
+            self.style_tag_counter += 1
+            tag_name = f"style_{self.style_tag_counter}"
+            self.style_tags[style] = tag_name
+            self.configure_style_tag(tag_name, style)
+            # Formatting never covers another style tag; keep selection and search marks drawn above it
+            self.textbox._textbox.tag_lower(tag_name)
+        return tag_name
+    
+    def configure_style_tag(self, tag_name, style):
+        """Configure a style tag's font and colors; unset font properties come from the panel font."""
+        properties = style_to_dict(style)
+        options = {}
+        if properties["family"] or properties["size"] or properties["bold"] or properties["italic"]:
+            font_tuple = (properties["family"] or self.font_settings["family"],
+                          int(properties["size"] or self.font_settings["size"]))
+            if properties["bold"]:
+                font_tuple += ("bold",)
+            if properties["italic"]:
+                font_tuple += ("italic",)
+            options["font"] = font_tuple
+        if properties["underline"]:
+            options["underline"] = True
+        if properties["color"]:
+            options["foreground"] = properties["color"]
+        if properties["highlight"]:
+            options["background"] = properties["highlight"]
+        self.textbox._textbox.tag_configure(tag_name, **options)
+    
+    def render_formatting(self, start=0, end=None):
+        """Redraw the span store's runs in [start, end) with the interned style tags."""
+        textbox = self.textbox._textbox
+        if end is None:
+            end = self.span_store.length
+        if start >= end:
+            return
+        first, last = f"1.0 + {start} chars", f"1.0 + {end} chars"
+        for tag_name in self.style_tags.values():
+            textbox.tag_remove(tag_name, first, last)
+        self.add_style_ranges(self.span_store.runs(start, end))
+        self.schedule_formatting_compaction()
+    
+    def add_style_ranges(self, runs, line_starts=None):
+        """Tag (start, end, style) runs with their style tags: one Tk call per style, however many ranges.
         
-        return font_family, font_size, styles
+        With the text's line starts the offsets are passed to Tk as "line.column" indices,
+        which Tk resolves directly instead of counting characters from the top.
+        """
+        ranges_by_tag = {}
+        for run_start, run_end, style in runs:
+            if style == PLAIN_STYLE:
+                continue
+            if line_starts is None:
+                indices = (f"1.0 + {run_start} chars", f"1.0 + {run_end} chars")
+            else:
+                indices = (offset_to_text_index(run_start, line_starts), offset_to_text_index(run_end, line_starts))
+            ranges_by_tag.setdefault(self.style_tag(style), []).extend(indices)
+        textbox = self.textbox._textbox
+        for tag_name, indices in ranges_by_tag.items():
+            textbox.tag_add(tag_name, *indices)
+    
+    def schedule_formatting_compaction(self):
+        """Compact the formatting once the event loop is idle (at most one pending pass)."""
+        if self.compaction_job is None:
+            self.compaction_job = app.after_idle(self.compact_formatting)
+    
+    def compact_formatting(self):
+        """Merge same-style neighbouring runs and delete style tags no text uses any more."""
+        self.compaction_job = None
+        try:
+            self.span_store.coalesce()
+            # The store mirrors the widget, so a style it no longer uses has no ranges in Tk either
+            styles_in_use = self.span_store.styles_in_use()
+            for style in [style for style in self.style_tags if style not in styles_in_use]:
+                self.textbox._textbox.tag_delete(self.style_tags.pop(style))
+        except Exception as e:
+            print(f"Error compacting formatting: {e}")
+    
+    def selection_value(self, sel_start, sel_end, key):
+        """One style property (bold, underline, ...) across a selection; MIXED if it varies inside it."""
+        return self.span_store.range_value(self.text_offset(sel_start), self.text_offset(sel_end), key)
     
     def merge_and_apply_font_tag(self, sel_start, sel_end, **font_props):
-        """Merge font properties and apply a single font tag (since tkinter tags don't stack fonts)."""
+        """Set font properties (family, size, bold, italic) on a selection, keeping everything else.
+        
+        Only the given properties change, so a selection mixing fonts or sizes keeps them.
+        """
         try:
-            # Get current font properties
-            font_family, font_size, styles = self.get_current_font_properties(sel_start)
-            
-            # Apply new properties (only override if explicitly provided)
-            if 'family' in font_props and font_props['family']:
-                font_family = font_props['family']
-            if 'size' in font_props and font_props['size'] is not None:
-                font_size = int(font_props['size'])
-            if 'bold' in font_props:
-                if font_props['bold']:
-                    if 'bold' not in styles:
-                        styles.append('bold')
-                else:
-                    if 'bold' in styles:
-                        styles.remove('bold')
-            if 'italic' in font_props:
-                if font_props['italic']:
-                    if 'italic' not in styles:
-                        styles.append('italic')
-                else:
-                    if 'italic' in styles:
-                        styles.remove('italic')
-            
-            # Create merged font tuple
-            font_tuple = (font_family, font_size)
-            if styles:
-                font_tuple = tuple(list(font_tuple) + styles)
-            
-            # Remove existing font tags in this range
-            existing_tags = self.textbox._textbox.tag_names(sel_start)
-            for tag in existing_tags:
-                try:
-                    tag_config = self.textbox._textbox.tag_config(tag)
-                    if 'font' in tag_config and tag_config['font'][4]:
-                        # This is a font tag - remove it from selection
-                        self.textbox._textbox.tag_remove(tag, sel_start, sel_end)
-                        # Check if tag still exists elsewhere
-                        ranges = self.textbox._textbox.tag_ranges(tag)
-                        if not ranges or len(ranges) == 0:
-                            if tag in self.formatting_tags:
-                                del self.formatting_tags[tag]
-                except:
-                    pass
-            
-            # Create new merged font tag
-            tag_name = f"font_merged_{len(self.formatting_tags)}_{id(sel_start)}"
-            self.textbox._textbox.tag_configure(tag_name, font=font_tuple)
-            self.textbox._textbox.tag_add(tag_name, sel_start, sel_end)
-            
-            # Store in formatting_tags
-            tag_info = {
-                "type": "font_merged",
-                "start": str(sel_start),
-                "end": str(sel_end),
-                "family": font_family,
-                "size": font_size,
-                "bold": "bold" in styles,
-                "italic": "italic" in styles
-            }
-            self.formatting_tags[tag_name] = tag_info
-            
-            return tag_name
+            changes = {}
+            if font_props.get('family'):
+                changes['family'] = font_props['family']
+            if font_props.get('size') is not None:
+                changes['size'] = int(font_props['size'])
+            for key in ('bold', 'italic'):
+                if key in font_props:
+                    changes[key] = bool(font_props[key])
+            start, end = self.text_offset(sel_start), self.text_offset(sel_end)
+            self.span_store.apply(start, end, **changes)
+            self.render_formatting(start, end)
         except Exception as e:
             print(f"Error merging font tag: {e}")
-            return None
     
     def apply_formatting_tag(self, tag_type, value=None, tag_config=None):
         """Apply a formatting tag to selected text, allowing multiple tags to stack."""
@@ -2405,59 +2474,27 @@ class TranscriptPanel:
             
             # Non-font properties can stack (underline, color, highlight)
             if tag_type in ["underline", "fontcolor", "highlight"]:
-                # Create a unique tag name
-                tag_id = f"{tag_type}_{len(self.formatting_tags)}_{id(sel_start)}"
-                tag_name = f"{tag_type}_{tag_id}"
-                
-                # Configure tag
-                if tag_config:
-                    self.textbox._textbox.tag_configure(tag_name, **tag_config)
-                elif tag_type == "underline":
-                    self.textbox._textbox.tag_configure(tag_name, underline=True)
-                
-                # Add tag to selection (will stack with existing tags)
-                self.textbox._textbox.tag_add(tag_name, sel_start, sel_end)
-                
-                # Store in formatting_tags
-                tag_info = {"type": tag_type, "start": str(sel_start), "end": str(sel_end)}
-                if value is not None:
-                    if tag_type == "fontcolor":
-                        tag_info["color"] = value
-                    elif tag_type == "highlight":
-                        tag_info["color"] = value
-                self.formatting_tags[tag_name] = tag_info
+                if tag_type == "underline":
+                    changes = {"underline": True}
+                elif tag_type == "fontcolor":
+                    changes = {"color": value}
+                else:
+                    changes = {"highlight": value}
+                # The change stacks with the selection's other properties in its style
+                start, end = self.text_offset(sel_start), self.text_offset(sel_end)
+                self.span_store.apply(start, end, **changes)
+                self.render_formatting(start, end)
                 
-            # Font properties need to be merged into a single tag
+            # Font properties share one font per style; only the one being set changes
             elif tag_type in ["bold", "italic", "fontsize", "font"]:
-                # Get current font properties to preserve what's not being changed
-                font_family, current_size, current_styles = self.get_current_font_properties(sel_start)
-                
-                font_props = {}
                 if tag_type == "bold":
-                    font_props['bold'] = True
-                    # Preserve italic, size, and family
-                    font_props['italic'] = "italic" in current_styles
-                    font_props['size'] = current_size
-                    font_props['family'] = font_family
+                    font_props = {'bold': True}
                 elif tag_type == "italic":
-                    font_props['italic'] = True
-                    # Preserve bold, size, and family
-                    font_props['bold'] = "bold" in current_styles
-                    font_props['size'] = current_size
-                    font_props['family'] = font_family
+                    font_props = {'italic': True}
                 elif tag_type == "fontsize":
-                    font_props['size'] = int(value) if value else current_size
-                    # Preserve bold, italic, and family
-                    font_props['bold'] = "bold" in current_styles
-                    font_props['italic'] = "italic" in current_styles
-                    font_props['family'] = font_family
-                elif tag_type == "font":
-                    font_props['family'] = value
-                    # Preserve bold, italic, and size
-                    font_props['bold'] = "bold" in current_styles
-                    font_props['italic'] = "italic" in current_styles
-                    font_props['size'] = current_size
-                
+                    font_props = {'size': int(value) if value else None}
+                else:
+                    font_props = {'family': value}
                 self.merge_and_apply_font_tag(sel_start, sel_end, **font_props)
             
             self.on_text_change()  # Trigger save
@@ -2472,34 +2509,9 @@ class TranscriptPanel:
             sel_end = self.textbox._textbox.index("sel.last")
             
             if sel_start and sel_end and sel_start != sel_end:
-                # Check if text is already bold by examining font tags
-                tags_at_pos = self.textbox._textbox.tag_names(sel_start)
-                has_bold = False
-                
-                # Check font tags for bold
-                for tag in tags_at_pos:
-                    try:
-                        tag_config = self.textbox._textbox.tag_config(tag)
-                        if 'font' in tag_config and tag_config['font'][4]:
-                            font_tuple = tag_config['font'][4]
-                            if isinstance(font_tuple, tuple) and len(font_tuple) > 2:
-                                has_bold = "bold" in font_tuple[2:]
-                    except:
-                        # Also check by tag name
-                        if "bold" in str(tag) or "font_merged" in str(tag):
-                            # Check formatting_tags
-                            if tag in self.formatting_tags:
-                                tag_info = self.formatting_tags[tag]
-                                if tag_info.get("bold") or tag_info.get("type") == "bold":
-                                    has_bold = True
-                
-                # Toggle bold
-                if has_bold:
-                    # Remove bold - merge font without bold
-                    self.merge_and_apply_font_tag(sel_start, sel_end, bold=False)
-                else:
-                    # Add bold - merge font with bold
-                    self.merge_and_apply_font_tag(sel_start, sel_end, bold=True)
+                # Remove bold only if the whole selection is bold; a mixed selection becomes bold
+                bold = self.selection_value(sel_start, sel_end, "bold")
+                self.merge_and_apply_font_tag(sel_start, sel_end, bold=bold is not True)
                 
                 self.on_text_change()  # Trigger save
         except Exception as e:
@@ -2512,33 +2524,9 @@ class TranscriptPanel:
             sel_end = self.textbox._textbox.index("sel.last")
             
             if sel_start and sel_end and sel_start != sel_end:
-                # Check if text is already italic by examining font tags
-                tags_at_pos = self.textbox._textbox.tag_names(sel_start)
-                has_italic = False
-                
-                # Check font tags for italic
-                for tag in tags_at_pos:
-                    try:
-                        tag_config = self.textbox._textbox.tag_config(tag)
-                        if 'font' in tag_config and tag_config['font'][4]:
-                            font_tuple = tag_config['font'][4]
-                            if isinstance(font_tuple, tuple) and len(font_tuple) > 2:
-                                has_italic = "italic" in font_tuple[2:]
-                    except:
-                        # Also check by tag name
-                        if "italic" in str(tag) or "font_merged" in str(tag):
-                            if tag in self.formatting_tags:
-                                tag_info = self.formatting_tags[tag]
-                                if tag_info.get("italic") or tag_info.get("type") == "italic":
-                                    has_italic = True
-                
-                # Toggle italic
-                if has_italic:
-                    # Remove italic - merge font without italic
-                    self.merge_and_apply_font_tag(sel_start, sel_end, italic=False)
-                else:
-                    # Add italic - merge font with italic
-                    self.merge_and_apply_font_tag(sel_start, sel_end, italic=True)
+                # Remove italic only if the whole selection is italic; a mixed selection becomes italic
+                italic = self.selection_value(sel_start, sel_end, "italic")
+                self.merge_and_apply_font_tag(sel_start, sel_end, italic=italic is not True)
                 
                 self.on_text_change()  # Trigger save
         except Exception as e:
@@ -2551,24 +2539,11 @@ class TranscriptPanel:
             sel_end = self.textbox._textbox.index("sel.last")
             
             if sel_start and sel_end and sel_start != sel_end:
-                tags_at_pos = self.textbox._textbox.tag_names(sel_start)
-                has_underline = any("underline" in str(tag) for tag in tags_at_pos)
-                
-                if has_underline:
-                    # Remove underline from selection
-                    for tag in tags_at_pos:
-                        if "underline" in str(tag):
-                            try:
-                                self.textbox._textbox.tag_remove(tag, sel_start, sel_end)
-                                ranges = self.textbox._textbox.tag_ranges(tag)
-                                if not ranges or len(ranges) == 0:
-                                    if tag in self.formatting_tags:
-                                        del self.formatting_tags[tag]
-                            except:
-                                pass
-                else:
-                    # Add underline (can stack with other formatting)
-                    self.apply_formatting_tag("underline", tag_config={"underline": True})
+                # Remove underline only if the whole selection is underlined
+                underline = self.selection_value(sel_start, sel_end, "underline")
+                start, end = self.text_offset(sel_start), self.text_offset(sel_end)
+                self.span_store.apply(start, end, underline=underline is not True)
+                self.render_formatting(start, end)
                 
                 self.on_text_change()  # Trigger save
         except Exception as e:
@@ -2608,14 +2583,8 @@ class TranscriptPanel:
             sel_end = self.textbox._textbox.index("sel.last")
             
             if sel_start and sel_end and sel_start != sel_end:
-                # Change font size - merges with existing font properties (bold, italic, etc.)
-                # Get current font properties to preserve bold/italic
-                font_family, current_size, styles = self.get_current_font_properties(sel_start)
-                
-                # Merge font size change with existing properties
-                self.merge_and_apply_font_tag(sel_start, sel_end, size=int(font_size), 
-                                            bold="bold" in styles, italic="italic" in styles,
-                                            family=font_family)
+                # Change font size - bold, italic and family stay as they are
+                self.merge_and_apply_font_tag(sel_start, sel_end, size=int(font_size))
                 self.on_text_change()  # Trigger save
         except Exception as e:
             print(f"Error changing font size: {e}")
@@ -2836,38 +2805,19 @@ class TranscriptPanel:
     
     def export_content(self):
         """Export panel content with formatting."""
-        text = self.textbox.get("1.0", "end").strip()
-        if not text:
+        document = self.get_document_model()
+        if not document["text"]:
             return
         
-        # Update formatting tags with current positions before export
-        self.update_formatting_tag_positions()
-        
-        file_path = filedialog.asksaveasfilename(
+        file_path, append = ask_export_path(
             title=f"Export {self.label_text}",
             defaultextension=".txt",
-            filetypes=[
-                ("Text File", "*.txt"),
-                ("Word Document", "*.docx"),
-                ("PDF Document", "*.pdf"),
-                ("JSON File", "*.json")
-            ]
+            filetypes=export_filetypes()
         )
         
         if file_path:
-            try:
-                if file_path.endswith(".txt"):
-                    export_to_txt(text, file_path)
-                elif file_path.endswith(".docx"):
-                    export_to_docx(text, file_path, self.formatting_tags, self.textbox)
-                elif file_path.endswith(".pdf"):
-                    export_to_pdf(text, file_path, self.formatting_tags, self.textbox)
-                elif file_path.endswith(".json"):
-                    export_to_json(text, file_path, self.label_text)
-            except Exception as e:
-                print(f"Export error: {e}")
-                import tkinter.messagebox as messagebox
-                messagebox.showerror("Export Error", f"Failed to export: {e}")
+            # The cached document is never modified (edits build a new one), so it is a safe snapshot
+            start_background_export(document, file_path, append)
     
     def set_text(self, text, apply_bold=False, formatting_tags=None):
         """Set text content.
@@ -2883,10 +2833,24 @@ class TranscriptPanel:
         if was_auto_saving:
             self.associated_saved_file = None
         
+        # Any in-flight transcription job must stop writing into this panel
+        self.transcription_job += 1
+        self.restore_job += 1  # A restore still filling in formatting belongs to the old text
+        if self.restore_timer is not None:
+            app.after_cancel(self.restore_timer)  # ... and so does one that has not started yet
+            self.restore_timer = None
+        self.streamed_paragraph_count = 0
+        self.draft_paragraphs = {}
+        self.paragraph_times = []
+        self.paragraph_segments = []
+        self.revision += 1
+        
+        # Deleting the text also empties the span store, so compacting now deletes every
+        # style tag the old text used instead of leaving them for the next formatting edit
         self.textbox.delete("1.0", "end")
-        
-        # Clear existing formatting tags
-        self.formatting_tags = {}
+        if self.compaction_job is not None:
+            app.after_cancel(self.compaction_job)
+        self.compact_formatting()
         
         # Remove ** markers if present (treat all text the same way)
         if "**" in text:
@@ -2902,213 +2866,62 @@ class TranscriptPanel:
         # Restore formatting tags if provided (after text is inserted)
         if formatting_tags:
             # Need to restore after text is fully inserted
-            app.after(10, lambda: self.restore_formatting_tags(formatting_tags))
+            self.restore_timer = app.after(10, lambda: self.restore_formatting_tags(formatting_tags))
         
         # Re-enable auto-save if it was enabled
         if was_auto_saving:
             self.associated_saved_file = temp_file
     
-    def get_font_for_tag(self, base_font, tag_info):
-        """Get the appropriate font tuple for a formatting tag, preserving other formatting."""
-        if isinstance(base_font, tuple):
-            font_family = base_font[0]
-            font_size = int(base_font[1]) if len(base_font) > 1 else int(self.font_settings["size"])
-            font_styles = []
-            if len(base_font) > 2:
-                # Preserve existing styles
-                for style in base_font[2:]:
-                    if style not in ["bold", "italic"]:
-                        font_styles.append(style)
-        else:
-            font_family = self.font_settings["family"]
-            font_size = int(self.font_settings["size"])
-            font_styles = []
-        
-        # Apply tag-specific formatting
-        if tag_info.get("type") == "bold":
-            if "bold" not in font_styles:
-                font_styles.append("bold")
-        elif tag_info.get("type") == "italic":
-            if "italic" not in font_styles:
-                font_styles.append("italic")
-        elif tag_info.get("type") == "fontsize":
-            font_size = int(tag_info.get("size", font_size))
-        elif tag_info.get("type") == "font":
-            font_family = tag_info.get("family", font_family)
-        
-        if font_styles:
-            return tuple([font_family, font_size] + font_styles)
-        else:
-            return (font_family, font_size)
-    
     def restore_formatting_tags(self, formatting_tags):
-        """Restore formatting tags from saved metadata."""
+        """Restore formatting from a saved sidecar (compact or older tag-entry format)."""
+        self.restore_timer = None
         try:
             if not formatting_tags:
                 return
             
-            base_font = self.textbox.cget("font")
-            
-            # Build a map of positions to tags
-            position_tags = {}  # Maps (start, end) tuples to list of tags
-            
-            for tag_name, tag_info in formatting_tags.items():
-                try:
-                    start = tag_info.get("start")
-                    end = tag_info.get("end")
-                    
-                    if not start or not end:
-                        continue
-                    
-                    # Convert to tkinter index format if needed
-                    try:
-                        start_index = str(start)
-                        end_index = str(end)
-                        # Validate positions
-                        self.textbox._textbox.index(start_index)
-                        self.textbox._textbox.index(end_index)
-                    except:
-                        # Try converting from character offset
-                        try:
-                            if isinstance(start, int):
-                                start_index = self.textbox._textbox.index(f"1.0 + {start} chars")
-                                end_index = self.textbox._textbox.index(f"1.0 + {end} chars")
-                            else:
-                                continue
-                        except:
-                            continue
-                    
-                    # Group tags by position range
-                    pos_key = (start_index, end_index)
-                    if pos_key not in position_tags:
-                        position_tags[pos_key] = []
-                    position_tags[pos_key].append((tag_name, tag_info))
-                    
-                except Exception as e:
-                    print(f"Error processing tag {tag_name}: {e}")
-                    continue
-            
-            # Apply tags grouped by position
-            for (start_index, end_index), tags_list in position_tags.items():
-                try:
-                    # Collect all formatting properties for this range
-                    font_family = None
-                    font_size = None
-                    is_bold = False
-                    is_italic = False
-                    is_underline = False
-                    font_color = None
-                    highlight_color = None
-                    
-                    for tag_name, tag_info in tags_list:
-                        tag_type = tag_info.get("type")
-                        
-                        if tag_type == "font_merged":
-                            # Merged font tag contains all font properties
-                            font_family = tag_info.get("family", font_family)
-                            size_val = tag_info.get("size", font_size)
-                            if size_val:
-                                font_size = int(size_val) if not isinstance(size_val, int) else size_val
-                            is_bold = tag_info.get("bold", is_bold)
-                            is_italic = tag_info.get("italic", is_italic)
-                        elif tag_type == "bold":
-                            is_bold = True
-                        elif tag_type == "italic":
-                            is_italic = True
-                        elif tag_type == "underline":
-                            is_underline = True
-                        elif tag_type == "fontcolor":
-                            font_color = tag_info.get("color")
-                        elif tag_type == "highlight":
-                            highlight_color = tag_info.get("color")
-                        elif tag_type == "font":
-                            font_family = tag_info.get("family", font_family)
-                        elif tag_type == "fontsize":
-                            size_val = tag_info.get("size")
-                            if size_val:
-                                font_size = int(size_val) if not isinstance(size_val, int) else size_val
-                    
-                    # Get base font properties for defaults
-                    if isinstance(base_font, tuple):
-                        default_family = base_font[0]
-                        default_size = int(base_font[1]) if len(base_font) > 1 else int(self.font_settings["size"])
-                    else:
-                        default_family = self.font_settings["family"]
-                        default_size = int(self.font_settings["size"])
-                    
-                    if font_family is None:
-                        font_family = default_family
-                    if font_size is None:
-                        font_size = default_size
-                    
-                    # Build font tuple with styles
-                    font_styles = []
-                    if is_bold:
-                        font_styles.append("bold")
-                    if is_italic:
-                        font_styles.append("italic")
-                    
-                    font_tuple = (font_family, font_size)
-                    if font_styles:
-                        font_tuple = tuple(list(font_tuple) + font_styles)
-                    
-                    # Apply formatting as separate tags (font merged, others stack)
-                    # 1. Font properties (as merged tag)
-                    if is_bold or is_italic or font_family != default_family or font_size != default_size:
-                        tag_name_font = f"restored_font_{len(self.formatting_tags)}"
-                        self.textbox._textbox.tag_configure(tag_name_font, font=font_tuple)
-                        self.textbox._textbox.tag_add(tag_name_font, start_index, end_index)
-                        self.formatting_tags[tag_name_font] = {
-                            "type": "font_merged",
-                            "start": start_index,
-                            "end": end_index,
-                            "family": font_family,
-                            "size": font_size,
-                            "bold": is_bold,
-                            "italic": is_italic
-                        }
-                    
-                    # 2. Underline (separate tag, can stack)
-                    if is_underline:
-                        tag_name_underline = f"restored_underline_{len(self.formatting_tags)}"
-                        self.textbox._textbox.tag_configure(tag_name_underline, underline=True)
-                        self.textbox._textbox.tag_add(tag_name_underline, start_index, end_index)
-                        self.formatting_tags[tag_name_underline] = {
-                            "type": "underline",
-                            "start": start_index,
-                            "end": end_index
-                        }
-                    
-                    # 3. Font color (separate tag, can stack)
-                    if font_color:
-                        tag_name_color = f"restored_fontcolor_{len(self.formatting_tags)}"
-                        self.textbox._textbox.tag_configure(tag_name_color, foreground=font_color)
-                        self.textbox._textbox.tag_add(tag_name_color, start_index, end_index)
-                        self.formatting_tags[tag_name_color] = {
-                            "type": "fontcolor",
-                            "start": start_index,
-                            "end": end_index,
-                            "color": font_color
-                        }
-                    
-                    # 4. Highlight (separate tag, can stack)
-                    if highlight_color:
-                        tag_name_highlight = f"restored_highlight_{len(self.formatting_tags)}"
-                        self.textbox._textbox.tag_configure(tag_name_highlight, background=highlight_color)
-                        self.textbox._textbox.tag_add(tag_name_highlight, start_index, end_index)
-                        self.formatting_tags[tag_name_highlight] = {
-                            "type": "highlight",
-                            "start": start_index,
-                            "end": end_index,
-                            "color": highlight_color
-                        }
-                        
-                except Exception as e:
-                    print(f"Error restoring tags at {start_index}-{end_index}: {e}")
-                    continue
-                    
+            # The span store takes the saved formatting as its state right away (saves and
+            # exports use it); the widget is tagged in slices so the text stays usable meanwhile
+            widget_text = self.textbox._textbox.get("1.0", "end-1c")
+            self.span_store.copy_from(span_store_from_sidecar(widget_text, formatting_tags))
+            self.restore_job += 1
+            runs = list(self.span_store.formatted_runs())
+            self.render_restored_runs(
+                self.restore_job, runs, 0, text_line_starts(widget_text), self.edit_tracker.edit_count
+            )
         except Exception as e:
             print(f"Error restoring formatting tags: {e}")
+        finally:
+            # Restored tags change the exported formatting
+            self.revision += 1
+    
+    def render_restored_runs(self, job_id, runs, position, line_starts, edit_count):
+        """Tag one slice of restored formatting runs, then queue the next slice."""
+        textbox = self.textbox._textbox
+        if job_id != self.restore_job:
+            textbox.mark_unset("restore_resume")
+            return  # The text was replaced or another restore started
+        try:
+            if self.edit_tracker.edit_count != edit_count:
+                # The text was edited mid-restore, so the remaining offsets and line starts are
+                # stale. Ranges already tagged moved with the text, as did the resume mark, and
+                # the store tracked the edit, so carry on slicing from the mark with fresh ones.
+                runs = [run for run in self.span_store.runs(self.text_offset("restore_resume")) if run[2] != PLAIN_STYLE]
+                position = 0
+                line_starts = text_line_starts(textbox.get("1.0", "end-1c"))
+                edit_count = self.edit_tracker.edit_count
+            self.add_style_ranges(runs[position:position + RESTORE_SLICE_RUNS], line_starts)
+            position += RESTORE_SLICE_RUNS
+            if position < len(runs):
+                # Left gravity keeps text typed at the mark on the not yet tagged side
+                textbox.mark_set("restore_resume", offset_to_text_index(runs[position][0], line_starts))
+                textbox.mark_gravity("restore_resume", "left")
+                # after() rather than after_idle() so input and redraws get in between slices
+                app.after(1, lambda: self.render_restored_runs(job_id, runs, position, line_starts, edit_count))
+            else:
+                textbox.mark_unset("restore_resume")
+                self.schedule_formatting_compaction()
+        except Exception as e:
+            print(f"Error restoring formatting: {e}")
     
     def get_text(self):
         """Get text content."""
@@ -3116,6 +2929,9 @@ class TranscriptPanel:
     
     def on_text_change(self, event=None):
         """Handle text changes - trigger auto-save with debouncing."""
+        # Formatting changes also land here, so the cached document model is stale
+        self.revision += 1
+        
         # Update content to match current text
         self.content = self.get_text()
         
@@ -3127,20 +2943,46 @@ class TranscriptPanel:
             # Schedule auto-save after 1 second of no changes
             self.auto_save_timer = app.after(1000, self.auto_save_transcript)
     
+    def on_text_modified(self, event=None):
+        """Invalidate the cached document model whenever the widget text changes."""
+        textbox = self.textbox._textbox
+        if textbox.edit_modified():
+            self.revision += 1
+            # Reset the flag so the next change fires <<Modified>> again
+            textbox.edit_modified(False)
+    
+    def get_document_model(self):
+        """Return the document model (text, styled paragraphs, timestamps) for exports and previews.
+        
+        Built from the widget once per revision; repeated calls without edits reuse it.
+        """
+        if self.document_cache and self.document_cache[:2] == (self.revision, self.label_text):
+            return self.document_cache[2]
+        
+        text = self.get_text()
+        try:
+            widget_text = self.textbox._textbox.get("1.0", "end-1c")
+            document = build_styled_document(
+                text, span_store_segments(widget_text, self.span_store), self.label_text, self.paragraph_times,
+                [segment for segments in self.paragraph_segments for segment in segments]
+            )
+        except Exception as e:
+            print(f"Error reading formatting for export: {e}, falling back to plain text")
+            document = build_plain_document(text, self.label_text)
+        
+        self.document_cache = (self.revision, self.label_text, document)
+        return document
+    
     def auto_save_transcript(self):
         """Auto-save transcript to associated saved file."""
         if not self.associated_saved_file:
             return
         
         try:
-            # Always get the current text from the textbox to ensure edits are saved
-            text = self.get_text()
-            
-            # Update formatting tags with current positions
-            self.update_formatting_tag_positions()
-            
-            # Save text and formatting tags
-            save_transcript_to_app(text, self.associated_saved_file, self.formatting_tags)
+            # Always get the current text from the textbox to ensure edits are saved,
+            # with the formatting spans at their current positions in that text
+            text, formatting_sidecar = self.get_saved_content()
+            save_transcript_to_app(text, self.associated_saved_file, formatting_sidecar)
             
             # Update content to match saved text
             self.content = text
@@ -3148,33 +2990,46 @@ class TranscriptPanel:
         except Exception as e:
             print(f"Error auto-saving transcript: {e}")
     
-    def update_formatting_tag_positions(self):
-        """Update formatting tag positions to reflect current text state."""
-        try:
-            # Get all tags currently in the textbox
-            for tag_name in list(self.formatting_tags.keys()):
-                try:
-                    # Get current ranges for this tag
-                    ranges = self.textbox._textbox.tag_ranges(tag_name)
-                    if ranges and len(ranges) >= 2:
-                        # Update with current start and end positions
-                        self.formatting_tags[tag_name]["start"] = str(ranges[0])
-                        self.formatting_tags[tag_name]["end"] = str(ranges[1])
-                    elif tag_name in self.formatting_tags:
-                        # Tag no longer exists, remove it
-                        del self.formatting_tags[tag_name]
-                except:
-                    # Tag might not exist anymore
-                    if tag_name in self.formatting_tags:
-                        del self.formatting_tags[tag_name]
-        except Exception as e:
-            print(f"Error updating formatting tag positions: {e}")
+    def get_formatting_sidecar(self, start=0, end=None):
+        """Formatting to save next to the text: the span store's [start, end) as a compact sidecar."""
+        if self.edit_tracker.drifted:
+            self.resync_span_store()
+        if self.compaction_job is not None:
+            app.after_cancel(self.compaction_job)
+        self.compact_formatting()
+        return span_store_to_sidecar(self.span_store, start=start, end=end)
+    
+    def get_saved_content(self):
+        """Text to save (stripped, like get_text) and its sidecar, with offsets into that text."""
+        widget_text = self.textbox._textbox.get("1.0", "end-1c")
+        text = widget_text.strip()
+        start = len(widget_text) - len(widget_text.lstrip())
+        return text, self.get_formatting_sidecar(start, start + len(text))
+    
+    def resync_span_store(self, widget_text=None):
+        """Rebuild the span store from the style tags in the widget, read in one dump pass."""
+        textbox = self.textbox._textbox
+        if widget_text is None:
+            widget_text = textbox.get("1.0", "end-1c")
+        tag_styles = {tag_name: style for style, tag_name in self.style_tags.items()}
+        dump = textbox.dump("1.0", "end-1c", tag=True)
+        self.span_store.copy_from(span_store_from_tag_dump(widget_text, dump, tag_styles))
+        self.edit_tracker.drifted = False
     
     def destroy(self):
         """Remove the panel."""
         # Cancel any pending auto-save
         if self.auto_save_timer:
             app.after_cancel(self.auto_save_timer)
+        if self.compaction_job is not None:
+            app.after_cancel(self.compaction_job)
+        if self.restore_timer is not None:
+            app.after_cancel(self.restore_timer)
+        self.restore_job += 1  # Stops a restore that is still tagging slices
+        if self.live_session:
+            self.live_session.stop()
+        # Put the text widget's own command back before Tk destroys the widget
+        self.edit_tracker.close()
         self.container.destroy()
 
 def renumber_panels():
@@ -3260,6 +3115,18 @@ progress_bar = ctk.CTkProgressBar(
 )
 progress_bar.pack(side="left")
 progress_bar.set(0)
+
+# Cancel button for background exports (only shown while one is running)
+progress_cancel_btn = ctk.CTkButton(
+    progress_frame,
+    text="Cancel",
+    width=60,
+    height=22,
+    command=cancel_background_export,
+    fg_color=BUTTON_COLOR,
+    hover_color=BUTTON_HOVER_COLOR,
+    font=(FONT_FAMILY, FONT_SIZES["small"])
+)
 # Don't pack initially - will be shown when needed
 
 # Model selector dropdown (in header, before status)
@@ -3290,6 +3157,46 @@ if not USE_CUDA:
     model_dropdown.configure(state="disabled")
     model_label.configure(text="Model: (GPU required)")
 
+# Two-pass toggle: stream a fast draft, then refine with the selected model
+def on_two_pass_toggle():
+    """Save the two-pass transcription preference."""
+    user_settings["two_pass_transcription"] = bool(two_pass_checkbox.get())
+    save_settings(user_settings)
+
+two_pass_checkbox = ctk.CTkCheckBox(
+    header_frame,
+    text=f"Fast draft ({user_settings.get('draft_model', 'tiny')})",
+    command=on_two_pass_toggle,
+    font=(FONT_FAMILY, FONT_SIZES["small"]),
+    checkbox_width=18,
+    checkbox_height=18,
+    fg_color=BUTTON_COLOR,
+    hover_color=BUTTON_HOVER_COLOR
+)
+if user_settings.get("two_pass_transcription", False):
+    two_pass_checkbox.select()
+two_pass_checkbox.pack(side="right", padx=(0, 15))
+
+# Adaptive model toggle: probe each file and use the cheapest model that is good enough
+def on_adaptive_model_toggle():
+    """Save the adaptive model selection preference."""
+    user_settings["adaptive_model"] = bool(adaptive_model_checkbox.get())
+    save_settings(user_settings)
+
+adaptive_model_checkbox = ctk.CTkCheckBox(
+    header_frame,
+    text="Auto model",
+    command=on_adaptive_model_toggle,
+    font=(FONT_FAMILY, FONT_SIZES["small"]),
+    checkbox_width=18,
+    checkbox_height=18,
+    fg_color=BUTTON_COLOR,
+    hover_color=BUTTON_HOVER_COLOR
+)
+if user_settings.get("adaptive_model", False):
+    adaptive_model_checkbox.select()
+adaptive_model_checkbox.pack(side="right", padx=(0, 10))
+
 # License status label (before status label)
 license_status_label = ctk.CTkLabel(
     header_frame,
@@ -4567,6 +4474,21 @@ update_btn = ctk.CTkButton(
 )
 update_btn.pack(side="right", padx=(10, 0))
 
+# Batch transcription button
+batch_btn = ctk.CTkButton(
+    controls_frame,
+    text="📚 Batch",
+    width=90,
+    height=32,
+    font=(FONT_FAMILY, FONT_SIZES["body"]),
+    corner_radius=6,
+    fg_color=BUTTON_COLOR,
+    hover_color=BUTTON_HOVER_COLOR,
+    text_color=BUTTON_TEXT_COLOR,
+    command=start_batch_transcription
+)
+batch_btn.pack(side="right", padx=(10, 0))
+
 # Row 2: Plus button and Panels container
 panels_row = ctk.CTkFrame(app, fg_color="transparent")
 panels_row.pack(fill="both", expand=True, padx=10, pady=10)
@@ -4599,140 +4521,107 @@ transcript_panel_2 = create_panel()
 
 # --- Functions ---
 
-def split_into_sentences(text):
+# Sentence splitting lives in mmtranscript_text; user additions to its abbreviation lists
+# come from the "sentence_abbreviations" settings entry
+set_custom_sentence_abbreviations(user_settings.get("sentence_abbreviations", {}))
+
+def join_paragraph_text(parts):
+    """Join segment texts into one paragraph with normalized spacing and closing punctuation."""
+    paragraph = " ".join(" ".join(parts).split())
+    if paragraph and paragraph[-1] not in '.!?':
+        paragraph += "."
+    return paragraph
+
+def timed_segment_record(segment, text):
+    """Plain dict of a transcription segment's timing and text, kept for subtitle exports."""
+    return {
+        "start": segment.start,
+        "end": segment.end,
+        "text": text,
+        "avg_logprob": getattr(segment, "avg_logprob", None),
+    }
+
+# Paragraph breaks while segments stream in: a pause between segments starts a new paragraph
+# when the previous one ended a sentence; a much longer pause starts one regardless.
+PARAGRAPH_MAX_SENTENCES = 4
+PARAGRAPH_PAUSE_SECONDS = 2.0
+PARAGRAPH_LONG_PAUSE_SECONDS = 5.0
+
+def group_segments_into_paragraphs(segments, language="en", max_sentences=PARAGRAPH_MAX_SENTENCES,
+                                   pause_seconds=PARAGRAPH_PAUSE_SECONDS):
     """
-    Split text into sentences using a simple, reliable character-by-character approach.
-    Returns a list of sentences.
+    Group timed transcription segments into paragraphs while they stream in.
+    A paragraph closes at a long pause or once it holds max_sentences sentences.
+    Yields dicts with 'text', 'start', 'end' and 'segments' (timed_segment_record per
+    segment) as soon as each paragraph closes; only the open paragraph is kept in memory.
     """
-    if not text:
-        return []
-    
-    try:
-        sentences = []
-        current_sentence = []
-        i = 0
-        
-        # Common abbreviations to skip
-        abbrevs = ['Mr.', 'Mrs.', 'Ms.', 'Dr.', 'Prof.', 'Sr.', 'Jr.', 'Rev.', 
-                   'Gen.', 'Col.', 'Lt.', 'Sgt.', 'Capt.', 'St.', 'Ave.', 'Rd.', 
-                   'Blvd.', 'etc.', 'i.e.', 'e.g.', 'vs.']
-        
-        while i < len(text):
-            char = text[i]
-            current_sentence.append(char)
-            
-            # Check if we hit a sentence boundary
-            if char in '.!?':
-                # Look ahead to check if this is really the end of a sentence
-                rest_of_text = text[i:]
-                
-                # Check if this is part of an abbreviation
-                is_abbrev = False
-                for abbrev in abbrevs:
-                    if rest_of_text.startswith('.' ) and i > 0:
-                        # Check previous characters for abbreviation
-                        start_pos = max(0, i - 10)
-                        context = text[start_pos:i+1]
-                        if any(abbr.rstrip('.') in context for abbr in abbrevs):
-                            is_abbrev = True
-                            break
-                
-                # Check if it's a decimal number (e.g., 3.16)
-                is_decimal = False
-                if char == '.' and i > 0 and i < len(text) - 1:
-                    if text[i-1].isdigit() and text[i+1].isdigit():
-                        is_decimal = True
-                
-                # If not an abbreviation or decimal, and followed by space or end of text
-                if not is_abbrev and not is_decimal:
-                    # Check what comes next
-                    next_chars = text[i+1:i+3] if i+1 < len(text) else ""
-                    
-                    # This is a sentence boundary if:
-                    # - We're at the end of text, OR
-                    # - Next char is whitespace (space, newline, etc.)
-                    if i == len(text) - 1 or (next_chars and next_chars[0] in ' \n\t\r'):
-                        # Save this sentence
-                        sentence = ''.join(current_sentence).strip()
-                        if len(sentence) > 3:  # Only keep sentences with substance
-                            sentences.append(sentence)
-                        current_sentence = []
-                        # Skip whitespace after sentence
-                        i += 1
-                        while i < len(text) and text[i] in ' \n\t\r':
-                            i += 1
-                        continue
-            
-            i += 1
-        
-        # Add any remaining text as a sentence
-        if current_sentence:
-            sentence = ''.join(current_sentence).strip()
-            if len(sentence) > 3:
-                sentences.append(sentence)
-        
-        # If we didn't find any sentences, return the whole text as one sentence
-        return sentences if sentences else [text.strip()]
-        
-    except Exception as e:
-        print(f"Sentence split error: {e}")
-        # Ultimate fallback: just split on period-space
-        return [s.strip() + '.' for s in text.split('. ') if s.strip()]
-
-def format_transcript(text):
+    parts = []
+    records = []
+    start = None
+    end = None
+    sentence_count = 0
+    at_sentence_end = False
+    
+    for segment in segments:
+        text = segment.text.strip() if segment.text else ""
+        if not text:
+            continue
+        
+        # Speaker paused before this segment - close the open paragraph first
+        if parts:
+            pause = segment.start - end
+            if pause >= PARAGRAPH_LONG_PAUSE_SECONDS or (pause >= pause_seconds and at_sentence_end):
+                yield {"text": join_paragraph_text(parts), "start": start, "end": end, "segments": records}
+                parts = []
+                records = []
+                sentence_count = 0
+        
+        if not parts:
+            start = segment.start
+        end = segment.end
+        parts.append(text)
+        records.append(timed_segment_record(segment, text))
+        
+        sentence_ends = list(iter_sentence_ends(text, language))
+        sentence_count += len(sentence_ends)
+        at_sentence_end = bool(sentence_ends) and sentence_ends[-1] == len(text)
+        
+        # Close the paragraph at a sentence boundary once it holds enough sentences
+        if sentence_count >= max_sentences and at_sentence_end:
+            yield {"text": join_paragraph_text(parts), "start": start, "end": end, "segments": records}
+            parts = []
+            records = []
+            sentence_count = 0
+    
+    if parts:
+        yield {"text": join_paragraph_text(parts), "start": start, "end": end, "segments": records}
+
+def align_segments_to_paragraphs(paragraphs, segments):
     """
-    Format transcript into readable paragraph blocks.
-    Splits text on sentence-ending punctuation (.!?) and groups 3-4 sentences per paragraph.
-    Returns the result joined with double newlines for clean breaks in the UI.
+    Re-group a second pass of segments into existing timed paragraphs.
+    Each segment goes to the paragraph its midpoint falls in; yields (index, text, records)
+    for a paragraph as soon as a segment past its end arrives.
     """
-    if not text or not text.strip():
-        return text
-    
-    try:
-        # Clean up the text first - normalize whitespace
-        text = ' '.join(text.split())
-        
-        # Split into sentences using sentence-ending punctuation (.!?)
-        sentences = split_into_sentences(text)
-        
-        if not sentences:
-            return text
-        
-        # Group 3-4 sentences per paragraph
-        paragraphs = []
-        chunk_size = 4  # Target 4 sentences per paragraph
-        
-        i = 0
-        while i < len(sentences):
-            remaining = len(sentences) - i
-            
-            # If 4 or fewer sentences left, put them all in one paragraph
-            if remaining <= 4:
-                chunk = sentences[i:]
-                i = len(sentences)
-            else:
-                # Take 3-4 sentences (prefer 4, but can use 3)
-                # Use 4 if we have enough, otherwise use what's left
-                chunk = sentences[i:i + chunk_size]
-                i += chunk_size
-            
-            # Join sentences into a paragraph
-            paragraph = " ".join(chunk)
-            
-            # Ensure proper ending punctuation
-            if paragraph and paragraph[-1] not in '.!?':
-                paragraph += "."
-            
-            if paragraph.strip():
-                paragraphs.append(paragraph)
-        
-        # Join paragraphs with double newlines for visual separation
-        return "\n\n".join(paragraphs)
-        
-    except Exception as e:
-        print(f"Format transcript error: {e}")
-        # Return original text if formatting fails
-        return text
+    index = 0
+    last_index = len(paragraphs) - 1
+    parts = []
+    records = []
+    
+    for segment in segments:
+        midpoint = (segment.start + segment.end) / 2
+        while index < last_index and midpoint >= paragraphs[index]["end"]:
+            yield index, join_paragraph_text(parts), records
+            parts = []
+            records = []
+            index += 1
+        if segment.text and segment.text.strip():
+            parts.append(segment.text.strip())
+            records.append(timed_segment_record(segment, segment.text.strip()))
+    
+    yield index, join_paragraph_text(parts), records
+    # Paragraphs the second pass produced nothing for keep their draft text
+    for remaining in range(index + 1, len(paragraphs)):
+        yield remaining, "", []
 
 
 # Summarize text using Hugging Face BART model
@@ -0,0 +1,242 @@
+"""Benchmark extracting formatted text segments from the editor's text widget.
+
+Run from the repository root:
+
+    python benchmarks/bench_format_extraction.py
+
+Compares the per-character tag_names() walk the exporter started with, the single
+dump() walk that replaced it, and the span store the editor reads formatting from now.
+Tk needs a display, so the first two run against StandInText, an offset-based stand-in
+for tkinter.Text with the same get/tag_names/dump behaviour. Transcripts are seeded
+paragraphs of 80 words with about one tag range per 40 words.
+"""
+import bisect
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mmtranscript_export import span_store_segments  # noqa: E402
+from mmtranscript_formatting import SpanStore  # noqa: E402
+
+SIZES = (2000, 10000, 50000)
+PER_CHARACTER_MAX_WORDS = 10000  # The old walk is quadratic; larger sizes take minutes
+TAG_STYLES = {"bold_1": {"bold": True}, "italic_2": {"italic": True}, "highlight_3": {"highlight": "#FFFF00"},
+              "font_merged_4": {"size": 14}, "underline_5": {"underline": True}}
+
+
+class StandInText:
+    """Offset-based stand-in for tkinter.Text: get, tag_names and dump."""
+
+    def __init__(self, content, tags):
+        self.content = content
+        self.tags = {name: sorted(ranges) for name, ranges in tags.items()}  # name -> [(start, end)]
+        self.line_starts = [0] + [i + 1 for i, c in enumerate(content) if c == "\n"]
+
+    def index_to_offset(self, index):
+        if index.startswith("end"):
+            return len(self.content)
+        line, column = index.split(".")
+        return self.line_starts[int(line) - 1] + int(column)
+
+    def offset_to_index(self, offset):
+        line = bisect.bisect_right(self.line_starts, offset) - 1
+        return f"{line + 1}.{offset - self.line_starts[line]}"
+
+    def get(self, first, last):
+        return self.content[self.index_to_offset(first):self.index_to_offset(last)]
+
+    def tag_names(self, index):
+        offset = self.index_to_offset(index)
+        names = []
+        for name, ranges in self.tags.items():
+            i = bisect.bisect_right(ranges, (offset, float("inf"))) - 1
+            if i >= 0 and ranges[i][0] <= offset < ranges[i][1]:
+                names.append(name)
+        return tuple(names)
+
+    def dump(self, first, last, text=False, tag=False):
+        start, end = self.index_to_offset(first), self.index_to_offset(last)
+        events = {}
+        for name, ranges in self.tags.items():
+            for range_start, range_end in ranges:
+                events.setdefault(range_start, []).append(("tagon", name))
+                events.setdefault(range_end, []).append(("tagoff", name))
+        # Tk reports text line by line, split wherever a tag starts or ends
+        cuts = sorted(set([o for o in events if start <= o < end] +
+                          [o for o in self.line_starts if start < o < end]))
+        out = []
+        position = start
+        for point in cuts + [end]:
+            if point > position:
+                out.append(("text", self.content[position:point], self.offset_to_index(position)))
+            if point < end:
+                for kind, name in sorted(events.get(point, []), key=lambda event: event[0] != "tagoff"):
+                    out.append((kind, name, self.offset_to_index(point)))
+            position = point
+        return out
+
+
+def per_character_segments(textbox_widget):
+    """Extraction before the change: tag_names() per character (verbatim copy)."""
+    segments = []
+    content = textbox_widget.get("1.0", "end-1c")  # Get all text
+    
+    if not content:
+        return segments
+    
+    # Iterate character by character through the entire content to preserve newlines
+    current_tags = None
+    current_text = ""
+    line_num = 1
+    char_idx = 0
+    
+    for i, char in enumerate(content):
+        # Calculate tkinter position (line.char format)
+        # Count newlines before this character
+        newlines_before = content[:i].count('\n')
+        line_num = newlines_before + 1
+        # Character index within current line
+        if newlines_before > 0:
+            last_newline_pos = content[:i].rfind('\n')
+            char_idx = i - last_newline_pos - 1
+        else:
+            char_idx = i
+        
+        pos = f"{line_num}.{char_idx}"
+        
+        try:
+            # Get all tags at this position
+            tags = list(textbox_widget.tag_names(pos))
+            # Filter out internal tags
+            tags = [t for t in tags if t not in ("sel", "insert", "current")]
+        except:
+            tags = []
+        
+        # Normalize tags (sort for comparison)
+        tags_key = tuple(sorted(tags))
+        
+        # Check if formatting changed (new tags or tag removed)
+        if tags_key != current_tags:
+            # Save previous segment
+            if current_text:
+                segments.append({
+                    'text': current_text,
+                    'tags': list(current_tags) if current_tags else []
+                })
+            
+            # Start new segment with current character
+            current_tags = tags_key
+            current_text = char
+        else:
+            # Same formatting - append to current segment
+            current_text += char
+    
+    # Add last segment
+    if current_text:
+        segments.append({
+            'text': current_text,
+            'tags': list(current_tags) if current_tags else []
+        })
+    
+    return segments
+
+def single_dump_segments(textbox_widget):
+    """Extraction after the change: one dump(text=True, tag=True) walk (verbatim copy)."""
+    segments = []
+    
+    try:
+        events = textbox_widget.dump("1.0", "end-1c", text=True, tag=True)
+    except Exception as e:
+        print(f"Error reading textbox contents: {e}")
+        return segments
+    
+    active_tags = set()
+    current_tags = None
+    current_parts = []
+    
+    for kind, value, _index in events:
+        if kind == "text":
+            # Normalize tags (sort for comparison)
+            tags_key = tuple(sorted(active_tags))
+            
+            # Formatting changed - save previous segment and start a new one
+            if tags_key != current_tags:
+                if current_parts:
+                    segments.append({
+                        'text': "".join(current_parts),
+                        'tags': list(current_tags)
+                    })
+                current_tags = tags_key
+                current_parts = []
+            current_parts.append(value)
+        elif value == "sel":
+            # Ignore the selection so it doesn't split segments
+            continue
+        elif kind == "tagon":
+            active_tags.add(value)
+        elif kind == "tagoff":
+            active_tags.discard(value)
+    
+    # Add last segment
+    if current_parts:
+        segments.append({
+            'text': "".join(current_parts),
+            'tags': list(current_tags)
+        })
+    
+    return segments
+
+def make_transcript(word_count, seed=2):
+    """Seeded transcript text and merged tag ranges (Tk merges overlapping ranges of a tag)."""
+    rng = random.Random(seed)
+    words = ["word" + str(i % 50) for i in range(word_count)]
+    content = "\n\n".join(" ".join(words[i:i + 80]) for i in range(0, word_count, 80))
+    tags = {}
+    for _ in range(word_count // 40):
+        start = rng.randrange(len(content) - 30)
+        tags.setdefault(rng.choice(sorted(TAG_STYLES)), []).append((start, start + rng.randrange(3, 30)))
+    for name, ranges in tags.items():
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        tags[name] = merged
+    return content, tags
+
+def span_store_for(content, tags):
+    store = SpanStore(len(content))
+    for name, ranges in tags.items():
+        for start, end in ranges:
+            store.apply(start, end, **TAG_STYLES[name])
+    return store
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+def main():
+    print(f"{'words':>6} {'per-char':>10} {'one dump':>10} {'store':>10} {'segments':>9}")
+    for word_count in SIZES:
+        content, tags = make_transcript(word_count)
+        widget = StandInText(content, tags)
+        store = span_store_for(content, tags)
+        if word_count <= PER_CHARACTER_MAX_WORDS:
+            old, old_seconds = timed(per_character_segments, widget)
+            old_text = f"{old_seconds * 1000:>8.1f}ms"
+        else:
+            old, old_text = None, f"{'skipped':>10}"
+        new, new_seconds = timed(single_dump_segments, widget)
+        current, store_seconds = timed(span_store_segments, content, store)
+        if old is not None:
+            assert old == new, "per-character and dump walks disagree"
+        assert "".join(segment["text"] for segment in current) == content
+        print(f"{word_count:>6} {old_text} {new_seconds * 1000:>8.1f}ms {store_seconds * 1000:>8.1f}ms {len(new):>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark sentence boundary detection against the character-by-character splitter it replaced.
+
+Run from the repository root:
+
+    python benchmarks/bench_sentence_split.py
+
+Transcripts are synthetic (seeded) word streams with abbreviations, decimals and words
+such as "Drive" that the old substring check mistook for abbreviations. The old splitter
+returned sentence strings (dropping those of 3 characters or fewer); iter_sentence_ends
+yields boundary offsets, so the "n" columns count sentences and boundaries respectively.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mmtranscript_text import iter_sentence_ends  # noqa: E402
+
+WORDS = "the quick brown fox jumps over lazy dog Dr. Smith said it costs 3.5 dollars e.g. apples Drive Street".split()
+SIZES = (2000, 20000, 200000)
+
+
+def legacy_split_into_sentences(text):
+    """
+    The character-by-character splitter the editor used before the regex rewrite,
+    kept verbatim as the baseline for this benchmark.
+    """
+    if not text:
+        return []
+    
+    try:
+        sentences = []
+        current_sentence = []
+        i = 0
+        
+        # Common abbreviations to skip
+        abbrevs = ['Mr.', 'Mrs.', 'Ms.', 'Dr.', 'Prof.', 'Sr.', 'Jr.', 'Rev.', 
+                   'Gen.', 'Col.', 'Lt.', 'Sgt.', 'Capt.', 'St.', 'Ave.', 'Rd.', 
+                   'Blvd.', 'etc.', 'i.e.', 'e.g.', 'vs.']
+        
+        while i < len(text):
+            char = text[i]
+            current_sentence.append(char)
+            
+            # Check if we hit a sentence boundary
+            if char in '.!?':
+                # Look ahead to check if this is really the end of a sentence
+                rest_of_text = text[i:]
+                
+                # Check if this is part of an abbreviation
+                is_abbrev = False
+                for abbrev in abbrevs:
+                    if rest_of_text.startswith('.' ) and i > 0:
+                        # Check previous characters for abbreviation
+                        start_pos = max(0, i - 10)
+                        context = text[start_pos:i+1]
+                        if any(abbr.rstrip('.') in context for abbr in abbrevs):
+                            is_abbrev = True
+                            break
+                
+                # Check if it's a decimal number (e.g., 3.16)
+                is_decimal = False
+                if char == '.' and i > 0 and i < len(text) - 1:
+                    if text[i-1].isdigit() and text[i+1].isdigit():
+                        is_decimal = True
+                
+                # If not an abbreviation or decimal, and followed by space or end of text
+                if not is_abbrev and not is_decimal:
+                    # Check what comes next
+                    next_chars = text[i+1:i+3] if i+1 < len(text) else ""
+                    
+                    # This is a sentence boundary if:
+                    # - We're at the end of text, OR
+                    # - Next char is whitespace (space, newline, etc.)
+                    if i == len(text) - 1 or (next_chars and next_chars[0] in ' \n\t\r'):
+                        # Save this sentence
+                        sentence = ''.join(current_sentence).strip()
+                        if len(sentence) > 3:  # Only keep sentences with substance
+                            sentences.append(sentence)
+                        current_sentence = []
+                        # Skip whitespace after sentence
+                        i += 1
+                        while i < len(text) and text[i] in ' \n\t\r':
+                            i += 1
+                        continue
+            
+            i += 1
+        
+        # Add any remaining text as a sentence
+        if current_sentence:
+            sentence = ''.join(current_sentence).strip()
+            if len(sentence) > 3:
+                sentences.append(sentence)
+        
+        # If we didn't find any sentences, return the whole text as one sentence
+        return sentences if sentences else [text.strip()]
+        
+    except Exception as e:
+        print(f"Sentence split error: {e}")
+        # Ultimate fallback: just split on period-space
+        return [s.strip() + '.' for s in text.split('. ') if s.strip()]
+
+
+def make_transcript(word_count, seed=1):
+    """Seeded word stream; about one word in twelve ends a sentence."""
+    rng = random.Random(seed)
+    words = []
+    for _ in range(word_count):
+        word = rng.choice(WORDS)
+        if rng.random() < 0.08:
+            word += rng.choice(".!?")
+        words.append(word)
+    return " ".join(words)
+
+def timed(function, text):
+    started = time.perf_counter()
+    result = function(text)
+    return result, time.perf_counter() - started
+
+def main():
+    print(f"{'words':>8} {'old ms':>10} {'new ms':>10} {'speedup':>8} {'old n':>7} {'new n':>7}")
+    for word_count in SIZES:
+        text = make_transcript(word_count)
+        old, old_seconds = timed(legacy_split_into_sentences, text)
+        new, new_seconds = timed(lambda text: list(iter_sentence_ends(text)), text)
+        print(f"{word_count:>8} {old_seconds * 1000:>10.1f} {new_seconds * 1000:>10.1f} "
+              f"{old_seconds / new_seconds:>7.0f}x {len(old):>7} {len(new):>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,966 @@
+"""Export backend for MMTranscriptEditor.
+
+Builds the styled document model (paragraphs of runs with resolved styles) and writes
+it through the export format registry: TXT, DOCX, PDF, JSON, JSON Lines, HTML and
+SRT/WebVTT subtitles, plus formats registered by plugins. Backends such as the PDF writer
+(mmtranscript_pdf, ReportLab) are imported on first use. Nothing here imports tkinter,
+so the same code runs in the editor, in worker processes and from the command line for
+bulk library exports:
+
+    python mmtranscript_export.py saved_transcripts exports --format docx --format pdf
+"""
+import argparse
+import html
+import importlib
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from mmtranscript_formatting import (
+    PLAIN_STYLE, STYLE_KEYS, span_store_from_sidecar, style_to_dict
+)
+
+
+class ExportCancelled(Exception):
+    """Raised from an export progress callback when the user cancels the export."""
+
+def export_to_txt(document, file_path, progress_callback=None):
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(document["text"])
+
+# --- Style Table ---
+
+def is_plain_style(style):
+    """True if a resolved run style carries no formatting."""
+    return not any(style[key] for key in STYLE_KEYS)
+
+class StyleTable:
+    """Interns resolved run styles so each distinct combination is handled once per export.
+    
+    intern() gives every distinct style a small integer ID (0 is always the plain style).
+    render() caches each format's rendering of a style (DOCX run properties, ReportLab
+    markup, CSS rule), so exporters build it once and refer to it by ID afterwards.
+    """
+    
+    def __init__(self):
+        plain = dict.fromkeys(STYLE_KEYS)
+        self.styles = [plain]  # Style ID -> style dict
+        self.ids = {tuple(plain.values()): 0}  # Style key -> style ID
+        self.by_object = {}  # id(style dict) -> style ID; runs share style dicts, which outlive the export
+        self.rendered = {}  # (renderer, style ID) -> rendering
+    
+    def intern(self, style):
+        """Return the ID of a style dict, adding it to the table if it's new."""
+        style_id = self.by_object.get(id(style))
+        if style_id is not None:
+            return style_id
+        key = tuple(style[k] or None for k in STYLE_KEYS)
+        style_id = self.ids.get(key)
+        if style_id is None:
+            style_id = len(self.styles)
+            self.styles.append(style)
+            self.ids[key] = style_id
+        self.by_object[id(style)] = style_id
+        return style_id
+    
+    def render(self, style_id, renderer):
+        """Return renderer(style) for a style ID, computing it only the first time."""
+        cache_key = (renderer, style_id)
+        if cache_key not in self.rendered:
+            self.rendered[cache_key] = renderer(self.styles[style_id])
+        return self.rendered[cache_key]
+    
+    def used_ids(self):
+        """Style IDs other than the plain style, in the order they were first seen."""
+        return range(1, len(self.styles))
+
+# --- DOCX (OOXML written directly) ---
+# A .docx is a zip of XML parts. document.xml is streamed paragraph by paragraph and every
+# distinct run style becomes one named character style in styles.xml that runs refer to by ID.
+DOCX_FLUSH_PARAGRAPHS = 500  # Paragraphs buffered before writing to the zip stream
+_DOCX_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_HEX_COLOR = re.compile(r'#?([0-9a-fA-F]{6})')
+_W_NAMESPACE = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '</Types>'
+)
+DOCX_PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+DOCX_DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+# Letter page with 1 inch margins (twentieths of a point)
+DOCX_SECTION = (
+    '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+    '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" '
+    'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>'
+)
+
+def docx_run_properties(style):
+    """WordprocessingML run properties (<w:rPr> content) for a resolved run style."""
+    parts = []
+    if style["family"]:
+        family = html.escape(style["family"])
+        parts.append(f'<w:rFonts w:ascii="{family}" w:hAnsi="{family}" w:cs="{family}"/>')
+    if style["bold"]:
+        parts.append('<w:b/>')
+    if style["italic"]:
+        parts.append('<w:i/>')
+    color = _HEX_COLOR.fullmatch(style["color"] or "")
+    if color:
+        parts.append(f'<w:color w:val="{color.group(1).upper()}"/>')
+    if style["size"]:
+        parts.append(f'<w:sz w:val="{int(style["size"]) * 2}"/>')  # Half-points
+    if style["highlight"]:
+        highlight = _HEX_COLOR.fullmatch(style["highlight"])
+        if highlight:
+            # Shading keeps the exact color; <w:highlight> only has a fixed palette
+            parts.append(f'<w:shd w:val="clear" w:color="auto" w:fill="{highlight.group(1).upper()}"/>')
+        else:
+            parts.append('<w:highlight w:val="yellow"/>')
+    if style["underline"]:
+        parts.append('<w:u w:val="single"/>')
+    return "".join(parts)
+
+def docx_text_xml(text):
+    """Escape text for <w:t>, turning tabs into <w:tab/> and dropping characters XML can't hold."""
+    text = html.escape(_DOCX_INVALID_XML_CHARS.sub("", text), quote=False)
+    return '</w:t><w:tab/><w:t xml:space="preserve">'.join(text.split("\t"))
+
+def docx_styles_xml(style_table):
+    """styles.xml with document defaults, the Normal paragraph style and one character style per run style."""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n',
+        f'<w:styles {_W_NAMESPACE}>',
+        '<w:docDefaults><w:rPrDefault><w:rPr>'
+        '<w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:eastAsia="Calibri" w:cs="Calibri"/>'
+        '<w:sz w:val="22"/><w:szCs w:val="22"/><w:lang w:val="en-US"/>'
+        '</w:rPr></w:rPrDefault>'
+        '<w:pPrDefault><w:pPr><w:spacing w:after="200" w:line="276" w:lineRule="auto"/></w:pPr></w:pPrDefault>'
+        '</w:docDefaults>',
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>',
+        '<w:style w:type="character" w:default="1" w:styleId="DefaultParagraphFont">'
+        '<w:name w:val="Default Paragraph Font"/><w:uiPriority w:val="1"/><w:semiHidden/></w:style>',
+    ]
+    for style_id in style_table.used_ids():
+        properties = style_table.render(style_id, docx_run_properties)
+        if properties:
+            parts.append(
+                f'<w:style w:type="character" w:customStyle="1" w:styleId="Run{style_id}">'
+                f'<w:name w:val="Transcript Run{style_id}"/><w:basedOn w:val="DefaultParagraphFont"/>'
+                f'<w:rPr>{properties}</w:rPr></w:style>'
+            )
+    parts.append('</w:styles>')
+    return "".join(parts)
+
+def pdf_color(value):
+    """Color for ReportLab markup and CSS; bare hex values need a leading '#'."""
+    return '#' + value if re.fullmatch(r'[0-9a-fA-F]{6}', value) else value
+
+def build_document_model(segments):
+    """Turn formatted text segments into the paragraph/run model shared by the exporters.
+    
+    Paragraphs are separated by blank lines ('\n\n'); single newlines become spaces.
+    segments is a list of {'text', 'style'} with style tuples from the span store.
+    Returns a list with one entry per paragraph: a list of {'text', 'style'} runs in order,
+    with adjacent runs of identical style merged. An empty list marks a blank paragraph
+    (extra spacing); a trailing blank paragraph is dropped.
+    Segments and paragraphs are walked together once, so the cost is linear.
+    """
+    document = []
+    full_text = "".join(segment['text'] for segment in segments)
+    paragraphs_raw = full_text.split('\n\n')
+    
+    seg_index = 0
+    seg_start = 0  # Character offset of segments[seg_index]
+    para_start = 0
+    
+    for para_idx, para_text in enumerate(paragraphs_raw):
+        para_end = para_start + len(para_text)
+        
+        # Skip segments that end before this paragraph (separators, earlier paragraphs)
+        while seg_index < len(segments) and seg_start + len(segments[seg_index]['text']) <= para_start:
+            seg_start += len(segments[seg_index]['text'])
+            seg_index += 1
+        
+        # Collect the overlapping part of each segment; a segment may continue into the next paragraph
+        runs = []
+        i = seg_index
+        pos = seg_start
+        while i < len(segments) and pos < para_end:
+            seg_text = segments[i]['text']
+            piece = seg_text[max(0, para_start - pos):para_end - pos].replace('\n', ' ')
+            if piece:
+                if runs and runs[-1]['style'] == segments[i]['style']:
+                    runs[-1]['text'] += piece
+                else:
+                    runs.append({'text': piece, 'style': segments[i]['style']})
+            pos += len(seg_text)
+            i += 1
+        
+        # Trim whitespace at the paragraph edges only, keeping spaces between runs
+        while runs and not runs[0]['text'].strip():
+            runs.pop(0)
+        while runs and not runs[-1]['text'].strip():
+            runs.pop()
+        if runs:
+            runs[0]['text'] = runs[0]['text'].lstrip()
+            runs[-1]['text'] = runs[-1]['text'].rstrip()
+            document.append(runs)
+        elif para_idx < len(paragraphs_raw) - 1:  # Don't add trailing empty para
+            document.append([])
+        
+        para_start = para_end + 2  # +2 for the '\n\n' separator
+    
+    return document
+
+def build_styled_document(text, segments, title="transcript", paragraph_times=None, timed_segments=None):
+    """Build the export document: the text plus paragraphs of runs with resolved styles.
+    
+    segments is the formatted text as [{'text', 'style'}] with span store style tuples.
+    Returns a dict with 'title', 'text' and 'paragraphs'; each paragraph is a dict with
+    'runs' (list of {'text', 'style'}; empty for a blank paragraph) and 'start'/'end'
+    in seconds when paragraph_times lines up with the text paragraphs, otherwise None.
+    'segments' holds the transcription's timed segments ({'start', 'end', 'text', ...})
+    for subtitle exports. Each distinct style becomes one shared style dict.
+    """
+    style_cache = {}
+    paragraphs = []
+    for runs in build_document_model(segments):
+        styled_runs = []
+        for run_info in runs:
+            style = style_cache.get(run_info['style'])
+            if style is None:
+                style = style_to_dict(run_info['style'])
+                style_cache[run_info['style']] = style
+            styled_runs.append({'text': run_info['text'], 'style': style})
+        paragraphs.append({'runs': styled_runs, 'start': None, 'end': None})
+    
+    # Timestamps only apply while the paragraphs still match what was transcribed
+    text_paragraphs = [paragraph for paragraph in paragraphs if paragraph['runs']]
+    if paragraph_times and len(paragraph_times) == len(text_paragraphs):
+        for paragraph, (start, end) in zip(text_paragraphs, paragraph_times):
+            paragraph['start'] = start
+            paragraph['end'] = end
+    
+    return {"title": title, "text": text, "paragraphs": paragraphs, "segments": list(timed_segments or [])}
+
+def build_plain_document(text, title="transcript"):
+    """Build an export document from plain text without formatting."""
+    return build_styled_document(text, [{'text': text, 'style': PLAIN_STYLE}], title=title)
+
+def span_store_segments(text, store):
+    """Formatted text segments ({'text', 'style'}) for text whose formatting is in a SpanStore."""
+    segments = [{'text': text[start:end], 'style': style} for start, end, style in store.runs()]
+    if store.length < len(text):
+        segments.append({'text': text[store.length:], 'style': PLAIN_STYLE})
+    return segments
+
+def get_paragraph_text(paragraph):
+    """Plain text of a document paragraph."""
+    return "".join(run['text'] for run in paragraph['runs'])
+
+def export_to_docx(document, file_path, progress_callback=None):
+    """Export a document to DOCX with formatting support.
+    
+    Writes the OOXML parts directly, streaming document.xml into the zip. Runs reference
+    shared character styles, one per distinct run style. progress_callback(done, total)
+    is called per paragraph and may raise ExportCancelled.
+    """
+    paragraphs = document["paragraphs"]
+    total = len(paragraphs)
+    style_table = StyleTable()
+    
+    with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        package.writestr("_rels/.rels", DOCX_PACKAGE_RELS)
+        package.writestr("word/_rels/document.xml.rels", DOCX_DOCUMENT_RELS)
+        
+        with package.open("word/document.xml", "w") as stream:
+            stream.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<w:document {_W_NAMESPACE}><w:body>'
+            ).encode("utf-8"))
+            
+            buffer = []
+            for index, paragraph in enumerate(paragraphs):
+                # Empty paragraph (extra spacing) when there are no runs
+                buffer.append('<w:p>')
+                for run_info in paragraph['runs']:
+                    style_id = style_table.intern(run_info['style'])
+                    if style_id and style_table.render(style_id, docx_run_properties):
+                        buffer.append(f'<w:r><w:rPr><w:rStyle w:val="Run{style_id}"/></w:rPr>')
+                    else:
+                        buffer.append('<w:r>')
+                    buffer.append(f'<w:t xml:space="preserve">{docx_text_xml(run_info["text"])}</w:t></w:r>')
+                buffer.append('</w:p>')
+                
+                if (index + 1) % DOCX_FLUSH_PARAGRAPHS == 0:
+                    stream.write("".join(buffer).encode("utf-8"))
+                    buffer = []
+                if progress_callback:
+                    progress_callback(index + 1, total)
+            
+            if total == 0:
+                buffer.append('<w:p/>')  # Word expects at least one paragraph
+            stream.write(f'{"".join(buffer)}{DOCX_SECTION}</w:body></w:document>'.encode("utf-8"))
+        
+        # Styles are known only once every run has been written
+        package.writestr("word/styles.xml", docx_styles_xml(style_table))
+
+def export_to_json(document, file_path, progress_callback=None):
+    text_paragraphs = [paragraph for paragraph in document["paragraphs"] if paragraph['runs']]
+    data = {
+        "type": document["title"],
+        "content": document["text"],
+        "paragraphs": [get_paragraph_text(paragraph) for paragraph in text_paragraphs]
+    }
+    if text_paragraphs and text_paragraphs[0]['start'] is not None:
+        data["paragraph_times"] = [
+            {"start": paragraph['start'], "end": paragraph['end']} for paragraph in text_paragraphs
+        ]
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+JSONL_PROGRESS_EVERY = 100  # Paragraphs between progress callbacks
+
+def segment_confidence(segment):
+    """Confidence of a timed segment as exp(avg_logprob), or None when unknown."""
+    avg_logprob = segment.get("avg_logprob")
+    return None if avg_logprob is None else round(math.exp(avg_logprob), 4)
+
+def paragraph_confidence(segments):
+    """Duration-weighted mean confidence of a paragraph's segments, or None when unknown."""
+    weighted = 0.0
+    total = 0.0
+    for segment in segments:
+        confidence = segment_confidence(segment)
+        if confidence is not None:
+            duration = max(segment["end"] - segment["start"], 0.01)
+            weighted += confidence * duration
+            total += duration
+    return round(weighted / total, 4) if total else None
+
+def paragraph_formatting_spans(paragraph):
+    """Formatted runs of a paragraph as {'start', 'end', <style keys that are set>} with
+    character offsets into the paragraph text; plain runs are left out."""
+    spans = []
+    offset = 0
+    for run_info in paragraph['runs']:
+        length = len(run_info['text'])
+        style = run_info['style']
+        if not is_plain_style(style):
+            span = {"start": offset, "end": offset + length}
+            span.update((key, style[key]) for key in STYLE_KEYS if style[key])
+            spans.append(span)
+        offset += length
+    return spans
+
+def export_to_jsonl(document, file_path, progress_callback=None, append=False):
+    """Export a document as JSON Lines, one record per paragraph and per timed segment.
+    
+    Every record has 'transcript' (the document title), 'type' ('paragraph' or 'segment'),
+    'index', 'text', 'start', 'end' and 'confidence'. Paragraph records add formatting
+    'spans'; segment records follow their paragraph and name it in 'paragraph'. Records
+    are written as they are built, and append=True adds them to the end of an existing file.
+    progress_callback(done, total) is called per batch of paragraphs and may raise ExportCancelled.
+    """
+    title = document["title"]
+    text_paragraphs = [paragraph for paragraph in document["paragraphs"] if paragraph['runs']]
+    segments = document.get("segments") or []
+    timed = bool(text_paragraphs) and text_paragraphs[0]['start'] is not None
+    total = len(text_paragraphs)
+    segment_index = 0
+    
+    def segment_record(segment, paragraph_index):
+        return {
+            "transcript": title, "type": "segment", "index": segment_index,
+            "paragraph": paragraph_index, "text": segment["text"],
+            "start": segment["start"], "end": segment["end"],
+            "confidence": segment_confidence(segment),
+        }
+    
+    with open(file_path, "a" if append else "w", encoding="utf-8", newline="\n") as f:
+        def write(record):
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+        
+        for index, paragraph in enumerate(text_paragraphs):
+            # Segments belong to the paragraph their midpoint falls in; the last takes the rest
+            paragraph_segments = []
+            if timed:
+                while segment_index + len(paragraph_segments) < len(segments):
+                    segment = segments[segment_index + len(paragraph_segments)]
+                    if index < total - 1 and (segment["start"] + segment["end"]) / 2 >= paragraph['end']:
+                        break
+                    paragraph_segments.append(segment)
+            
+            write({
+                "transcript": title, "type": "paragraph", "index": index,
+                "text": get_paragraph_text(paragraph),
+                "start": paragraph['start'], "end": paragraph['end'],
+                "confidence": paragraph_confidence(paragraph_segments),
+                "spans": paragraph_formatting_spans(paragraph),
+            })
+            for segment in paragraph_segments:
+                write(segment_record(segment, index))
+                segment_index += 1
+            if progress_callback and (index + 1) % JSONL_PROGRESS_EVERY == 0:
+                progress_callback(index + 1, total)
+        
+        # Segments that no longer line up with the (edited) paragraphs
+        for segment in segments[segment_index:]:
+            write(segment_record(segment, None))
+            segment_index += 1
+    if progress_callback:
+        progress_callback(total, total)
+
+def css_style_rule(style):
+    """CSS declarations for a resolved run style."""
+    declarations = []
+    if style["family"]:
+        declarations.append(f'font-family: "{style["family"].replace(chr(34), "")}"')
+    if style["size"]:
+        declarations.append(f'font-size: {style["size"]}pt')
+    if style["bold"]:
+        declarations.append('font-weight: bold')
+    if style["italic"]:
+        declarations.append('font-style: italic')
+    if style["underline"]:
+        declarations.append('text-decoration: underline')
+    if style["color"]:
+        declarations.append(f'color: {pdf_color(style["color"])}')
+    if style["highlight"]:
+        declarations.append(f'background-color: {pdf_color(style["highlight"])}')
+    return "; ".join(declarations)
+
+def export_to_html(document, file_path, progress_callback=None):
+    """Export a document to HTML; each distinct run style becomes one CSS class.
+    progress_callback(done, total) is called per paragraph and may raise ExportCancelled."""
+    paragraphs = document["paragraphs"]
+    total = len(paragraphs)
+    
+    # Intern every style first so the stylesheet can be written in <head> before the body
+    style_table = StyleTable()
+    for paragraph in paragraphs:
+        for run_info in paragraph['runs']:
+            style_table.intern(run_info['style'])
+    
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{html.escape(str(document["title"]))}</title>\n<style>\n'
+            'body { font-family: Calibri, "Segoe UI", Arial, sans-serif; font-size: 11pt; '
+            'line-height: 1.4; max-width: 50em; margin: 2em auto; }\n'
+        )
+        for style_id in style_table.used_ids():
+            rule = style_table.render(style_id, css_style_rule)
+            if rule:
+                f.write(f'.s{style_id} {{ {rule} }}\n')
+        f.write('</style>\n</head>\n<body>\n')
+        
+        for index, paragraph in enumerate(paragraphs):
+            if not paragraph['runs']:
+                # Blank paragraph (extra spacing)
+                f.write('<p>&nbsp;</p>\n')
+            else:
+                attributes = ""
+                if paragraph['start'] is not None:
+                    attributes = f' data-start="{paragraph["start"]:.2f}" data-end="{paragraph["end"]:.2f}"'
+                parts = []
+                for run_info in paragraph['runs']:
+                    text = html.escape(run_info['text'], quote=False)
+                    style_id = style_table.intern(run_info['style'])
+                    if style_id and style_table.render(style_id, css_style_rule):
+                        parts.append(f'<span class="s{style_id}">{text}</span>')
+                    else:
+                        parts.append(text)
+                f.write(f'<p{attributes}>{"".join(parts)}</p>\n')
+            if progress_callback:
+                progress_callback(index + 1, total)
+        
+        f.write('</body>\n</html>\n')
+
+# Subtitle cue limits (common broadcast guidelines)
+SUBTITLE_MAX_LINE_CHARS = 42
+SUBTITLE_MAX_LINES = 2
+SUBTITLE_MIN_CUE_SECONDS = 1.0
+SUBTITLE_MAX_CUE_SECONDS = 7.0
+SUBTITLE_PROGRESS_EVERY = 200  # Segments between progress callbacks
+
+def segments_match_text(segments, text):
+    """True if text is still what the segments said (ignoring spacing and an added final period)."""
+    transcribed = " ".join(" ".join(segment["text"] or "" for segment in segments).split())
+    text = " ".join(text.split())
+    return text == transcribed or text == transcribed + "."
+
+def document_timed_segments(document):
+    """Timed text for subtitle exports, following the user's edits.
+    
+    A timestamped paragraph contributes its transcription segments while its text still
+    matches them. A paragraph edited since transcription contributes its edited text over
+    the paragraph's time range instead, which iter_subtitle_cues splits into cues by length.
+    Segments belong to the paragraph their midpoint falls in. Without paragraph timestamps
+    (paragraphs were added or removed since transcription) there is nothing to time.
+    """
+    text_paragraphs = [
+        paragraph for paragraph in document["paragraphs"] if paragraph['runs'] and paragraph['start'] is not None
+    ]
+    segments = document.get("segments") or []
+    timed = []
+    segment_index = 0
+    for index, paragraph in enumerate(text_paragraphs):
+        first = segment_index
+        while segment_index < len(segments):
+            segment = segments[segment_index]
+            if index < len(text_paragraphs) - 1 and (segment["start"] + segment["end"]) / 2 >= paragraph['end']:
+                break
+            segment_index += 1
+        paragraph_segments = segments[first:segment_index]
+        text = get_paragraph_text(paragraph)
+        if paragraph_segments and segments_match_text(paragraph_segments, text):
+            timed.extend(paragraph_segments)
+        else:
+            timed.append({"start": paragraph['start'], "end": paragraph['end'], "text": text})
+    return timed
+
+def wrap_subtitle_lines(text, width=SUBTITLE_MAX_LINE_CHARS):
+    """Greedily wrap text into lines of at most width characters; longer words are cut."""
+    lines = []
+    line = ""
+    for word in text.split():
+        while len(word) > width:
+            if line:
+                lines.append(line)
+                line = ""
+            lines.append(word[:width])
+            word = word[width:]
+        if not word:
+            continue
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+def iter_subtitle_cues(segments, max_line_chars=SUBTITLE_MAX_LINE_CHARS, max_lines=SUBTITLE_MAX_LINES,
+                       min_seconds=SUBTITLE_MIN_CUE_SECONDS, max_seconds=SUBTITLE_MAX_CUE_SECONDS):
+    """Yield (start, end, lines) subtitle cues from timed segments in one pass.
+    
+    A segment with more text than fits in one cue is split into several, sharing its time
+    in proportion to their length. Cues last at most max_seconds and are stretched to
+    min_seconds when the next cue leaves room; only one cue is held back for that.
+    """
+    pending = None
+    for segment in segments:
+        lines = wrap_subtitle_lines(segment["text"] or "", max_line_chars)
+        if not lines:
+            continue
+        chunks = [lines[i:i + max_lines] for i in range(0, len(lines), max_lines)]
+        total_chars = sum(len(line) for line in lines)
+        duration = max(segment["end"] - segment["start"], 0.0)
+        cursor = segment["start"]
+        for chunk in chunks:
+            chunk_seconds = duration * sum(len(line) for line in chunk) / total_chars
+            start = cursor
+            end = start + min(chunk_seconds, max_seconds)
+            cursor += chunk_seconds
+            if pending:
+                pending_start, pending_end, pending_lines = pending
+                # Stretch short cues up to the next one, never overlapping it
+                pending_end = min(max(pending_end, pending_start + min_seconds), max(start, pending_end))
+                yield pending_start, pending_end, pending_lines
+            pending = (start, end, chunk)
+    if pending:
+        start, end, lines = pending
+        yield start, max(end, start + min_seconds), lines
+
+def format_subtitle_timestamp(seconds, decimal_separator):
+    """HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (WebVTT) timestamp."""
+    milliseconds = int(round(max(seconds, 0.0) * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{decimal_separator}{milliseconds:03d}"
+
+def write_subtitle_cues(document, file_path, progress_callback=None, webvtt=False):
+    """Stream a document's timed segments to an SRT or WebVTT file, one cue at a time."""
+    segments = document_timed_segments(document)
+    if not segments:
+        raise ValueError("This transcript has no timestamps. Subtitles can only be exported from a "
+                         "transcript transcribed in this session whose paragraphs have not been "
+                         "added, removed or merged since.")
+    total = len(segments)
+    separator = "." if webvtt else ","
+    
+    def counted(items):
+        # Report progress as the cue iterator consumes segments
+        for index, item in enumerate(items):
+            if progress_callback and index % SUBTITLE_PROGRESS_EVERY == 0:
+                progress_callback(index, total)
+            yield item
+    
+    with open(file_path, "w", encoding="utf-8") as f:
+        if webvtt:
+            f.write("WEBVTT\n\n")
+        for number, (start, end, lines) in enumerate(iter_subtitle_cues(counted(segments)), 1):
+            timing = f"{format_subtitle_timestamp(start, separator)} --> {format_subtitle_timestamp(end, separator)}"
+            if webvtt:
+                text = "\n".join(html.escape(line, quote=False) for line in lines)
+                f.write(f"{timing}\n{text}\n\n")
+            else:
+                text = "\n".join(lines)
+                f.write(f"{number}\n{timing}\n{text}\n\n")
+    if progress_callback:
+        progress_callback(total, total)
+
+def export_to_srt(document, file_path, progress_callback=None):
+    write_subtitle_cues(document, file_path, progress_callback)
+
+def export_to_vtt(document, file_path, progress_callback=None):
+    write_subtitle_cues(document, file_path, progress_callback, webvtt=True)
+
+def export_to_pdf(document, file_path, progress_callback=None):
+    """Export a document to PDF with mmtranscript_pdf, returning the page count.
+    
+    The backend is imported on first use so ReportLab stays out of sessions that never
+    write a PDF. It is a plain import statement rather than an importlib call so that
+    PyInstaller sees mmtranscript_pdf (and through it ReportLab) and bundles them.
+    """
+    try:
+        from mmtranscript_pdf import export_to_pdf as export_pdf_document
+    except ImportError as e:
+        raise RuntimeError(f"PDF Document export is unavailable: {e}") from e
+    return export_pdf_document(document, file_path, progress_callback)
+
+# --- Export Format Registry ---
+# Extension -> {'label', 'exporter', 'timed'}. An exporter is a callable
+# exporter(document, file_path, progress_callback) or a "module:function" string that is
+# imported the first time that format is written (used for plugin formats; frozen builds
+# only bundle such modules if they are listed as hidden imports). 'timed' formats need
+# transcription timestamps.
+EXPORT_FORMATS = {}
+EXPORT_FORMAT_ENTRY_POINT_GROUP = "mmtranscript.export_formats"
+_export_plugins_loaded = False
+
+def register_export_format(extension, label, exporter, timed=False):
+    """Register (or replace) the exporter for a file extension.
+    
+    Formats registered at runtime only exist in this process; to reach bulk export
+    workers too, a package can instead declare an entry point in the
+    "mmtranscript.export_formats" group named after the extension, e.g.
+    odt = "mypackage.odt_export:export_to_odt".
+    """
+    extension = extension.lower()
+    if not extension.startswith("."):
+        extension = "." + extension
+    EXPORT_FORMATS[extension] = {"label": label, "exporter": exporter, "timed": timed}
+
+def load_export_format_plugins():
+    """Register formats declared by installed packages (once per process, without importing them)."""
+    global _export_plugins_loaded
+    if _export_plugins_loaded:
+        return
+    _export_plugins_loaded = True
+    try:
+        from importlib.metadata import entry_points
+        discovered = entry_points()
+        if hasattr(discovered, "select"):
+            discovered = discovered.select(group=EXPORT_FORMAT_ENTRY_POINT_GROUP)
+        else:
+            # Python < 3.10 returns a dict of groups
+            discovered = discovered.get(EXPORT_FORMAT_ENTRY_POINT_GROUP, [])
+        for entry_point in discovered:
+            extension = entry_point.name.lower().lstrip(".")
+            if "." + extension not in EXPORT_FORMATS:
+                register_export_format(extension, f"{extension.upper()} File", entry_point.value)
+    except Exception as e:
+        print(f"Error loading export format plugins: {e}")
+
+def get_export_formats():
+    """The export format registry, including formats from installed plugins."""
+    load_export_format_plugins()
+    return EXPORT_FORMATS
+
+def export_filetypes(include_timed=True):
+    """(label, pattern) pairs for file dialogs, in registration order."""
+    return [
+        (export_format["label"], "*" + extension)
+        for extension, export_format in get_export_formats().items()
+        if include_timed or not export_format["timed"]
+    ]
+
+def get_exporter(extension):
+    """Exporter callable for an extension, importing its backend on first use."""
+    export_format = get_export_formats().get(extension.lower())
+    if export_format is None:
+        raise ValueError(f"Unsupported export format: {extension}")
+    exporter = export_format["exporter"]
+    if isinstance(exporter, str):
+        module_name, _, function_name = exporter.partition(":")
+        try:
+            exporter = getattr(importlib.import_module(module_name), function_name)
+        except ImportError as e:
+            raise RuntimeError(f"{export_format['label']} export is unavailable: {e}") from e
+        export_format["exporter"] = exporter
+    return exporter
+
+register_export_format(".txt", "Text File", export_to_txt)
+register_export_format(".docx", "Word Document", export_to_docx)
+register_export_format(".pdf", "PDF Document", export_to_pdf)
+register_export_format(".json", "JSON File", export_to_json)
+register_export_format(".jsonl", "JSON Lines", export_to_jsonl)
+register_export_format(".html", "HTML Document", export_to_html)
+register_export_format(".srt", "SubRip Subtitles", export_to_srt, timed=True)
+register_export_format(".vtt", "WebVTT Subtitles", export_to_vtt, timed=True)
+
+def _current_umask():
+    # os.umask can only be read by setting it, so read it once, before any export threads start
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+NEW_FILE_MODE = 0o666 & ~_current_umask()
+
+def export_file_mode(file_path):
+    """Permission bits an export to file_path should get: the existing file's, or the umask default."""
+    try:
+        return os.stat(file_path).st_mode & 0o7777
+    except OSError:
+        return NEW_FILE_MODE
+
+def write_export_atomically(document, file_path, progress_callback=None):
+    """Export document to file_path via a temporary file so a failed or cancelled export leaves no partial file.
+    
+    Returns:
+        tuple: (pages written or None for formats without pages, seconds the exporter took)
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if not extension:
+        raise ValueError(f"Unsupported export format: {file_path}")
+    exporter = get_exporter(extension)
+    
+    fd, temp_path = tempfile.mkstemp(
+        prefix=".export-", suffix=extension, dir=os.path.dirname(os.path.abspath(file_path))
+    )
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        pages = exporter(document, temp_path, progress_callback)
+        seconds = time.perf_counter() - started
+        # mkstemp creates the file as 0600; give it the mode a plain open() would have
+        os.chmod(temp_path, export_file_mode(file_path))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return (pages if isinstance(pages, int) else None), seconds
+
+def format_page_rate(pages, seconds):
+    """Human-readable page throughput, e.g. "12 pages in 0.8s (15.0 pages/s)"."""
+    return f"{pages} pages in {seconds:.1f}s ({pages / seconds if seconds else 0.0:.1f} pages/s)"
+
+def append_jsonl_export(document, file_path, progress_callback=None):
+    """Append a document's JSON Lines records to file_path (created if missing).
+    
+    A failed or cancelled append truncates the file back to its previous length.
+    """
+    existed = os.path.exists(file_path)
+    size = os.path.getsize(file_path) if existed else 0
+    try:
+        if size:
+            with open(file_path, "rb+") as f:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    # Earlier writer left the last record unterminated
+                    f.write(b"\n")
+        export_to_jsonl(document, file_path, progress_callback, append=True)
+    except BaseException:
+        try:
+            if existed:
+                with open(file_path, "rb+") as f:
+                    f.truncate(size)
+            else:
+                os.remove(file_path)
+        except OSError:
+            pass
+        raise
+
+
+# --- Saved Transcripts Without a Widget ---
+# mmtranscript_formatting reads formatting sidecars (compact or older tag-entry files)
+# into the same span store the editor uses.
+FORMATTING_SIDECAR_SUFFIX = ".formatting.json"
+
+def load_saved_document(text_path):
+    """Read a saved transcript and its formatting sidecar into a document model."""
+    with open(text_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    
+    formatting_tags = None
+    sidecar_path = text_path[:-len(".txt")] + FORMATTING_SIDECAR_SUFFIX
+    if os.path.exists(sidecar_path):
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            formatting_tags = json.load(f)
+    
+    title = os.path.splitext(os.path.basename(text_path))[0]
+    # Sidecar offsets refer to the text exactly as saved (the editor strips it before saving
+    # and writes the sidecar for the stripped text), so it is not stripped again here
+    store = span_store_from_sidecar(text, formatting_tags)
+    return build_styled_document(text, span_store_segments(text, store), title)
+
+def export_saved_transcript(text_path, output_paths):
+    """Export one saved transcript to every path in output_paths (runs in a worker process).
+    
+    Returns:
+        tuple: (text_path, number of files written, error message or None,
+                pages written, seconds spent writing them)
+    """
+    pages = 0
+    page_seconds = 0.0
+    try:
+        document = load_saved_document(text_path)
+        for output_path in output_paths:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            written_pages, seconds = write_export_atomically(document, output_path)
+            if written_pages is not None:
+                pages += written_pages
+                page_seconds += seconds
+        return text_path, len(output_paths), None, pages, page_seconds
+    except Exception as e:
+        return text_path, 0, str(e), pages, page_seconds
+
+def iter_library_transcripts(source_dir, output_dir):
+    """Yield the saved transcript (.txt) paths under source_dir.
+    
+    An output_dir inside source_dir is pruned from the walk, so earlier exports
+    (.txt ones in particular) are never taken for transcripts.
+    """
+    output_real = os.path.realpath(output_dir)
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = [name for name in sorted(dirs) if os.path.realpath(os.path.join(root, name)) != output_real]
+        for name in sorted(files):
+            if name.endswith(".txt"):
+                yield os.path.join(root, name)
+
+def plan_library_export(source_dir, output_dir, formats):
+    """List (text_path, output_paths) jobs for the library, skipping outputs newer than their sources.
+    
+    Outputs mirror the folder layout under source_dir.
+    """
+    jobs = []
+    for text_path in iter_library_transcripts(source_dir, output_dir):
+        source_mtime = os.path.getmtime(text_path)
+        sidecar_path = text_path[:-len(".txt")] + FORMATTING_SIDECAR_SUFFIX
+        if os.path.exists(sidecar_path):
+            source_mtime = max(source_mtime, os.path.getmtime(sidecar_path))
+        
+        base = os.path.join(output_dir, os.path.relpath(text_path, source_dir))[:-len(".txt")]
+        output_paths = []
+        for extension in formats:
+            output_path = base + extension
+            if not os.path.exists(output_path) or os.path.getmtime(output_path) < source_mtime:
+                output_paths.append(output_path)
+        if output_paths:
+            jobs.append((text_path, output_paths))
+    return jobs
+
+def export_library(source_dir, output_dir, formats=(".docx", ".pdf"), workers=None, progress_callback=None):
+    """Export every saved transcript under source_dir to output_dir across a process pool.
+    
+    progress_callback(done, total, text_path, error) is called as each transcript finishes.
+    Returns a dict with 'exported', 'files', 'skipped', 'errors' (list of (path, message)), 'seconds',
+    and 'pages'/'page_seconds': pages written by paged formats (PDF) and the worker time they took.
+    """
+    started = time.perf_counter()
+    formats = [fmt if fmt.startswith(".") else "." + fmt for fmt in formats]
+    for extension in formats:
+        if extension not in get_export_formats():
+            raise ValueError(f"Unsupported export format: {extension}")
+    
+    all_sources = sum(1 for _text_path in iter_library_transcripts(source_dir, output_dir))
+    jobs = plan_library_export(source_dir, output_dir, formats)
+    summary = {"exported": 0, "files": 0, "skipped": all_sources - len(jobs), "errors": [], "seconds": 0.0,
+               "pages": 0, "page_seconds": 0.0}
+    
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(export_saved_transcript, text_path, output_paths)
+                       for text_path, output_paths in jobs]
+            for done, future in enumerate(as_completed(futures), start=1):
+                text_path, written, error, pages, page_seconds = future.result()
+                summary["pages"] += pages
+                summary["page_seconds"] += page_seconds
+                if error:
+                    summary["errors"].append((text_path, error))
+                else:
+                    summary["exported"] += 1
+                    summary["files"] += written
+                if progress_callback:
+                    progress_callback(done, len(jobs), text_path, error)
+    
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+def main(argv=None):
+    # Saved transcripts have no timestamps, so subtitle formats are not offered
+    library_formats = [pattern[2:] for _label, pattern in export_filetypes(include_timed=False)]
+    parser = argparse.ArgumentParser(
+        description="Export saved transcripts (.txt + .formatting.json) to DOCX/PDF/TXT/JSON and more in parallel."
+    )
+    parser.add_argument("source", help="Folder with saved transcripts (searched recursively)")
+    parser.add_argument("output", help="Folder to write exports to (mirrors the source layout)")
+    parser.add_argument("--format", dest="formats", action="append", choices=library_formats,
+                        help="Output format; repeat for several (default: docx and pdf)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    
+    def report(done, total, text_path, error):
+        status = f"failed: {error}" if error else "ok"
+        print(f"[{done}/{total}] {os.path.basename(text_path)} {status}")
+    
+    summary = export_library(args.source, args.output, args.formats or ["docx", "pdf"], args.workers, report)
+    rate = summary["exported"] / summary["seconds"] if summary["seconds"] else 0.0
+    print(f"Exported {summary['exported']} transcripts ({summary['files']} files), "
+          f"skipped {summary['skipped']} up to date, {len(summary['errors'])} failed "
+          f"in {summary['seconds']:.1f}s ({rate:.1f} transcripts/s)")
+    if summary["pages"]:
+        # Measured in worker time, so this is the rate of one process rather than of the pool
+        page_rate = summary["pages"] / summary["page_seconds"] if summary["page_seconds"] else 0.0
+        print(f"Wrote {summary['pages']} PDF pages at {page_rate:.1f} pages/s per worker")
+    return 1 if summary["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
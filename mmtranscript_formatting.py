@@ -0,0 +1,552 @@
+"""Formatting span store for MMTranscriptEditor.
+
+A transcript's character formatting is kept as a sorted list of runs keyed by character
+offset, each run carrying one style tuple. The store is the source of truth behind the
+editor's bold/italic/underline/color/highlight commands, the saved formatting sidecar and
+the exports. TextEditTracker keeps it in step with a Tk text widget as text is typed,
+pasted, deleted or undone. Nothing here imports tkinter.
+"""
+import base64
+import re
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from operator import ne
+
+# Style tuples hold these properties in this order; unset values are None/False
+STYLE_KEYS = ("family", "size", "bold", "italic", "underline", "color", "highlight")
+PLAIN_STYLE = (None, None, False, False, False, None, None)
+_STYLE_FIELD_INDEX = {key: index for index, key in enumerate(STYLE_KEYS)}
+MIXED = object()  # Stands in for a property that varies across a range (see SpanStore.range_style)
+RANGE_SCAN_RUNS = 64  # range_value compares up to this many runs directly instead of using change counts
+
+def make_style(**properties):
+    """Style tuple from keyword properties (family, size, bold, ...); the rest stay unset."""
+    return update_style(PLAIN_STYLE, **properties)
+
+def update_style(style, **changes):
+    """Copy of a style tuple with some properties replaced."""
+    values = list(style)
+    for key, value in changes.items():
+        values[_STYLE_FIELD_INDEX[key]] = value
+    return tuple(values)
+
+def style_to_dict(style):
+    """Style tuple as the {family, size, bold, italic, underline, color, highlight} dict exporters use."""
+    return dict(zip(STYLE_KEYS, style))
+
+
+class SpanStore:
+    """Character formatting as a sorted list of runs covering the text [0, length).
+
+    starts[i] is the offset where run i begins and styles[i] its style tuple; run i ends
+    where run i+1 starts (or at length). Looking up the style at an offset and finding
+    the run to split are binary searches. Text edits shift the boundaries after the edit,
+    which is linear in the number of runs, not in the length of the text.
+    """
+
+    def __init__(self, length=0):
+        self.reset(length)
+
+    def reset(self, length=0):
+        """Forget all formatting; the text is length plain characters."""
+        self.length = length
+        self.starts = [0] if length else []
+        self.styles = [PLAIN_STYLE] if length else []
+        self.change_counts = {}  # Style field -> value changes up to each run (see range_value)
+
+    def copy_from(self, other):
+        """Take over another store's runs (the object itself stays, so trackers keep working)."""
+        self.length = other.length
+        self.starts = list(other.starts)
+        self.styles = list(other.styles)
+        self.change_counts = {}
+
+    def __len__(self):
+        return len(self.starts)
+
+    def run_index(self, offset):
+        """Index of the run containing offset (offset must be inside the text)."""
+        return bisect_right(self.starts, offset) - 1
+
+    def style_at(self, offset):
+        """Style of the character at offset (plain outside the text)."""
+        if offset < 0 or offset >= self.length:
+            return PLAIN_STYLE
+        return self.styles[self.run_index(offset)]
+
+    def range_value(self, start, end, key):
+        """Value of one style property across [start, end), or MIXED if it varies inside it.
+
+        Two binary searches find the first and last runs. Up to RANGE_SCAN_RUNS runs apart
+        their values are compared directly. Further apart, a per-property prefix count of
+        value changes between neighbouring runs tells whether the property changes between
+        them in O(1); edits discard the counts, so the first such query after an edit
+        rebuilds them in O(runs) and later ones cost O(log runs). An empty range gives the
+        value at start.
+        """
+        field = _STYLE_FIELD_INDEX[key]
+        start = max(start, 0)
+        end = min(end, self.length)
+        if start >= end:
+            return self.style_at(start)[field]
+        first = self.run_index(start)
+        last = self.run_index(end - 1)
+        if first != last and last - first <= RANGE_SCAN_RUNS:
+            value = self.styles[first][field]
+            for index in range(first + 1, last + 1):
+                if self.styles[index][field] != value:
+                    return MIXED
+        elif first != last:
+            counts = self.change_counts.get(field)
+            if counts is None:
+                values = [style[field] for style in self.styles]
+                counts = self.change_counts[field] = list(accumulate(map(ne, values[1:], values[:-1]), initial=0))
+            if counts[last] != counts[first]:
+                return MIXED
+        return self.styles[first][field]
+
+    def range_style(self, start, end):
+        """Style of [start, end), with MIXED for each property that varies inside it."""
+        return tuple(self.range_value(start, end, key) for key in STYLE_KEYS)
+
+    def split(self, offset):
+        """Make offset a run boundary and return the index of the run starting there."""
+        if offset <= 0:
+            return 0
+        if offset >= self.length:
+            return len(self.starts)
+        index = self.run_index(offset)
+        if self.starts[index] == offset:
+            return index
+        self.starts.insert(index + 1, offset)
+        self.styles.insert(index + 1, self.styles[index])
+        self.change_counts = {}
+        return index + 1
+
+    def apply(self, start, end, **changes):
+        """Set style properties (bold=True, highlight="#FFFF00", ...) on [start, end)."""
+        start = max(start, 0)
+        end = min(end, self.length)
+        if start >= end:
+            return
+        first = self.split(start)
+        last = self.split(end)
+        styles = self.styles
+        for index in range(first, last):
+            styles[index] = update_style(styles[index], **changes)
+        self.change_counts = {}
+
+    def insert(self, offset, length, style=None):
+        """Account for length characters inserted at offset.
+
+        Without an explicit style the new text takes the style of the characters on both
+        sides if they share one and is plain otherwise. That is Tk's rule for tags on
+        inserted text, and with one tag per style it keeps the store and widget in step.
+        """
+        if length <= 0:
+            return
+        offset = max(0, min(offset, self.length))
+        if style is None:
+            before = self.style_at(offset - 1)
+            style = before if before == self.style_at(offset) else PLAIN_STYLE
+        index = self.split(offset)
+        starts = self.starts
+        starts[index:] = [start + length for start in starts[index:]]
+        starts.insert(index, offset)
+        self.styles.insert(index, style)
+        self.change_counts = {}
+        self.length += length
+
+    def delete(self, start, end):
+        """Account for the characters in [start, end) being deleted."""
+        start = max(start, 0)
+        end = min(end, self.length)
+        if start >= end:
+            return
+        first = self.split(start)
+        last = self.split(end)
+        del self.starts[first:last]
+        del self.styles[first:last]
+        removed = end - start
+        starts = self.starts
+        starts[first:] = [position - removed for position in starts[first:]]
+        self.change_counts = {}
+        self.length -= removed
+
+    def coalesce(self):
+        """Merge neighbouring runs that have the same style; returns how many runs went away.
+
+        apply() and the edit methods only ever split runs, so formatting the same text on
+        and off, or highlighting adjacent selections, leaves runs that could be one.
+        """
+        starts, styles = self.starts, self.styles
+        kept_starts = starts[:1]
+        kept_styles = styles[:1]
+        for index in range(1, len(starts)):
+            if styles[index] != kept_styles[-1]:
+                kept_starts.append(starts[index])
+                kept_styles.append(styles[index])
+        removed = len(starts) - len(kept_starts)
+        if removed:
+            self.starts, self.styles = kept_starts, kept_styles
+            self.change_counts = {}
+        return removed
+
+    def styles_in_use(self):
+        """Set of the distinct styles the text currently uses (including plain)."""
+        return set(self.styles)
+
+    def runs(self, start=0, end=None):
+        """Yield (start, end, style) for the runs overlapping [start, end), clipped to it."""
+        end = self.length if end is None else min(end, self.length)
+        start = max(start, 0)
+        if start >= end:
+            return
+        index = self.run_index(start)
+        while index < len(self.starts) and self.starts[index] < end:
+            run_end = self.starts[index + 1] if index + 1 < len(self.starts) else self.length
+            yield max(self.starts[index], start), min(run_end, end), self.styles[index]
+            index += 1
+
+    def formatted_runs(self):
+        """Yield (start, end, style) for every run that carries formatting."""
+        for run in self.runs():
+            if run[2] != PLAIN_STYLE:
+                yield run
+
+    def has_formatting(self, start, end):
+        """True if any character in [start, end) is formatted."""
+        return any(style != PLAIN_STYLE for _start, _end, style in self.runs(start, end))
+
+
+# --- Saved formatting sidecars ---
+# Current sidecars (version 2) are compact: a table of distinct styles and the formatted
+# runs as flat [gap, length, style number, ...] triples of character offsets, where gap
+# counts the plain characters since the previous run. Large run lists are stored as
+# zlib-compressed little-endian 32-bit integers in base64 instead of a JSON list.
+#
+# Older sidecars are dicts of tag name -> {"type", "ranges", ...}, with Tk "line.column"
+# positions into the saved text (or character offsets). "ranges" lists every [start, end]
+# the entry covers; files written before ranges existed only have "start"/"end". Entries
+# are applied in order, so later entries win where they overlap, like Tk tag priority.
+# They still load, and are rewritten in the current format the next time they are saved.
+SIDECAR_VERSION = 2
+SIDECAR_BINARY_MIN_RUNS = 512  # Below this many runs the plain JSON list is smaller to read
+def text_line_starts(text):
+    """Offset of the first character of each line."""
+    return [0] + [match.end() for match in re.finditer("\n", text)]
+
+def text_index_to_offset(index, line_starts, text_length):
+    """Convert a Tk "line.column" index or a character offset into an offset, clamped like Tk does."""
+    if isinstance(index, int):
+        return max(0, min(index, text_length))
+    line_text, _, column_text = str(index).partition(".")
+    line = int(line_text)
+    if line < 1:
+        return 0
+    if line > len(line_starts):
+        return text_length
+    line_start = line_starts[line - 1]
+    line_end = line_starts[line] - 1 if line < len(line_starts) else text_length
+    return min(line_start + int(column_text or 0), line_end)
+
+def offset_to_text_index(offset, line_starts):
+    """Tk "line.column" index of a character offset (cheaper for Tk to parse than "1.0 + N chars")."""
+    line = bisect_right(line_starts, offset) - 1
+    return f"{line + 1}.{offset - line_starts[line]}"
+
+def sidecar_entry_changes(tag_info):
+    """Style properties a sidecar entry sets, as update_style keyword arguments."""
+    tag_type = tag_info.get("type")
+    changes = {}
+    if tag_type == "font_merged":
+        if tag_info.get("family"):
+            changes["family"] = str(tag_info["family"])
+        if tag_info.get("size"):
+            try:
+                changes["size"] = int(tag_info["size"])
+            except (TypeError, ValueError):
+                pass
+        changes["bold"] = bool(tag_info.get("bold"))
+        changes["italic"] = bool(tag_info.get("italic"))
+    elif tag_type == "font" and tag_info.get("family"):
+        changes["family"] = str(tag_info["family"])
+    elif tag_type == "fontsize" and tag_info.get("size"):
+        try:
+            changes["size"] = int(tag_info["size"])
+        except (TypeError, ValueError):
+            pass
+    elif tag_type == "bold":
+        changes["bold"] = True
+    elif tag_type == "italic":
+        changes["italic"] = True
+    elif tag_type == "underline":
+        changes["underline"] = True
+    elif tag_type == "fontcolor" and tag_info.get("color"):
+        changes["color"] = tag_info["color"]
+    elif tag_type == "highlight" and tag_info.get("color"):
+        changes["highlight"] = tag_info["color"]
+    return changes
+
+def sidecar_entry_ranges(tag_info, line_starts, text_length):
+    """Every (start, end) offset range a sidecar entry covers, with empty ranges dropped."""
+    ranges = tag_info.get("ranges")
+    if ranges is None:
+        ranges = [(tag_info.get("start"), tag_info.get("end"))]
+    offsets = []
+    for start, end in ranges:
+        start = text_index_to_offset(start, line_starts, text_length)
+        end = text_index_to_offset(end, line_starts, text_length)
+        if start < end:
+            offsets.append((start, end))
+    return offsets
+
+def is_compact_sidecar(sidecar):
+    """True for sidecars written in the versioned compact format."""
+    return isinstance(sidecar, dict) and isinstance(sidecar.get("version"), int)
+
+def span_store_from_sidecar(text, sidecar):
+    """Build a SpanStore for text from a saved formatting sidecar in either format."""
+    if is_compact_sidecar(sidecar):
+        return span_store_from_compact_sidecar(text, sidecar)
+    return span_store_from_tag_entries(text, sidecar)
+
+def span_store_from_tag_entries(text, formatting_tags):
+    """Build a SpanStore for text from an older tag-entry sidecar dict."""
+    store = SpanStore(len(text))
+    line_starts = text_line_starts(text)
+    for tag_name, tag_info in (formatting_tags or {}).items():
+        try:
+            ranges = sidecar_entry_ranges(tag_info, line_starts, len(text))
+            changes = sidecar_entry_changes(tag_info)
+        except (AttributeError, TypeError, ValueError) as e:
+            print(f"Skipping unreadable formatting entry {tag_name}: {e}")
+            continue
+        if changes:
+            for start, end in ranges:
+                store.apply(start, end, **changes)
+    return store
+
+def span_store_from_compact_sidecar(text, sidecar):
+    """Build a SpanStore for text from a version 2 sidecar."""
+    store = SpanStore(len(text))
+    if sidecar["version"] > SIDECAR_VERSION:
+        print(f"Formatting was saved by a newer version (format {sidecar['version']}); reading what is understood")
+    if sidecar.get("length", len(text)) != len(text):
+        # The text was changed outside the editor after the formatting was saved
+        print(f"Formatting was saved for {sidecar['length']} characters but the text has {len(text)}; "
+              "some formatting may be misplaced")
+    styles = [tuple(style) for style in sidecar.get("styles", [])]
+    runs = sidecar.get("runs", [])
+    if isinstance(runs, str):
+        values = array("I")
+        values.frombytes(zlib.decompress(base64.b64decode(runs)))
+        if sys.byteorder == "big":
+            values.byteswap()
+        runs = values
+    # Runs are saved in order and never overlap, so the run lists are built directly
+    text_length = len(text)
+    starts, run_styles = [], []
+    position = 0  # End of the previous saved run
+    covered = 0  # End of the text covered by starts so far
+    for index in range(0, len(runs) - 2, 3):
+        start = max(position + runs[index], covered)
+        position = start + runs[index + 1]
+        end = min(position, text_length)
+        try:
+            style = styles[runs[index + 2]]
+        except IndexError:
+            print(f"Skipping formatting run with unknown style {runs[index + 2]}")
+            continue
+        if start >= end or len(style) != len(STYLE_KEYS):
+            continue
+        if start > covered:
+            starts.append(covered)
+            run_styles.append(PLAIN_STYLE)
+        starts.append(start)
+        run_styles.append(style)
+        covered = end
+    if covered < text_length:
+        starts.append(covered)
+        run_styles.append(PLAIN_STYLE)
+    store.starts, store.styles = starts, run_styles
+    store.change_counts = {}
+    return store
+
+def span_store_to_sidecar(store, binary=None, start=0, end=None):
+    """Version 2 sidecar dict for a SpanStore, or for its [start, end) part.
+
+    Offsets in the sidecar are relative to start, so a saved text that is a slice of the
+    store's text gets a sidecar matching it. binary forces (True) or avoids (False) the
+    compressed run encoding; by default it is used once there are SIDECAR_BINARY_MIN_RUNS
+    formatted runs.
+    """
+    end = store.length if end is None else min(end, store.length)
+    style_numbers = {}
+    runs = []
+    position = start
+    for run_start, run_end, style in store.runs(start, end):
+        if style == PLAIN_STYLE:
+            continue
+        number = style_numbers.setdefault(style, len(style_numbers))
+        runs += (run_start - position, run_end - run_start, number)
+        position = run_end
+    sidecar = {"version": SIDECAR_VERSION, "length": max(end - start, 0),
+               "styles": [list(style) for style in style_numbers], "runs": runs}
+    if binary or (binary is None and len(runs) >= 3 * SIDECAR_BINARY_MIN_RUNS):
+        values = array("I", runs)
+        if sys.byteorder == "big":
+            values.byteswap()
+        sidecar["runs"] = base64.b64encode(zlib.compress(values.tobytes())).decode("ascii")
+    return sidecar
+
+def span_store_from_tag_dump(text, dump, tag_styles):
+    """Rebuild a SpanStore from the widget itself in one pass.
+
+    dump is the result of the text widget's `dump -tag` over the whole text: (key, tag,
+    index) triples in text order. tag_styles maps the style tags to their style tuples;
+    other tags (selection, search, ...) are ignored.
+    """
+    store = SpanStore(len(text))
+    line_starts = text_line_starts(text)
+    open_tags = {}
+    for key, tag_name, index in dump:
+        if tag_name not in tag_styles:
+            continue
+        offset = text_index_to_offset(index, line_starts, len(text))
+        if key == "tagon":
+            open_tags[tag_name] = offset
+        elif key == "tagoff" and tag_name in open_tags:
+            start = open_tags.pop(tag_name)
+            if start < offset:
+                store.apply(start, offset, **style_to_dict(tag_styles[tag_name]))
+    for tag_name, start in open_tags.items():
+        store.apply(start, len(text), **style_to_dict(tag_styles[tag_name]))
+    return store
+
+
+# --- Tracking edits in a Tk text widget ---
+_TRACKER_PROXY = """
+proc {widget} args {{
+    switch -exact -- [lindex $args 0] {{
+        insert - delete - replace {{
+            {before} {{*}}$args
+            set result [{original} {{*}}$args]
+            {after}
+            return $result
+        }}
+    }}
+    return [{original} {{*}}$args]
+}}
+"""
+
+class TextEditTracker:
+    """Keeps a SpanStore in step with a Tk text widget's insert/delete/replace commands.
+
+    The widget's Tcl command is renamed and replaced by a small Tcl proc, so every edit
+    passes through it: key bindings, paste, undo/redo and calls from Python alike. Only
+    edits call back into Python; every other widget command is forwarded in Tcl, and
+    errors from the widget propagate to the caller unchanged.
+    """
+
+    def __init__(self, widget, store):
+        self.store = store
+        self.tk = widget.tk
+        self.widget_name = str(widget)
+        self.original = self.widget_name + "_tracked"
+        self.pending = None
+        self.drifted = False  # Set if the store ever had to be resized to match the widget
+        self.edit_count = 0  # Number of edits seen, so callers can tell whether the text changed
+        self.before_name = f"mmtracker_before{id(self)}"
+        self.after_name = f"mmtracker_after{id(self)}"
+        self.tk.createcommand(self.before_name, self.before_edit)
+        self.tk.createcommand(self.after_name, self.after_edit)
+        self.tk.call("rename", self.widget_name, self.original)
+        self.tk.eval(_TRACKER_PROXY.format(
+            widget=self.widget_name, original=self.original,
+            before=self.before_name, after=self.after_name,
+        ))
+        self.store.reset(self.text_length())
+
+    def offset(self, index):
+        """Character offset of a text index, clamped to the text."""
+        count = self.tk.call(self.original, "count", "-chars", "1.0", index)
+        # The store always matches the widget's length, so it bounds the offset without another count
+        return max(0, min(int(count or 0), self.store.length))
+
+    def text_length(self):
+        """Number of characters in the widget, excluding Tk's final newline."""
+        return int(self.tk.call(self.original, "count", "-chars", "1.0", "end-1c") or 0)
+
+    def before_edit(self, operation, *args):
+        # Runs in a Tcl callback: report problems instead of raising into Tcl
+        try:
+            if operation == "insert":
+                self.pending = ("insert", self.offset(args[0]), self.store.length)
+            elif operation == "delete":
+                ranges = []
+                indices = list(args)
+                if len(indices) % 2:
+                    indices.append(indices[-1] + "+1c")
+                for first, last in zip(indices[0::2], indices[1::2]):
+                    start, end = self.offset(first), self.offset(last)
+                    if start < end:
+                        ranges.append((start, end))
+                self.pending = ("delete", ranges, self.store.length)
+            elif operation == "replace":
+                start, end = self.offset(args[0]), self.offset(args[1])
+                self.pending = ("replace", (start, max(start, end)), self.store.length)
+        except Exception as e:
+            print(f"Error tracking text edit: {e}")
+            self.pending = None
+
+    def after_edit(self):
+        try:
+            pending, self.pending = self.pending, None
+            self.edit_count += 1
+            new_length = self.text_length()
+            if pending is not None:
+                operation, where, old_length = pending
+                if operation == "insert":
+                    self.store.insert(where, new_length - old_length)
+                elif operation == "delete":
+                    # Tk merges overlapping ranges and deletes from the end backwards
+                    for start, end in merge_ranges(where)[::-1]:
+                        self.store.delete(start, end)
+                elif operation == "replace":
+                    start, end = where
+                    self.store.delete(start, end)
+                    self.store.insert(start, new_length - (old_length - (end - start)))
+            if self.store.length != new_length:
+                # Should not happen, but never let the store drift from the widget
+                print(f"Formatting store out of step ({self.store.length} != {new_length}), resizing")
+                self.drifted = True
+                if self.store.length < new_length:
+                    self.store.insert(self.store.length, new_length - self.store.length, style=PLAIN_STYLE)
+                else:
+                    self.store.delete(new_length, self.store.length)
+        except Exception as e:
+            print(f"Error tracking text edit: {e}")
+
+    def close(self):
+        """Restore the widget's own command."""
+        try:
+            self.tk.call("rename", self.widget_name, "")
+            self.tk.call("rename", self.original, self.widget_name)
+            self.tk.deletecommand(self.before_name)
+            self.tk.deletecommand(self.after_name)
+        except Exception as e:
+            print(f"Error removing text edit tracker: {e}")
+
+def merge_ranges(ranges):
+    """Sort (start, end) ranges and merge the ones that overlap or touch."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
@@ -0,0 +1,309 @@
+"""PDF backend for MMTranscriptEditor exports (ReportLab).
+
+Imported by mmtranscript_export.export_to_pdf the first time a PDF is written, so
+ReportLab is only loaded in sessions that actually export to PDF.
+"""
+import os
+import re
+import sys
+from collections import deque
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Frame, Paragraph, Spacer
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from mmtranscript_export import StyleTable, get_paragraph_text, pdf_color
+
+def map_font_to_reportlab(font_family, bold=False, italic=False):
+    """Map common font families to ReportLab's built-in fonts.
+    ReportLab supports: Helvetica, Times-Roman, Courier (and their variants)."""
+    # Map common fonts to ReportLab built-in fonts
+    font_map = {
+        'Segoe UI': 'Helvetica',
+        'Arial': 'Helvetica',
+        'Calibri': 'Helvetica',
+        'Verdana': 'Helvetica',
+        'Tahoma': 'Helvetica',
+        'Trebuchet MS': 'Helvetica',
+        'Times New Roman': 'Times-Roman',
+        'Times': 'Times-Roman',
+        'Georgia': 'Times-Roman',
+        'Courier New': 'Courier',
+        'Courier': 'Courier',
+        'Consolas': 'Courier',
+        'Lucida Console': 'Courier',
+        'Monaco': 'Courier',
+    }
+    
+    # Get base font name (default to Helvetica if not mapped)
+    base_font = font_map.get(font_family, 'Helvetica')
+    
+    # Build variant name based on bold/italic
+    if bold and italic:
+        if base_font == 'Helvetica':
+            return 'Helvetica-BoldOblique'
+        elif base_font == 'Times-Roman':
+            return 'Times-BoldItalic'
+        elif base_font == 'Courier':
+            return 'Courier-BoldOblique'
+    elif bold:
+        if base_font == 'Helvetica':
+            return 'Helvetica-Bold'
+        elif base_font == 'Times-Roman':
+            return 'Times-Bold'
+        elif base_font == 'Courier':
+            return 'Courier-Bold'
+    elif italic:
+        if base_font == 'Helvetica':
+            return 'Helvetica-Oblique'
+        elif base_font == 'Times-Roman':
+            return 'Times-Italic'
+        elif base_font == 'Courier':
+            return 'Courier-Oblique'
+    
+    return base_font
+
+# TrueType files for the editor's fonts as (regular, bold, italic, bold italic) file names
+# without extension; later tuples are metric-compatible stand-ins found on Linux/macOS.
+# A missing variant falls back to the regular file.
+PDF_FONT_FILES = {
+    'Segoe UI': [('segoeui', 'segoeuib', 'segoeuii', 'segoeuiz')],
+    'Arial': [('arial', 'arialbd', 'ariali', 'arialbi'),
+              ('LiberationSans-Regular', 'LiberationSans-Bold', 'LiberationSans-Italic', 'LiberationSans-BoldItalic')],
+    'Calibri': [('calibri', 'calibrib', 'calibrii', 'calibriz'),
+                ('Carlito-Regular', 'Carlito-Bold', 'Carlito-Italic', 'Carlito-BoldItalic')],
+    'Verdana': [('verdana', 'verdanab', 'verdanai', 'verdanaz')],
+    'Tahoma': [('tahoma', 'tahomabd', 'tahoma', 'tahomabd')],
+    'Trebuchet MS': [('trebuc', 'trebucbd', 'trebucit', 'trebucbi')],
+    'Lucida Sans Unicode': [('l_10646', 'l_10646', 'l_10646', 'l_10646')],
+    'Century Gothic': [('gothic', 'gothicb', 'gothici', 'gothicbi')],
+    'Comic Sans MS': [('comic', 'comicbd', 'comici', 'comicz')],
+    'Times New Roman': [('times', 'timesbd', 'timesi', 'timesbi'),
+                        ('LiberationSerif-Regular', 'LiberationSerif-Bold', 'LiberationSerif-Italic', 'LiberationSerif-BoldItalic')],
+    'Georgia': [('georgia', 'georgiab', 'georgiai', 'georgiaz')],
+    'Garamond': [('gara', 'garabd', 'garait', 'garabd')],
+    'Book Antiqua': [('bkant', 'antquab', 'antquai', 'antquabi')],
+    'Courier New': [('cour', 'courbd', 'couri', 'courbi'),
+                    ('LiberationMono-Regular', 'LiberationMono-Bold', 'LiberationMono-Italic', 'LiberationMono-BoldItalic')],
+    'Consolas': [('consola', 'consolab', 'consolai', 'consolaz')],
+    'Lucida Console': [('lucon', 'lucon', 'lucon', 'lucon')],
+    'DejaVu Sans': [('DejaVuSans', 'DejaVuSans-Bold', 'DejaVuSans-Oblique', 'DejaVuSans-BoldOblique')],
+    'DejaVu Serif': [('DejaVuSerif', 'DejaVuSerif-Bold', 'DejaVuSerif-Italic', 'DejaVuSerif-BoldItalic')],
+    'DejaVu Sans Mono': [('DejaVuSansMono', 'DejaVuSansMono-Bold', 'DejaVuSansMono-Oblique', 'DejaVuSansMono-BoldOblique')],
+}
+
+_system_font_files = None  # lowercase file stem -> path, filled by the first scan
+_pdf_font_cache = {}  # (family, bold, italic) -> ReportLab font name
+_registered_pdf_families = {}  # family -> tuple of four registered names, or None if unavailable
+
+def pdf_font_directories():
+    """System and per-user font directories for the current platform."""
+    home = os.path.expanduser("~")
+    if sys.platform.startswith("win"):
+        windir = os.environ.get("WINDIR", r"C:\Windows")
+        local = os.environ.get("LOCALAPPDATA", os.path.join(home, "AppData", "Local"))
+        return [os.path.join(windir, "Fonts"), os.path.join(local, "Microsoft", "Windows", "Fonts")]
+    if sys.platform == "darwin":
+        return ["/System/Library/Fonts", "/Library/Fonts", os.path.join(home, "Library", "Fonts")]
+    return ["/usr/share/fonts", "/usr/local/share/fonts",
+            os.path.join(home, ".fonts"), os.path.join(home, ".local", "share", "fonts")]
+
+def find_system_font_files():
+    """Index the .ttf files in the system font directories (scanned once per process)."""
+    global _system_font_files
+    if _system_font_files is None:
+        found = {}
+        for directory in pdf_font_directories():
+            for root, _dirs, files in os.walk(directory):
+                for name in files:
+                    stem, ext = os.path.splitext(name)
+                    if ext.lower() == ".ttf":
+                        found.setdefault(stem.lower(), os.path.join(root, name))
+        _system_font_files = found
+    return _system_font_files
+
+def register_pdf_font_family(family):
+    """Register a family's TrueType files with ReportLab once.
+    
+    Returns the (regular, bold, italic, bold italic) font names, or None when no
+    TTF for the family is installed or it cannot be embedded.
+    """
+    if family in _registered_pdf_families:
+        return _registered_pdf_families[family]
+    
+    registered = None
+    files = find_system_font_files()
+    for candidates in PDF_FONT_FILES.get(family, []):
+        regular_path = files.get(candidates[0].lower())
+        if not regular_path:
+            continue
+        base_name = re.sub(r'\W', '', family)
+        suffixes = ("", "-Bold", "-Italic", "-BoldItalic")
+        names = []
+        try:
+            for stem, suffix in zip(candidates, suffixes):
+                path = files.get(stem.lower(), regular_path)
+                name = base_name + suffix
+                pdfmetrics.registerFont(TTFont(name, path))
+                names.append(name)
+        except Exception as e:
+            print(f"Could not register font {family} from {regular_path}: {e}")
+            continue
+        pdfmetrics.registerFontFamily(base_name, normal=names[0], bold=names[1],
+                                      italic=names[2], boldItalic=names[3])
+        registered = tuple(names)
+        break
+    
+    _registered_pdf_families[family] = registered
+    return registered
+
+def resolve_pdf_font(font_family, bold=False, italic=False):
+    """ReportLab font name for a family and weight/slant, embedding the real TTF when installed.
+    
+    Lookups are memoized, so the directory scan and TTF registration happen once per
+    process and later runs cost a dict lookup. Falls back to map_font_to_reportlab's
+    built-in fonts when the family is not installed.
+    """
+    key = (font_family, bool(bold), bool(italic))
+    font_name = _pdf_font_cache.get(key)
+    if font_name is None:
+        names = register_pdf_font_family(font_family)
+        if names:
+            font_name = names[2 * bool(italic) + bool(bold)]
+        else:
+            font_name = map_font_to_reportlab(font_family, bold, italic)
+        _pdf_font_cache[key] = font_name
+    return font_name
+
+def escape_pdf_text(text):
+    """Escape XML special characters for ReportLab paragraph markup."""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def pdf_style_markup(style):
+    """Opening and closing ReportLab markup for a resolved run style, as (open, close)."""
+    # ReportLab expects fontSize and fontName (camelCase), not size and name
+    font_attrs = {}
+    if style["family"] or style["bold"] or style["italic"]:
+        # Resolve to an embedded TTF (or built-in fallback) with bold/italic in the font name
+        font_attrs['fontName'] = resolve_pdf_font(style["family"] or "Helvetica", style["bold"], style["italic"])
+    if style["size"]:
+        font_attrs['fontSize'] = str(style["size"])
+    if style["color"]:
+        font_attrs['textColor'] = pdf_color(style["color"])
+    if style["highlight"]:
+        font_attrs['backColor'] = pdf_color(style["highlight"])
+    
+    opening = ""
+    closing = ""
+    if font_attrs:
+        # Escape quotes in the values
+        font_attr_str = ' '.join(f'{k}="{v.replace(chr(34), "&quot;")}"' for k, v in font_attrs.items())
+        opening = f'<font {font_attr_str}>'
+        closing = '</font>'
+    if style["underline"]:
+        opening += '<u>'
+        closing = '</u>' + closing
+    return opening, closing
+
+def pdf_paragraph_style(style, base_style):
+    """ParagraphStyle for a paragraph whose runs all share one style.
+    
+    Font, size and color move into the paragraph style; underline and highlight
+    stay inline because a paragraph backColor would fill the whole block.
+    """
+    overrides = {}
+    if style["family"] or style["bold"] or style["italic"]:
+        overrides["fontName"] = resolve_pdf_font(style["family"] or "Helvetica", style["bold"], style["italic"])
+    if style["size"]:
+        overrides["fontSize"] = style["size"]
+        overrides["leading"] = style["size"] * 1.2
+    if style["color"]:
+        overrides["textColor"] = pdf_color(style["color"])
+    inline = dict(style, family=None, size=None, bold=False, italic=False, color=None)
+    return ParagraphStyle("TranscriptRun", parent=base_style, **overrides), pdf_style_markup(inline)
+
+# PDF pages are laid out straight onto the canvas in batches instead of building one big story
+PDF_PAGE_SIZE = letter
+PDF_MARGIN = 72  # Points (1 inch), same as SimpleDocTemplate's default margins
+PDF_BATCH_PARAGRAPHS = 200  # Paragraphs turned into flowables at a time
+
+def export_to_pdf(document, file_path, progress_callback=None):
+    """Export a document to PDF with formatting support.
+    
+    Paragraphs are converted to flowables PDF_BATCH_PARAGRAPHS at a time and drawn onto
+    the page frames right away, so only one batch of flowables is held in memory however
+    long the transcript is. progress_callback(done, total) is called after each batch and
+    may raise ExportCancelled. Returns the number of pages written.
+    """
+    normal_style = getSampleStyleSheet()["Normal"]
+    style_table = StyleTable()
+    
+    def paragraph_style_for(style):
+        return pdf_paragraph_style(style, normal_style)
+    page_width, page_height = PDF_PAGE_SIZE
+    canv = canvas.Canvas(file_path, pagesize=PDF_PAGE_SIZE)
+    
+    def new_frame():
+        return Frame(PDF_MARGIN, PDF_MARGIN, page_width - 2 * PDF_MARGIN, page_height - 2 * PDF_MARGIN)
+    
+    frame = new_frame()
+    placed_on_page = 0
+    pages = 1
+    paragraphs = document["paragraphs"]
+    total = len(paragraphs)
+    pending = deque()
+    
+    for batch_start in range(0, total, PDF_BATCH_PARAGRAPHS):
+        for paragraph in paragraphs[batch_start:batch_start + PDF_BATCH_PARAGRAPHS]:
+            runs = paragraph['runs']
+            if runs:
+                style_ids = [style_table.intern(run_info['style']) for run_info in runs]
+                if all(style_id == style_ids[0] for style_id in style_ids):
+                    # One style for the whole paragraph: a shared ParagraphStyle, little or no markup
+                    paragraph_style, (opening, closing) = style_table.render(
+                        style_ids[0], paragraph_style_for
+                    ) if style_ids[0] else (normal_style, ("", ""))
+                    para_html = opening + escape_pdf_text(get_paragraph_text(paragraph)) + closing
+                else:
+                    paragraph_style = normal_style
+                    parts = []
+                    for run_info, style_id in zip(runs, style_ids):
+                        opening, closing = style_table.render(style_id, pdf_style_markup)
+                        parts.append(opening + escape_pdf_text(run_info['text']) + closing)
+                    para_html = "".join(parts)
+                pending.append(Paragraph(para_html, paragraph_style))
+            # Spacer after each paragraph; a blank paragraph is just extra spacing
+            pending.append(Spacer(1, 12))
+        
+        # Fill pages until the batch is used up; a partly filled page carries over to the next batch
+        while pending:
+            if frame.add(pending[0], canv, trySplit=1):
+                pending.popleft()
+                placed_on_page += 1
+                continue
+            
+            # Doesn't fit in what's left of the page: draw the part that fits, carry the rest
+            parts = frame.split(pending[0], canv)
+            if parts:
+                pending.popleft()
+                pending.extendleft(reversed(parts[1:]))
+                frame.add(parts[0], canv, trySplit=1)
+            elif placed_on_page == 0:
+                # Too large even for an empty page and can't be split - skip it rather than loop
+                print("PDF export: skipped a block too large for the page")
+                pending.popleft()
+            
+            canv.showPage()
+            pages += 1
+            frame = new_frame()
+            placed_on_page = 0
+        
+        if progress_callback:
+            progress_callback(min(total, batch_start + PDF_BATCH_PARAGRAPHS), total)
+    
+    canv.showPage()
+    canv.save()
+    return pages
@@ -0,0 +1,51 @@
+"""Sentence splitting for MMTranscriptEditor transcripts.
+
+Sentence boundaries are found with one regex pass and a per-language abbreviation set.
+The editor uses them to break streamed and live-dictated segments into paragraphs.
+Nothing here imports tkinter, so the benchmarks in benchmarks/ can import it directly.
+"""
+import re
+
+
+# Abbreviations that don't end a sentence, per Whisper language code (lowercase, with periods).
+# Extra entries per language come from set_custom_sentence_abbreviations().
+SENTENCE_ABBREVIATIONS = {
+    "en": ["mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "rev.", "gen.", "col.", "lt.", "sgt.",
+           "capt.", "st.", "ave.", "rd.", "blvd.", "etc.", "i.e.", "e.g.", "vs."],
+    "de": ["hr.", "fr.", "dr.", "prof.", "nr.", "str.", "bzw.", "usw.", "ca.", "z.b.", "d.h.", "u.a.",
+           "vgl.", "evtl.", "ggf.", "etc."],
+    "fr": ["m.", "mme.", "mlle.", "dr.", "pr.", "st.", "ste.", "av.", "bd.", "etc.", "p.ex.", "cf."],
+    "es": ["sr.", "sra.", "srta.", "dr.", "dra.", "ud.", "uds.", "av.", "etc.", "p.ej.", "pág."],
+}
+_custom_sentence_abbreviations = {}  # Language -> user-added abbreviations
+_sentence_abbreviation_sets = {}  # Language -> frozenset, built on first use
+
+# A sentence ends at a token whose last character is . ! or ? followed by whitespace or the end.
+# The lookbehind anchors each match to a token start, so the scan stays linear.
+_SENTENCE_END_RE = re.compile(r'(?<!\S)\S*?[.!?](?=\s|$)')
+
+def set_custom_sentence_abbreviations(abbreviations):
+    """Add user abbreviations per language code, e.g. {"en": ["approx."]}."""
+    _custom_sentence_abbreviations.clear()
+    _custom_sentence_abbreviations.update(abbreviations or {})
+    _sentence_abbreviation_sets.clear()
+
+def get_sentence_abbreviations(language="en"):
+    """Get the abbreviation set for a language (falls back to English), including user additions."""
+    language = language if language in SENTENCE_ABBREVIATIONS else "en"
+    abbreviations = _sentence_abbreviation_sets.get(language)
+    if abbreviations is None:
+        custom = _custom_sentence_abbreviations.get(language, [])
+        abbreviations = frozenset(a.lower() for a in SENTENCE_ABBREVIATIONS[language] + list(custom))
+        _sentence_abbreviation_sets[language] = abbreviations
+    return abbreviations
+
+def iter_sentence_ends(text, language="en"):
+    """Yield the offset just past each sentence-ending punctuation mark in text."""
+    abbreviations = get_sentence_abbreviations(language)
+    for match in _SENTENCE_END_RE.finditer(text):
+        token = match.group()
+        # Only a period can be part of an abbreviation; decimals never match (no whitespace after the dot)
+        if token[-1] == '.' and token.lstrip('"\'([{').lower() in abbreviations:
+            continue
+        yield match.end()
@@ -0,0 +1,298 @@
+"""Tests for the formatting span store and its saved sidecars.
+
+Run from the repository root:
+
+    python -m pytest tests
+
+The span store is checked against a reference model that keeps one style per character,
+and sidecars are checked by saving and loading stores in every format the editor reads.
+"""
+import json
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mmtranscript_formatting  # noqa: E402
+from mmtranscript_formatting import (  # noqa: E402
+    MIXED, PLAIN_STYLE, SIDECAR_VERSION, STYLE_KEYS, SpanStore, is_compact_sidecar,
+    make_style, span_store_from_sidecar, span_store_from_tag_dump, span_store_to_sidecar, style_to_dict,
+    update_style,
+)
+
+# Property values the random edits choose from; None/False leave a property unset
+PROPERTY_VALUES = {
+    "family": (None, "Arial", "Georgia"),
+    "size": (None, 12, 18),
+    "bold": (False, True),
+    "italic": (False, True),
+    "underline": (False, True),
+    "color": (None, "#FF0000", "#0000FF"),
+    "highlight": (None, "#FFFF00"),
+}
+
+
+class ReferenceModel:
+    """One style tuple per character: slow, but obviously right."""
+
+    def __init__(self, length=0):
+        self.chars = [PLAIN_STYLE] * length
+
+    def style_at(self, offset):
+        return self.chars[offset] if 0 <= offset < len(self.chars) else PLAIN_STYLE
+
+    def apply(self, start, end, **changes):
+        for offset in range(max(start, 0), min(end, len(self.chars))):
+            self.chars[offset] = update_style(self.chars[offset], **changes)
+
+    def insert(self, offset, length, style=None):
+        offset = max(0, min(offset, len(self.chars)))
+        if style is None:
+            before = self.style_at(offset - 1)
+            style = before if before == self.style_at(offset) else PLAIN_STYLE
+        self.chars[offset:offset] = [style] * length
+
+    def delete(self, start, end):
+        del self.chars[max(start, 0):max(end, 0)]
+
+    def range_value(self, start, end, key):
+        field = STYLE_KEYS.index(key)
+        start, end = max(start, 0), min(end, len(self.chars))
+        if start >= end:
+            return self.style_at(start)[field]
+        values = {style[field] for style in self.chars[start:end]}
+        return values.pop() if len(values) == 1 else MIXED
+
+
+def store_characters(store):
+    """Per-character styles of a SpanStore, expanded from its runs."""
+    chars = []
+    for start, end, style in store.runs():
+        chars += [style] * (end - start)
+    return chars
+
+
+def round_trip_sidecar(store, binary):
+    """Save a store to a sidecar and load it back, through JSON as the editor writes it to disk."""
+    sidecar = json.loads(json.dumps(span_store_to_sidecar(store, binary=binary)))
+    return sidecar, span_store_from_sidecar("x" * store.length, sidecar)
+
+
+def random_changes(rng):
+    keys = rng.sample(STYLE_KEYS, rng.randint(1, 3))
+    return {key: rng.choice(PROPERTY_VALUES[key]) for key in keys}
+
+
+def random_style(rng):
+    return make_style(**{key: rng.choice(values) for key, values in PROPERTY_VALUES.items()})
+
+
+def random_store(rng, length, edits):
+    """A SpanStore of the given length with edits random formatting changes applied."""
+    store = SpanStore(length)
+    for _ in range(edits):
+        start = rng.randrange(length)
+        store.apply(start, start + rng.randint(1, 40), **random_changes(rng))
+    return store
+
+
+class SpanStoreTest(unittest.TestCase):
+
+    def assert_matches(self, store, model):
+        self.assertEqual(store.length, len(model.chars))
+        self.assertEqual(store_characters(store), model.chars)
+        # Runs are sorted, non-empty and start at 0
+        if store.length:
+            self.assertEqual(store.starts[0], 0)
+        self.assertEqual(len(store.starts), len(store.styles))
+        for previous, following in zip(store.starts, store.starts[1:]):
+            self.assertLess(previous, following)
+        if store.starts:
+            self.assertLess(store.starts[-1], store.length)
+
+    def test_random_edits_match_reference_model(self):
+        # range_value compares nearby runs directly; a threshold of 0 sends every query
+        # through the cached change counts, whose invalidation the edits then exercise
+        for scan_runs in (0, mmtranscript_formatting.RANGE_SCAN_RUNS):
+            with self.subTest(scan_runs=scan_runs), \
+                    mock.patch.object(mmtranscript_formatting, "RANGE_SCAN_RUNS", scan_runs):
+                self.check_random_edits()
+
+    def check_random_edits(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            length = rng.randint(0, 200)
+            store, model = SpanStore(length), ReferenceModel(length)
+            for _ in range(300):
+                size = len(model.chars)
+                operation = rng.random()
+                start = rng.randint(-2, size + 2)
+                end = start + rng.randint(0, 30)
+                if operation < 0.35:
+                    changes = random_changes(rng)
+                    store.apply(start, end, **changes)
+                    model.apply(start, end, **changes)
+                elif operation < 0.6:
+                    style = rng.choice((None, None, random_style(rng)))
+                    length = rng.randint(1, 20)
+                    store.insert(start, length, style=style)
+                    model.insert(start, length, style=style)
+                elif operation < 0.85:
+                    store.delete(start, end)
+                    model.delete(start, end)
+                else:
+                    store.coalesce()
+                self.assert_matches(store, model)
+                # Queries build the cached change counts that the next edit must invalidate
+                start = rng.randint(0, len(model.chars))
+                end = start + rng.randint(0, 100)
+                for key in rng.sample(STYLE_KEYS, 3):
+                    self.assert_value(store.range_value(start, end, key), model.range_value(start, end, key))
+
+            # The edited store saves and loads back unchanged in both sidecar encodings
+            for binary in (False, True):
+                _sidecar, loaded = round_trip_sidecar(store, binary)
+                self.assertEqual(store_characters(loaded), model.chars)
+
+            for _ in range(200):
+                start = rng.randint(-2, len(model.chars) + 2)
+                end = start + rng.randint(0, 60)
+                for key in STYLE_KEYS:
+                    self.assert_value(store.range_value(start, end, key), model.range_value(start, end, key))
+                self.assertEqual(store.has_formatting(start, end),
+                                 any(style != PLAIN_STYLE for style in model.chars[max(start, 0):max(end, 0)]))
+
+    def assert_value(self, value, expected):
+        if expected is MIXED:
+            self.assertIs(value, MIXED)
+        else:
+            self.assertIsNot(value, MIXED)
+            self.assertEqual(value, expected)
+
+    def test_coalesce_merges_equal_neighbours(self):
+        store = SpanStore(30)
+        store.apply(0, 10, bold=True)
+        store.apply(10, 20, bold=True)
+        store.apply(5, 15, bold=False)
+        store.apply(5, 15, bold=True)
+        before = store_characters(store)
+        self.assertGreater(store.coalesce(), 0)
+        self.assertEqual(store_characters(store), before)
+        self.assertEqual(list(store.formatted_runs()), [(0, 20, make_style(bold=True))])
+
+    def test_insert_takes_style_shared_by_both_sides(self):
+        store = SpanStore(10)
+        store.apply(0, 10, italic=True)
+        store.insert(5, 3)
+        self.assertEqual(store_characters(store), [make_style(italic=True)] * 13)
+        store.insert(13, 2)  # At the end the right side is plain
+        self.assertEqual(store.style_at(14), PLAIN_STYLE)
+
+
+class SidecarRoundTripTest(unittest.TestCase):
+
+    def round_trip(self, store, binary):
+        sidecar, loaded = round_trip_sidecar(store, binary)
+        self.assertTrue(is_compact_sidecar(sidecar))
+        self.assertEqual(sidecar["version"], SIDECAR_VERSION)
+        self.assertEqual(isinstance(sidecar["runs"], str), binary)
+        return loaded
+
+    def test_compact_round_trip(self):
+        for seed in range(10):
+            rng = random.Random(seed)
+            store = random_store(rng, rng.randint(1, 2000), rng.randint(0, 200))
+            for binary in (False, True):
+                loaded = self.round_trip(store, binary)
+                self.assertEqual(store_characters(loaded), store_characters(store))
+
+    def test_default_encoding_switches_to_binary_for_many_runs(self):
+        store = SpanStore(5000)
+        for start in range(0, 5000, 4):
+            store.apply(start, start + 2, bold=True)
+        self.assertIsInstance(span_store_to_sidecar(store)["runs"], str)
+        self.assertIsInstance(span_store_to_sidecar(SpanStore(10))["runs"], list)
+
+    def test_compact_sidecar_for_shorter_text_is_clipped(self):
+        store = SpanStore(20)
+        store.apply(5, 20, underline=True)
+        loaded = span_store_from_sidecar("x" * 10, span_store_to_sidecar(store))
+        self.assertEqual(loaded.length, 10)
+        self.assertEqual(list(loaded.formatted_runs()), [(5, 10, make_style(underline=True))])
+
+    def test_sidecar_for_part_of_store_is_relative_to_that_part(self):
+        # The editor saves its text stripped, so the sidecar covers only the stripped part
+        widget_text = "\n  Hello bold world  \n"
+        store = SpanStore(len(widget_text))
+        store.apply(9, 13, bold=True)
+        saved_text = widget_text.strip()
+        start = widget_text.index(saved_text)
+        sidecar = span_store_to_sidecar(store, start=start, end=start + len(saved_text))
+        self.assertEqual(sidecar["length"], len(saved_text))
+        loaded = span_store_from_sidecar(saved_text, sidecar)
+        self.assertEqual([saved_text[run_start:run_end] for run_start, run_end, _style in loaded.formatted_runs()],
+                         ["bold"])
+
+    def test_length_mismatch_is_reported(self):
+        store = SpanStore(10)
+        store.apply(0, 4, italic=True)
+        with mock.patch("builtins.print") as printed:
+            span_store_from_sidecar("x" * 12, span_store_to_sidecar(store))
+        self.assertIn("10 characters", printed.call_args[0][0])
+
+    def test_legacy_tag_entry_sidecar(self):
+        text = "First line\nSecond line\nThird"
+        legacy = {
+            # Written before "ranges" existed: one Tk index pair per entry
+            "bold_1": {"type": "bold", "start": "1.0", "end": "1.5"},
+            "highlight_1": {"type": "highlight", "color": "#FFFF00", "ranges": [["1.6", "2.6"], ["3.0", "3.5"]]},
+            "font_merged_1": {"type": "font_merged", "family": "Georgia", "size": "14",
+                              "bold": False, "italic": True, "ranges": [[0, 3]]},
+            "unknown": {"type": "sparkle", "start": "1.0", "end": "end"},
+            "broken": {"type": "bold", "ranges": 5},
+        }
+        loaded = span_store_from_sidecar(text, json.loads(json.dumps(legacy)))
+
+        model = ReferenceModel(len(text))
+        model.apply(0, 5, bold=True)
+        model.apply(6, 17, highlight="#FFFF00")
+        model.apply(23, 28, highlight="#FFFF00")
+        # Later entries win where they overlap, so the merged font turns bold off again
+        model.apply(0, 3, family="Georgia", size=14, bold=False, italic=True)
+        self.assertEqual(store_characters(loaded), model.chars)
+
+        # Saving again writes the compact format, which loads back the same
+        resaved = span_store_from_sidecar(text, json.loads(json.dumps(span_store_to_sidecar(loaded))))
+        self.assertEqual(store_characters(resaved), model.chars)
+
+    def test_store_from_tag_dump(self):
+        text = "First line\nSecond line\nThird"
+        bold, italic, highlight = make_style(bold=True), make_style(italic=True), make_style(highlight="#FFFF00")
+        tag_styles = {"style_1": bold, "style_2": italic, "style_3": highlight}
+        # (key, tag, index) triples in text order, as `dump -tag` returns them
+        dump = [
+            ("tagon", "style_1", "1.0"),
+            ("tagon", "sel", "1.2"),  # Not a style tag: ignored
+            ("tagoff", "style_1", "1.5"),
+            ("tagoff", "sel", "1.8"),
+            ("tagon", "style_2", "2.0"),
+            ("tagoff", "style_2", "2.6"),
+            ("tagon", "style_3", "3.1"),  # Still open at the end of the dumped range
+        ]
+        store = span_store_from_tag_dump(text, dump, tag_styles)
+        self.assertEqual(store.length, len(text))
+        self.assertEqual(
+            [(text[start:end], style) for start, end, style in store.formatted_runs()],
+            [("First", bold), ("Second", italic), ("hird", highlight)],
+        )
+
+    def test_style_dicts_round_trip(self):
+        style = make_style(family="Arial", size=12, bold=True, color="#FF0000")
+        self.assertEqual(make_style(**style_to_dict(style)), style)
+
+
+if __name__ == "__main__":
+    unittest.main()